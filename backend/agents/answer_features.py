@@ -0,0 +1,116 @@
+from __future__ import annotations
+import re
+from typing import Dict, Iterable, Tuple
+
+# ----------------------------
+# Vocabularies (single source of truth; interview_agent builds its regexes from these)
+# ----------------------------
+TECH_WORDS: Tuple[str, ...] = (
+    "python", "typescript", "javascript", "react", "vue", "node", "fastapi", "flask", "django",
+    "sql", "postgres", "mysql", "mongodb", "redis", "aws", "gcp", "azure", "docker", "kubernetes",
+    "terraform", "airflow", "spark", "hadoop", "kafka", "elasticsearch", "grpc",
+    "pytorch", "tensorflow", "sklearn", "huggingface", "llm", "rag", "vector", "milvus", "weaviate",
+    "snowflake", "databricks", "bigquery", "lambda", "s3", "cloudfront", "sagemaker",
+)
+STAR_WORDS: Dict[str, Tuple[str, ...]] = {
+    "situation": ("situation", "context", "problem", "background"),
+    "task": ("task", "goal", "objective", "role"),
+    "action": ("action", "implemented", "built", "designed", "led", "drove", "migrated"),
+    "result": ("result", "impact", "outcome", "metric", "improved", "reduced", "increased", "saved"),
+}
+OWNERSHIP_WORDS: Tuple[str, ...] = ("I", "my", "me", "myself", "led", "owned", "drove", "designed", "architected", "authored")
+FAILURE_WORDS: Tuple[str, ...] = ("failed", "outage", "incident", "postmortem", "rollback", "bug", "regression", "oncall")
+
+METRIC_PATTERN = r"\b\d+(?:\.\d+)?\s?(?:%|percent|x|k|m|mn|million|billion|\$|sec|ms|req/s|rps|errors|latency|cost)\b"
+
+def word_regex(words: Iterable[str]) -> "re.Pattern[str]":
+    return re.compile(r"\b(" + "|".join(words) + r")\b", re.I)
+
+# ----------------------------
+# Single-pass analyzer
+# ----------------------------
+TECH = 1 << 0
+OWNERSHIP = 1 << 1
+FAILURE = 1 << 2
+METRIC = 1 << 3
+STAR = {piece: 1 << (4 + i) for i, piece in enumerate(STAR_WORDS)}
+STAR_ALL = sum(STAR.values())
+ALL = TECH | OWNERSHIP | FAILURE | METRIC | STAR_ALL
+
+_KEYWORDS: Dict[str, int] = {}
+for _bit, _words in [(TECH, TECH_WORDS), (OWNERSHIP, OWNERSHIP_WORDS), (FAILURE, FAILURE_WORDS)] + [
+    (STAR[p], ws) for p, ws in STAR_WORDS.items()
+]:
+    for _w in _words:
+        _KEYWORDS[_w.lower()] = _KEYWORDS.get(_w.lower(), 0) | _bit
+_KEYWORD_SET = frozenset(_KEYWORDS)
+
+# One left-to-right scan: a metric phrase (empty capture) or a word token. Metric phrases only ever
+# swallow digits and unit words, none of which are keywords, so no keyword hit is lost to them.
+_SCAN = re.compile(METRIC_PATTERN + r"|(\w+)")
+# Long texts are scanned in chunks so we can stop once every flag is set. Chunks end on whitespace
+# not preceded by a digit: neither a word nor a metric phrase ("40 ms") can straddle that.
+_CHUNK_CHARS = 2048
+_CUT = re.compile(r"(?<!\d)\s")
+
+class AnswerFeatures:
+    """Every rubric/planner signal of a text, from one tokenising pass.
+
+    Compute once per answer with `AnswerFeatures.of(text)` and pass it around; `|` merges
+    the features of several answers (flags OR-ed, "why" counts summed)."""
+    __slots__ = ("flags", "why_count")
+
+    def __init__(self, flags: int = 0, why_count: int = 0):
+        self.flags = flags
+        self.why_count = why_count
+
+    @classmethod
+    def of(cls, text: str) -> "AnswerFeatures":
+        low = (text or "").lower()
+        if not low:
+            return cls()
+        flags, pos, n = 0, 0, len(low)
+        while pos < n and flags != ALL:
+            cut = _CUT.search(low, pos + _CHUNK_CHARS) if pos + _CHUNK_CHARS < n else None
+            end = cut.start() if cut else n
+            tokens = _SCAN.findall(low, pos, end)
+            if "" in tokens:
+                flags |= METRIC
+            for w in _KEYWORD_SET.intersection(tokens):
+                flags |= _KEYWORDS[w]
+            pos = end
+        return cls(flags, low.count("why"))
+
+    def __or__(self, other: "AnswerFeatures") -> "AnswerFeatures":
+        return AnswerFeatures(self.flags | other.flags, self.why_count + other.why_count)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, AnswerFeatures) and (self.flags, self.why_count) == (other.flags, other.why_count)
+
+    def __repr__(self) -> str:
+        names = [n for n, b in (("metric", METRIC), ("tech", TECH), ("ownership", OWNERSHIP), ("failure", FAILURE)) if self.flags & b]
+        names += [f"star-{p}" for p, b in STAR.items() if self.flags & b]
+        return f"AnswerFeatures({', '.join(names) or '-'}; why={self.why_count})"
+
+    @property
+    def has_metric(self) -> bool:
+        return bool(self.flags & METRIC)
+
+    @property
+    def mentions_tech(self) -> bool:
+        return bool(self.flags & TECH)
+
+    @property
+    def shows_ownership(self) -> bool:
+        return bool(self.flags & OWNERSHIP)
+
+    @property
+    def mentions_failure(self) -> bool:
+        return bool(self.flags & FAILURE)
+
+    def has_star_piece(self, piece: str) -> bool:
+        return bool(self.flags & STAR.get(piece, 0))
+
+    @property
+    def star_coverage(self) -> int:
+        return bin(self.flags & STAR_ALL).count("1")
@@ -1,8 +1,10 @@
-from fastapi import FastAPI, UploadFile, Form
+from fastapi import FastAPI, UploadFile, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from agents.interview_agent import InterviewAgent
 from agents.resume_parser import parse_resume
 from agents.jd_parser import parse_jd
+from agents.pdf_extract import shutdown as shutdown_pdf_pool
+from agents.uploads import UploadRejected, spool_upload
 from db.database import Base, engine  # for auto table creation
 import db.models  # noqa: F401 — ensures models are registered
 
@@ -22,12 +24,19 @@ app.add_middleware(
 def on_startup():
     Base.metadata.create_all(bind=engine)
 
+@app.on_event("shutdown")
+def on_shutdown():
+    shutdown_pdf_pool()
+
 agent = InterviewAgent()
 
 @app.post("/upload_resume/")
 async def upload_resume(file: UploadFile):
-    text = await file.read()
-    parsed = parse_resume(text.decode("utf-8", errors="ignore"))
+    try:
+        with await spool_upload(file) as up:
+            parsed = parse_resume(await up.extract_text(errors="replace") or "")
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     return {"resume": parsed}
 
 @app.post("/start_interview/")
@@ -0,0 +1,288 @@
+"""
+Offline re-scoring of past interviews: `transcripts` → `interview_scores`.
+
+    cd backend && python -m agents.batch_scoring --dry-run        # diff against the stored scores
+    cd backend && python -m agents.batch_scoring                  # write the new scores
+    curl -X POST 'localhost:8000/transcripts/rescore?dry_run=true'  # NDJSON progress
+
+Transcripts are streamed in (interview_id, turn) order (the ix_transcripts_interview_turn
+index), grouped into interviews (db/transcripts.interview_key: a restarted interview is
+scored on its own) and scored a chunk of interviews per task, in a process pool once
+there are at least SCORE_POOL_MIN of them. Each interview gets the local rubric, the
+dashboard scores and the coaching tip of every answer, computed as the live API does
+(agents/rubric.py). Rows are replaced in batched transactions; with --dry-run nothing
+is written and the changes are reported.
+"""
+from __future__ import annotations
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# ----------------------------
+# Config
+# ----------------------------
+SCORE_WORKERS = int(os.getenv("HIRESENSE_SCORE_WORKERS", str(os.cpu_count() or 2)))
+SCORE_CHUNK = int(os.getenv("HIRESENSE_SCORE_CHUNK", "200"))        # interviews per pool task
+SCORE_BATCH = int(os.getenv("HIRESENSE_SCORE_BATCH", "1000"))       # rows per write transaction
+SCORE_POOL_MIN = 2 * SCORE_CHUNK                                     # fewer interviews score in-process
+SCORE_PROGRESS_S = 0.5                                               # min interval between progress events
+DIFF_SHOW = 20                                                       # changed interviews listed in a dry run
+
+# (interview key, candidate_id, [(question, answer), ...] in turn order)
+Interview = Tuple[str, int, List[Tuple[str, str]]]
+
+def rubric_version() -> str:
+    """Changes whenever the scoring code does, so stale rows can be told apart."""
+    import agents.answer_features
+    import agents.rubric
+    h = hashlib.sha256()
+    for mod in (agents.answer_features, agents.rubric):
+        with open(mod.__file__, "rb") as fh:
+            h.update(fh.read())
+    return h.hexdigest()[:12]
+
+# ----------------------------
+# Worker side (runs in the pool; must stay importable and picklable)
+# ----------------------------
+def _score_one(interview: Interview) -> Dict:
+    from agents.answer_features import AnswerFeatures
+    from agents.rubric import RubricAccumulator, coaching_from_features
+
+    key, cid, turns = interview
+    acc = RubricAccumulator()
+    coaching = []
+    for question, answer in turns:
+        acc.add_question(question)
+        feats = AnswerFeatures.of(answer)
+        acc.add_answer(answer, feats)
+        coaching.append(coaching_from_features(feats))
+    rubric = acc.scores()
+    return {
+        "interview_id": key,
+        "candidate_id": cid,
+        "turns": len(turns),
+        "overall": rubric["overall"],
+        "rubric": json.dumps(rubric),
+        "dashboard": json.dumps(acc.dashboard()["scores"]),
+        "coaching": json.dumps(coaching),
+    }
+
+def _score_chunk(chunk: List[Interview]) -> List[Dict]:
+    return [_score_one(iv) for iv in chunk]
+
+# ----------------------------
+# Parent side
+# ----------------------------
+def iter_interviews(conn, chunk: int) -> Iterator[List[Interview]]:
+    """Chunks of whole interviews, streamed: memory holds one chunk, not the table."""
+    from sqlalchemy import select
+    from db.models import InterviewTranscript as T
+    from db.transcripts import interview_key
+    q = (select(interview_key(T), T.candidate_id, T.question, T.answer)
+         .order_by(T.interview_id, T.candidate_id, T.turn, T.id))
+    out: List[Interview] = []
+    cur: Optional[Interview] = None
+    for key, cid, question, answer in conn.execution_options(stream_results=True, yield_per=2000).execute(q):
+        if cur is None or cur[0] != key:
+            if cur is not None:
+                out.append(cur)
+                if len(out) >= chunk:
+                    yield out
+                    out = []
+            cur = (key, cid, [])
+        cur[2].append((question or "", answer or ""))
+    if cur is not None:
+        out.append(cur)
+    if out:
+        yield out
+
+
+def _changes(old: Dict, new: Dict) -> Dict:
+    """{field: [old, new]} for the overall score, rubric categories and dashboard scores."""
+    out = {}
+    if old["overall"] != new["overall"]:
+        out["overall"] = [old["overall"], new["overall"]]
+    before = {c["name"]: c["score"] for c in json.loads(old["rubric"] or "{}").get("categories", [])}
+    for c in json.loads(new["rubric"])["categories"]:
+        if before.get(c["name"]) != c["score"]:
+            out[c["name"]] = [before.get(c["name"]), c["score"]]
+    before = json.loads(old["dashboard"] or "{}")
+    for k, v in json.loads(new["dashboard"]).items():
+        if before.get(k) != v:
+            out["dashboard." + k] = [before.get(k), v]
+    if old["coaching"] != new["coaching"]:  # number of answers whose tip changed
+        a, b = json.loads(old["coaching"] or "[]"), json.loads(new["coaching"])
+        out["coaching"] = sum(x != y for x, y in zip(a, b)) + abs(len(a) - len(b))
+    return out
+
+
+def ensure_score_table() -> None:
+    """
+    interview_scores used to be keyed by candidate_id. Scores are derived data (rescore()
+    rebuilds them), so a table with the old key is dropped and created anew.
+    """
+    from sqlalchemy import inspect
+    from db.database import engine, ensure_table
+    from db.models import InterviewScore
+    insp = inspect(engine)
+    name = InterviewScore.__tablename__
+    if insp.has_table(name) and insp.get_pk_constraint(name)["constrained_columns"] != ["interview_id"]:
+        InterviewScore.__table__.drop(bind=engine)
+    ensure_table(InterviewScore)
+
+
+class _ScoreWriter:
+    """Compares results with the stored rows and replaces them `batch` at a time in one transaction."""
+    def __init__(self, batch: int, version: str, dry_run: bool):
+        from db.database import engine
+        from db.models import InterviewScore
+        ensure_score_table()
+        self.engine, self.table = engine, InterviewScore.__table__
+        self.batch, self.version, self.dry_run = batch, version, dry_run
+        self.rows: List[Dict] = []
+        self.written = 0
+        self.counts = {"new": 0, "changed": 0, "unchanged": 0}
+        self.overall_delta = 0
+        self.field_changes: Dict[str, int] = {}
+        self.examples: List[Dict] = []
+
+    def add(self, row: Dict) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= self.batch:
+            self.flush()
+
+    def _diff(self, conn) -> None:
+        from sqlalchemy import select
+        c = self.table.c
+        prev = {r.interview_id: r._asdict() for r in conn.execute(
+            select(c.interview_id, c.overall, c.rubric, c.dashboard, c.coaching)
+            .where(c.interview_id.in_([r["interview_id"] for r in self.rows])))}
+        for row in self.rows:
+            old = prev.get(row["interview_id"])
+            if old is None:
+                self.counts["new"] += 1
+                continue
+            changes = _changes(old, row) if (old["rubric"], old["dashboard"], old["coaching"]) != (
+                row["rubric"], row["dashboard"], row["coaching"]) else {}
+            if not changes:
+                self.counts["unchanged"] += 1
+                continue
+            self.counts["changed"] += 1
+            self.overall_delta += row["overall"] - old["overall"]
+            for field in changes:
+                self.field_changes[field] = self.field_changes.get(field, 0) + 1
+            if len(self.examples) < DIFF_SHOW:
+                self.examples.append({"interview_id": row["interview_id"], "candidate_id": row["candidate_id"],
+                                      "changes": changes})
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        from sqlalchemy import delete, insert
+        with self.engine.begin() as conn:
+            self._diff(conn)
+            if not self.dry_run:
+                now = time.time()
+                conn.execute(delete(self.table).where(
+                    self.table.c.interview_id.in_([r["interview_id"] for r in self.rows])))
+                conn.execute(insert(self.table), [{**r, "rubric_version": self.version, "scored_at": now}
+                                                  for r in self.rows])
+                self.written += len(self.rows)
+        self.rows = []
+
+    def summary(self) -> Dict:
+        changed = self.counts["changed"]
+        return {**self.counts, "mean_overall_delta": round(self.overall_delta / changed, 2) if changed else 0.0,
+                "field_changes": dict(sorted(self.field_changes.items(), key=lambda kv: -kv[1]))}
+
+
+def rescore(dry_run: bool = False, workers: int = SCORE_WORKERS, chunk: int = SCORE_CHUNK,
+            batch: int = SCORE_BATCH) -> Iterator[Dict]:
+    """
+    Re-score every stored interview, yielding progress events, then (dry run) one "diff"
+    event per changed interview up to DIFF_SHOW, and finally a "done" event:
+    {"event", "interviews", "transcripts", "written", "transcripts_per_s", "elapsed_s",
+     "new", "changed", "unchanged", "mean_overall_delta", "field_changes", ...}.
+    """
+    from db.database import engine, ensure_table
+    from db.models import InterviewTranscript
+    ensure_table(InterviewTranscript)
+    t0 = time.perf_counter()
+    version = rubric_version()
+    out = _ScoreWriter(batch, version, dry_run)
+    counts = {"interviews": 0, "transcripts": 0}
+
+    def event(kind: str) -> Dict:
+        elapsed = time.perf_counter() - t0
+        return {"event": kind, "dry_run": dry_run, "rubric_version": version, **counts, "written": out.written,
+                "transcripts_per_s": round(counts["transcripts"] / elapsed, 1) if elapsed else 0.0,
+                "elapsed_s": round(elapsed, 2)}
+
+    yield event("start")
+    last = time.perf_counter()
+    with engine.connect() as conn:
+        it = iter_interviews(conn, chunk)
+        head: List[List[Interview]] = []
+        for c in it:  # look ahead just far enough to know whether a pool pays off
+            head.append(c)
+            if sum(map(len, head)) >= SCORE_POOL_MIN:
+                break
+        for rows in _scored(head, it, workers):
+            for row in rows:
+                counts["interviews"] += 1
+                counts["transcripts"] += row["turns"]
+                out.add(row)
+            if time.perf_counter() - last >= SCORE_PROGRESS_S:
+                last = time.perf_counter()
+                yield event("progress")
+    out.flush()
+    for ex in out.examples if dry_run else ():
+        yield {"event": "diff", **ex}
+    yield {**event("done"), **out.summary()}
+
+
+def _scored(head: List[List[Interview]], rest: Iterator[List[Interview]], workers: int) -> Iterator[List[Dict]]:
+    """Scored chunks: in-process for a small run, else from a process pool (any order)."""
+    if sum(map(len, head)) < SCORE_POOL_MIN or workers <= 1:
+        for c in head:
+            yield _score_chunk(c)
+        for c in rest:
+            yield _score_chunk(c)
+        return
+    # spawn: safe from a threaded server
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        chunks = itertools.chain(head, rest)
+        pending = set()
+        while True:
+            # keep ~2 chunks per worker in flight: bounded memory for any table size
+            while len(pending) < 2 * workers:
+                nxt = next(chunks, None)
+                if nxt is None:
+                    break
+                pending.add(pool.submit(_score_chunk, nxt))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Re-score stored interview transcripts with the current rubric.")
+    ap.add_argument("--dry-run", action="store_true", help="report changes against the stored scores, write nothing")
+    ap.add_argument("--workers", type=int, default=SCORE_WORKERS)
+    ap.add_argument("--chunk", type=int, default=SCORE_CHUNK)
+    ap.add_argument("--batch", type=int, default=SCORE_BATCH)
+    args = ap.parse_args()
+    for ev in rescore(dry_run=args.dry_run, workers=args.workers, chunk=args.chunk, batch=args.batch):
+        print(json.dumps(ev), flush=True)
+
+
+if __name__ == "__main__":
+    main()
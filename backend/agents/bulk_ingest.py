@@ -0,0 +1,265 @@
+"""
+Bulk resume ingestion: a zip or a directory of resumes → `candidates` rows.
+
+    cd backend && python -m agents.bulk_ingest /path/to/resumes.zip   # or a directory
+    curl -F file=@resumes.zip localhost:8000/candidates/bulk          # NDJSON progress
+
+Documents are hashed, extracted and parsed in a process pool (one task = a small chunk
+of documents). Content hashes already in the database are skipped before parsing, so an
+interrupted import can simply be re-run. Results are inserted in batched transactions.
+Each import uses every core, so at most INGEST_CONCURRENCY run at once; later ones
+report {"event": "queued"} and wait their turn.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from agents.pdf_extract import PDF_MAX_BYTES, PDF_MAX_PAGES
+
+# ----------------------------
+# Config
+# ----------------------------
+INGEST_WORKERS = int(os.getenv("HIRESENSE_INGEST_WORKERS", str(os.cpu_count() or 2)))
+INGEST_CHUNK = int(os.getenv("HIRESENSE_INGEST_CHUNK", "16"))        # documents per pool task
+INGEST_BATCH = int(os.getenv("HIRESENSE_INGEST_BATCH", "500"))       # rows per INSERT transaction
+INGEST_CONCURRENCY = int(os.getenv("HIRESENSE_INGEST_CONCURRENCY", "1"))  # imports (process pools) at once
+INGEST_PROGRESS_S = 0.5                                               # min interval between progress events
+
+SUPPORTED_EXTS = (".pdf", ".txt", ".md")
+
+# ("file", path, None) or ("zip", zip_path, member name)
+Source = Tuple[str, str, Optional[str]]
+
+# ----------------------------
+# Worker side (runs in the pool; must stay importable and picklable)
+# ----------------------------
+_KNOWN: FrozenSet[str] = frozenset()
+_ZIPS: Dict[str, zipfile.ZipFile] = {}  # opened once per worker: the central directory is O(members)
+
+def _init_worker(known: FrozenSet[str]) -> None:
+    global _KNOWN
+    _KNOWN = known
+
+def _read(src: Source) -> bytes:
+    """The document's bytes; at most PDF_MAX_BYTES are ever inflated, whatever the zip header claims."""
+    kind, path, member = src
+    if kind == "zip":
+        zf = _ZIPS.get(path)
+        if zf is None:
+            zf = _ZIPS[path] = zipfile.ZipFile(path)
+        fh = zf.open(member)
+    else:
+        fh = open(path, "rb")
+    with fh:
+        data = fh.read(PDF_MAX_BYTES + 1)
+    if len(data) > PDF_MAX_BYTES:
+        raise ValueError(f"larger than {PDF_MAX_BYTES} bytes")
+    return data
+
+def _candidate_name(src: Source) -> str:
+    stem = os.path.splitext(os.path.basename(src[2] or src[1]))[0]
+    return re.sub(r"[_\-.]+", " ", stem).strip().title() or stem
+
+def _ingest_one(src: Source) -> Dict:
+    from agents.pdf_extract import _extract_worker
+    from agents.resume_parser import _parse_text
+
+    label = src[2] or src[1]
+    try:
+        data = _read(src)
+    except Exception as e:
+        return {"source": label, "status": "failed", "error": str(e)}
+    digest = hashlib.sha256(data).hexdigest()
+    if digest in _KNOWN:
+        return {"source": label, "status": "skipped", "content_hash": digest}
+    if data[:4] == b"%PDF":
+        text = _extract_worker(data, PDF_MAX_PAGES)  # already in a worker: parse in place
+        if text is None:
+            return {"source": label, "status": "failed", "content_hash": digest, "error": "unreadable PDF"}
+    else:
+        text = data.decode("utf-8", errors="replace")
+    parsed = _parse_text(text)
+    return {
+        "source": label,
+        "status": "parsed",
+        "content_hash": digest,
+        "name": _candidate_name(src),
+        "resume_text": parsed["raw_text"],
+        "skills": parsed["skills"],
+    }
+
+def _ingest_chunk(chunk: List[Source]) -> List[Dict]:
+    return [_ingest_one(src) for src in chunk]
+
+# ----------------------------
+# Parent side
+# ----------------------------
+_RUNS = threading.BoundedSemaphore(INGEST_CONCURRENCY)
+
+def iter_sources(path: str) -> Tuple[List[Source], int]:
+    """(supported documents, number of entries ignored: unsupported, hidden or oversized)."""
+    out: List[Source] = []
+    ignored = 0
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for f in sorted(files):
+                full = os.path.join(root, f)
+                if f.startswith(".") or not f.lower().endswith(SUPPORTED_EXTS) or os.path.getsize(full) > PDF_MAX_BYTES:
+                    ignored += 1
+                    continue
+                out.append(("file", full, None))
+        return out, ignored
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            base = os.path.basename(info.filename)
+            if info.is_dir():
+                continue
+            # skip what declares itself too large; _read() enforces the cap on the bytes inflated
+            if (base.startswith(".") or "__MACOSX/" in info.filename
+                    or not base.lower().endswith(SUPPORTED_EXTS) or info.file_size > PDF_MAX_BYTES):
+                ignored += 1
+                continue
+            out.append(("zip", os.path.abspath(path), info.filename))
+    return out, ignored
+
+
+class _CandidateBatcher:
+    """Buffers parsed rows and inserts them `batch` at a time in one transaction."""
+    def __init__(self, batch: int):
+        from db.database import engine, ensure_table
+        from db.models import Candidate
+        ensure_table(Candidate)
+        self.engine, self.table, self.batch = engine, Candidate.__table__, batch
+        self.rows: List[Dict] = []
+        self.written = 0
+
+    def known_hashes(self) -> FrozenSet[str]:
+        from sqlalchemy import select
+        with self.engine.connect() as conn:
+            col = self.table.c.content_hash
+            return frozenset(conn.execute(select(col).where(col.isnot(None))).scalars())
+
+    def add(self, row: Dict) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= self.batch:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        from sqlalchemy import insert, select
+        from agents.skills_index import get_skills_index
+        # OR IGNORE: another import of the same documents may have committed them meanwhile
+        stmt = insert(self.table).prefix_with("OR IGNORE", dialect="sqlite")
+        c = self.table.c
+        with self.engine.begin() as conn:
+            conn.execute(stmt, self.rows)
+            # search index in the same transaction: a candidate is never stored but unsearchable
+            ids = dict(conn.execute(select(c.content_hash, c.id)
+                                    .where(c.content_hash.in_([r["content_hash"] for r in self.rows]))).all())
+            get_skills_index().index_rows(conn, [
+                (ids[r["content_hash"]], json.loads(r["skills"]), r["resume_text"])
+                for r in self.rows if r["content_hash"] in ids
+            ])
+        self.written += len(self.rows)
+        self.rows = []
+
+
+def ingest(path: str, workers: int = INGEST_WORKERS, chunk: int = INGEST_CHUNK,
+           batch: int = INGEST_BATCH) -> Iterator[Dict]:
+    """
+    Ingest `path` (zip or directory), yielding progress events and finally a "done" event:
+    {"event", "total", "processed", "parsed", "skipped", "failed", "docs_per_s", "elapsed_s"}.
+    Failures are also yielded individually as {"event": "error", "source", "error"}.
+    While INGEST_CONCURRENCY other imports are running it first yields {"event": "queued"}.
+    """
+    if not _RUNS.acquire(blocking=False):
+        yield {"event": "queued"}
+        _RUNS.acquire()
+    try:
+        yield from _ingest(path, workers, chunk, batch)
+    finally:
+        _RUNS.release()
+
+
+def _ingest(path: str, workers: int, chunk: int, batch: int) -> Iterator[Dict]:
+    t0 = time.perf_counter()
+    sources, ignored = iter_sources(path)
+    db = _CandidateBatcher(batch)
+    known = db.known_hashes()
+    seen = set(known)
+    counts = {"total": len(sources), "ignored": ignored, "processed": 0, "parsed": 0, "skipped": 0, "failed": 0}
+
+    def event(kind: str) -> Dict:
+        elapsed = time.perf_counter() - t0
+        return {"event": kind, **counts, "written": db.written,
+                "docs_per_s": round(counts["processed"] / elapsed, 1) if elapsed else 0.0,
+                "elapsed_s": round(elapsed, 2)}
+
+    yield event("start")
+    chunks = [sources[i:i + chunk] for i in range(0, len(sources), chunk)]
+    last = time.perf_counter()
+    # spawn: safe from a threaded server; the worker count is capped by the work available
+    n_workers = max(1, min(workers, len(chunks) or 1))
+    with ProcessPoolExecutor(max_workers=n_workers,
+                             mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(known,)) as pool:
+        pending = set()
+        it = iter(chunks)
+        while True:
+            # keep ~2 chunks per worker in flight: bounded memory for any archive size
+            while len(pending) < 2 * n_workers:
+                nxt = next(it, None)
+                if nxt is None:
+                    break
+                pending.add(pool.submit(_ingest_chunk, nxt))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                for res in fut.result():
+                    counts["processed"] += 1
+                    status = res["status"]
+                    if status == "parsed" and res["content_hash"] in seen:
+                        status = "skipped"  # duplicate document within this import
+                    counts[status] += 1
+                    if status == "failed":
+                        yield {"event": "error", "source": res["source"], "error": res.get("error", "")}
+                    elif status == "parsed":
+                        seen.add(res["content_hash"])
+                        db.add({"name": res["name"], "resume_text": res["resume_text"],
+                                "content_hash": res["content_hash"], "source": res["source"],
+                                "skills": json.dumps(res["skills"])})
+            if time.perf_counter() - last >= INGEST_PROGRESS_S:
+                last = time.perf_counter()
+                yield event("progress")
+    db.flush()
+    yield event("done")
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Bulk-ingest resumes from a zip or a directory.")
+    ap.add_argument("path")
+    ap.add_argument("--workers", type=int, default=INGEST_WORKERS)
+    ap.add_argument("--chunk", type=int, default=INGEST_CHUNK)
+    ap.add_argument("--batch", type=int, default=INGEST_BATCH)
+    args = ap.parse_args()
+    for ev in ingest(args.path, workers=args.workers, chunk=args.chunk, batch=args.batch):
+        print(json.dumps(ev), flush=True)
+        if ev["event"] == "done":
+            sys.exit(1 if ev["failed"] and not ev["parsed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Declarative follow-up rules, compiled into a lookup table per role pack.
+
+A role pack is a JSON file (agents/role_packs/*.json, plus any directory listed in
+HIRESENSE_RULE_PACKS, whose files override built-ins of the same name):
+
+    {
+      "roles": ["software engineer", "backend engineer"],
+      "rules": [
+        {"topic": "metrics", "unless": ["metric"], "question": "What measurable result ...?"},
+        {"topic": "tradeoffs", "question": "What trade-offs did you consider ...?"}
+      ],
+      "fallback": {"topic": "wrap", "question": "If you had another month ...?"}
+    }
+
+Rules are tried in order; the first whose topic hasn't been asked yet fires, unless the
+answer already shows every signal listed in "unless" (metric, tech, ownership, failure,
+star-situation, star-task, star-action, star-result). Since those signals are the
+AnswerFeatures flag bits, each pack is compiled at load time into a table indexed by the
+flags: the rules that can fire for that answer, in order. Planning is then one index and
+a scan for the first topic bit not yet set in the session.
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from agents.answer_features import ALL, FAILURE, METRIC, OWNERSHIP, STAR, TECH
+
+# ----------------------------
+# Config
+# ----------------------------
+BUILTIN_PACKS_DIR = os.path.join(os.path.dirname(__file__), "role_packs")
+EXTRA_PACKS_DIRS = [d for d in os.getenv("HIRESENSE_RULE_PACKS", "").split(os.pathsep) if d]
+DEFAULT_PACK = "software_engineer"
+
+SIGNALS: Dict[str, int] = {"metric": METRIC, "tech": TECH, "ownership": OWNERSHIP, "failure": FAILURE}
+SIGNALS.update({f"star-{piece}": bit for piece, bit in STAR.items()})
+
+# ----------------------------
+# Topics: one bit each, shared by every pack so session state survives a pack switch
+# ----------------------------
+_TOPIC_BITS: Dict[str, int] = {}
+_TOPIC_NAMES: List[str] = []
+_TOPIC_LOCK = threading.Lock()
+
+def topic_bit(topic: str) -> int:
+    bit = _TOPIC_BITS.get(topic)
+    if bit is None:
+        with _TOPIC_LOCK:
+            bit = _TOPIC_BITS.get(topic)
+            if bit is None:
+                bit = _TOPIC_BITS[topic] = 1 << len(_TOPIC_NAMES)
+                _TOPIC_NAMES.append(topic)
+    return bit
+
+def topic_names(mask: int) -> List[str]:
+    return [name for i, name in enumerate(_TOPIC_NAMES) if mask >> i & 1]
+
+
+class Rule:
+    __slots__ = ("topic", "bit", "unless", "question")
+
+    def __init__(self, topic: str, question: str, unless: int = 0):
+        self.topic = topic
+        self.bit = topic_bit(topic)
+        self.unless = unless
+        self.question = question
+
+    def applies(self, flags: int) -> bool:
+        return not self.unless or flags & self.unless != self.unless
+
+    def __repr__(self) -> str:
+        return f"Rule({self.topic!r})"
+
+
+class RulePack:
+    def __init__(self, name: str, roles: List[str], rules: List[Rule], fallback: Rule):
+        self.name = name
+        self.roles = [r.lower() for r in roles]
+        self.rules = rules
+        self.fallback = fallback
+        # flags -> rules that may fire for such an answer, in priority order
+        self._table: List[Tuple[Rule, ...]] = [
+            tuple(r for r in rules if r.applies(flags)) for flags in range(ALL + 1)
+        ]
+
+    def pick(self, flags: int, asked: int) -> Rule:
+        for rule in self._table[flags & ALL]:
+            if not asked & rule.bit:
+                return rule
+        return self.fallback
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict) -> "RulePack":
+        def rule(raw: Dict) -> Rule:
+            unless = 0
+            for signal in raw.get("unless", []):
+                if signal not in SIGNALS:
+                    raise ValueError(f"rule pack {name!r}: unknown signal {signal!r} (known: {', '.join(SIGNALS)})")
+                unless |= SIGNALS[signal]
+            return Rule(raw["topic"], raw["question"], unless)
+        return cls(name, data.get("roles", []), [rule(r) for r in data["rules"]], rule(data["fallback"]))
+
+
+# ----------------------------
+# Loading
+# ----------------------------
+_PACKS: Optional[Dict[str, RulePack]] = None
+_BY_ROLE: Dict[str, RulePack] = {}
+_PACKS_LOCK = threading.Lock()
+
+def load_rule_packs(dirs: Optional[List[str]] = None) -> Dict[str, RulePack]:
+    """Compile every *.json pack; later directories override earlier ones by file name."""
+    packs: Dict[str, RulePack] = {}
+    for d in dirs if dirs is not None else [BUILTIN_PACKS_DIR] + EXTRA_PACKS_DIRS:
+        for fname in sorted(os.listdir(d)):
+            if fname.endswith(".json"):
+                name = fname[:-5]
+                with open(os.path.join(d, fname), encoding="utf-8") as fh:
+                    packs[name] = RulePack.from_dict(name, json.load(fh))
+    if DEFAULT_PACK not in packs:
+        raise ValueError(f"no {DEFAULT_PACK!r} rule pack in {dirs}")
+    return packs
+
+def rule_packs() -> Dict[str, RulePack]:
+    global _PACKS
+    if _PACKS is None:
+        with _PACKS_LOCK:
+            if _PACKS is None:
+                packs = load_rule_packs()
+                _BY_ROLE.update({role: pack for pack in packs.values() for role in pack.roles})
+                _PACKS = packs
+    return _PACKS
+
+def pack_for_role(role: Optional[str]) -> RulePack:
+    """Pack whose "roles" contains the role (case-insensitive), else the default pack."""
+    packs = rule_packs()
+    return _BY_ROLE.get((role or "").strip().lower()) or packs[DEFAULT_PACK]
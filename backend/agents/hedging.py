@@ -0,0 +1,123 @@
+from __future__ import annotations
+import asyncio
+import os
+import threading
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+# ----------------------------
+# Config
+# ----------------------------
+# Latency budget for one interview turn (the follow-up call). Past it the caller answers
+# from the rule-based planner instead of waiting on the model.
+TURN_BUDGET_S = float(os.getenv("HIRESENSE_TURN_BUDGET", "1.5"))
+# Send a duplicate request if the first hasn't answered after this long. Unset → adaptive:
+# the recent p95 of successful calls, clamped to [20%, 60%] of the budget. 0 disables hedging.
+HEDGE_AFTER_S: Optional[float] = float(os.environ["HIRESENSE_HEDGE_AFTER"]) if os.getenv("HIRESENSE_HEDGE_AFTER") else None
+HEDGE_MIN_SAMPLES = 20
+_WINDOW = 512  # recent turn latencies kept for percentiles
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """No attempt finished within the turn budget."""
+
+
+class TurnStats:
+    """Outcome counters and recent latencies for budgeted calls (GET /llm_latency/stats)."""
+    def __init__(self, window: int = _WINDOW):
+        self._lock = threading.Lock()
+        self._ok: "deque[float]" = deque(maxlen=window)      # successful model calls
+        self._turns: "deque[float]" = deque(maxlen=window)   # whole turn, fallback included
+        self.counters = {"turns": 0, "llm": 0, "hedged": 0, "hedge_won": 0,
+                         "deadline_fallbacks": 0, "error_fallbacks": 0}
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def record_turn(self, seconds: float, outcome: str) -> None:
+        """outcome: "llm" | "deadline_fallbacks" | "error_fallbacks"."""
+        with self._lock:
+            self.counters["turns"] += 1
+            self.counters[outcome] += 1
+            self._turns.append(seconds)
+
+    def record_success(self, seconds: float) -> None:
+        with self._lock:
+            self._ok.append(seconds)
+
+    def hedge_delay(self, budget_s: float) -> Optional[float]:
+        if HEDGE_AFTER_S is not None:
+            return HEDGE_AFTER_S if HEDGE_AFTER_S > 0 else None
+        with self._lock:
+            recent = sorted(self._ok)
+        if len(recent) < HEDGE_MIN_SAMPLES:
+            return 0.5 * budget_s
+        p95 = recent[int(0.95 * (len(recent) - 1))]
+        return min(max(p95, 0.2 * budget_s), 0.6 * budget_s)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            c = dict(self.counters)
+            turns = sorted(self._turns)
+
+        def pct(q: float) -> float:
+            return round(turns[int(q * (len(turns) - 1))] * 1000, 1) if turns else 0.0
+
+        fallbacks = c["deadline_fallbacks"] + c["error_fallbacks"]
+        return {
+            "budget_s": TURN_BUDGET_S,
+            "hedge_after_s": self.hedge_delay(TURN_BUDGET_S),
+            **c,
+            "fallback_rate": round(fallbacks / c["turns"], 4) if c["turns"] else 0.0,
+            "hedge_rate": round(c["hedged"] / c["turns"], 4) if c["turns"] else 0.0,
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+        }
+
+
+async def hedged(call: Callable[[], Awaitable[T]], budget_s: float, stats: TurnStats,
+                 can_hedge: Callable[[], bool] = lambda: True) -> T:
+    """
+    `await call()` within `budget_s`. If it hasn't answered by the hedge delay, a second
+    `call()` races it (unless `can_hedge()` says we're saturated); the first success wins
+    and the loser is cancelled. A failed attempt only ends the race if no other attempt
+    is still running. Raises DeadlineExceeded when the budget runs out (everything still
+    running is cancelled).
+    """
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    deadline = t0 + budget_s
+    hedge_at = stats.hedge_delay(budget_s)
+    attempts = {loop.create_task(call())}
+    first = next(iter(attempts))
+    error: Optional[BaseException] = None
+    try:
+        while attempts:
+            now = loop.time()
+            if now >= deadline:
+                raise DeadlineExceeded(f"no reply within {budget_s:.2f}s")
+            wait_until = deadline
+            if hedge_at is not None and t0 + hedge_at > now:
+                wait_until = t0 + hedge_at
+            done, _ = await asyncio.wait(attempts, timeout=wait_until - now, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                attempts.discard(task)
+                if task.exception() is None:
+                    stats.record_success(loop.time() - t0)
+                    if task is not first:
+                        stats.count("hedge_won")
+                    return task.result()
+                error = task.exception()
+            if hedge_at is not None and loop.time() >= t0 + hedge_at:
+                hedge_at = None  # at most one hedge per turn
+                if attempts and can_hedge():  # the first attempt is slow (not failed): race a second one
+                    stats.count("hedged")
+                    attempts.add(loop.create_task(call()))
+        raise error  # every attempt failed before the deadline
+    finally:
+        for task in attempts:
+            task.cancel()
+
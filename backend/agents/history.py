@@ -0,0 +1,193 @@
+from __future__ import annotations
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, List, Tuple, Union
+
+from agents.session_layout import TextLog
+
+if TYPE_CHECKING:  # message objects are built only for prompts: LangChain loads with the first LLM call
+    from langchain_core.messages import BaseMessage
+
+# ----------------------------
+# Config
+# ----------------------------
+HISTORY_TOKEN_BUDGET = int(os.getenv("HIRESENSE_HISTORY_TOKEN_BUDGET", "1500"))  # verbatim window
+HISTORY_MAX_TURNS = int(os.getenv("HIRESENSE_HISTORY_TURNS", "4"))                # question+answer pairs kept verbatim
+SUMMARY_TOKEN_BUDGET = int(os.getenv("HIRESENSE_SUMMARY_TOKENS", "300"))
+
+# Folding runs on one background thread so it never sits on the request path.
+_COMPACTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-compact")
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+def estimate_tokens(text: str) -> int:
+    # ~4 chars/token for English; good enough for budgeting without a tokenizer
+    return max(1, len(text or "") // 4)
+
+def _brief(text: str, max_words: int) -> str:
+    first = _SENTENCE.split((text or "").strip(), maxsplit=1)[0]
+    words = first.split()
+    return " ".join(words[:max_words]) + ("…" if len(words) > max_words else "")
+
+def _summary_line(kind: int, text: str) -> str:
+    if kind == _AI:
+        return "Q: " + _brief(text, 20)
+    return "A: " + _brief(text, 30)
+
+# TextLog entry kinds
+_HUMAN, _AI, _SYSTEM = 0, 1, 2
+_KINDS = {"human": _HUMAN, "ai": _AI, "system": _SYSTEM}
+_TYPES = {v: k for k, v in _KINDS.items()}
+
+def _to_messages(pairs: List[Tuple[str, str]]) -> "List[BaseMessage]":
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+    classes = {"human": HumanMessage, "ai": AIMessage, "system": SystemMessage}
+    return [classes[t](content=text) for t, text in pairs]
+
+
+class BoundedChatHistory:
+    """
+    Chat history with a bounded prompt footprint:
+    - the last `max_turns` question/answer pairs (within `token_budget`) stay verbatim
+    - older messages are folded into one compact summary message, incrementally
+      and on a background thread (until then they are still sent verbatim)
+    Message text lives in an append-only TextLog (pending entries first, then the recent
+    window); LangChain message objects are only built when a prompt asks for `messages`
+    (the interface of langchain_core's BaseChatMessageHistory, without importing it).
+    """
+    def __init__(self, max_turns: int = HISTORY_MAX_TURNS, token_budget: int = HISTORY_TOKEN_BUDGET,
+                 summary_budget: int = SUMMARY_TOKEN_BUDGET):
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self._log = TextLog()
+        self._pending_n = 0          # leading log entries evicted from the window, not folded yet
+        self._recent_tokens = 0
+        self._summary_lines: List[str] = []
+        self._summary_tokens = 0
+        self._lock = threading.Lock()
+
+    # ---------- Chat history interface ----------
+    def pairs(self) -> List[Tuple[str, str]]:
+        """(type, text) of every message a prompt would get: summary, pending, recent."""
+        with self._lock:
+            out: List[Tuple[str, str]] = []
+            if self._summary_lines:
+                out.append(("system", "Earlier in this interview (summary):\n" + "\n".join(self._summary_lines)))
+            return out + [(_TYPES[kind], text) for kind, text in self._log]
+
+    @property
+    def messages(self) -> "List[BaseMessage]":
+        return _to_messages(self.pairs())
+
+    async def aget_messages(self) -> "List[BaseMessage]":
+        return self.messages
+
+    def add_message(self, message: Any) -> None:
+        self._append(_KINDS.get(message.type, _HUMAN), message.content)
+
+    def add_messages(self, messages: List[Any]) -> None:
+        for m in messages:
+            self.add_message(m)
+
+    def add_user_message(self, message: Union[str, Any]) -> None:
+        self._append(_HUMAN, message if isinstance(message, str) else message.content)
+
+    def add_ai_message(self, message: Union[str, Any]) -> None:
+        self._append(_AI, message if isinstance(message, str) else message.content)
+
+    def _append(self, kind: int, text: str) -> None:
+        with self._lock:
+            self._log.append(kind, text)
+            self._recent_tokens += estimate_tokens(text)
+            evicted = self._evict_locked()
+        if evicted:
+            _COMPACTOR.submit(self.compact)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._log, self._pending_n, self._summary_lines = TextLog(), 0, []
+            self._recent_tokens = self._summary_tokens = 0
+
+    # ---------- Budgeting ----------
+    def _evict_locked(self) -> bool:
+        evicted = False
+        # always keep the latest exchange, even if it alone exceeds the budget
+        while len(self._log) - self._pending_n > 2 and (
+            len(self._log) - self._pending_n > 2 * self.max_turns or self._recent_tokens > self.token_budget
+        ):
+            self._recent_tokens -= estimate_tokens(self._log[self._pending_n][1])
+            self._pending_n += 1
+            evicted = True
+        return evicted
+
+    def compact(self) -> None:
+        """Fold pending messages into the summary (cheap, extractive, incremental)."""
+        with self._lock:
+            for i in range(self._pending_n):
+                line = _summary_line(*self._log[i])
+                self._summary_lines.append(line)
+                self._summary_tokens += estimate_tokens(line)
+            self._log.drop(self._pending_n)
+            self._pending_n = 0
+            while len(self._summary_lines) > 1 and self._summary_tokens > self.summary_budget:
+                self._summary_tokens -= estimate_tokens(self._summary_lines.pop(0))
+
+    # ---------- Introspection ----------
+    def last_ai_text(self) -> str:
+        """The latest agent message (the question the candidate is answering), "" if none."""
+        with self._lock:
+            for i in range(len(self._log) - 1, -1, -1):
+                kind, text = self._log[i]
+                if kind == _AI:
+                    return text
+        return ""
+
+    def prompt_tokens(self) -> int:
+        with self._lock:
+            pending = sum(estimate_tokens(self._log[i][1]) for i in range(self._pending_n))
+            return self._recent_tokens + self._summary_tokens + pending
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return (
+                self._log.nbytes()
+                + sum(sys.getsizeof(line) for line in self._summary_lines)
+                + sys.getsizeof(self._summary_lines)
+            )
+
+    # ---------- Persistence (db/session_store.py) ----------
+    # Messages are written in langchain_core's messages_to_dict layout, read back by type/content.
+    def _dicts_locked(self, start: int, stop: int) -> List[dict]:
+        return [{"type": _TYPES[kind], "data": {"content": text, "type": _TYPES[kind]}}
+                for kind, text in (self._log[i] for i in range(start, stop))]
+
+    def to_json(self) -> str:
+        with self._lock:
+            return json.dumps({
+                "max_turns": self.max_turns,
+                "token_budget": self.token_budget,
+                "summary_budget": self.summary_budget,
+                "summary": self._summary_lines,
+                "pending": self._dicts_locked(0, self._pending_n),
+                "recent": self._dicts_locked(self._pending_n, len(self._log)),
+            })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "BoundedChatHistory":
+        data = json.loads(raw)
+        h = cls(data["max_turns"], data["token_budget"], data["summary_budget"])
+        h._summary_lines = list(data["summary"])
+        h._summary_tokens = sum(estimate_tokens(line) for line in h._summary_lines)
+        pending, recent = data["pending"], data["recent"]
+        for m in pending + recent:
+            h._log.append(_KINDS.get(m["type"], _HUMAN), m["data"]["content"])
+        h._pending_n = len(pending)
+        h._recent_tokens = sum(estimate_tokens(m["data"]["content"]) for m in recent)
+        if pending:
+            _COMPACTOR.submit(h.compact)
+        return h
@@ -1,38 +1,36 @@
 from __future__ import annotations
+import json
 import os
 import re
 from typing import Dict, List, Optional, Tuple
 
-# Optional OpenAI (keep soft dependency)
-_OPENAI_OK = False
-try:
-    from openai import OpenAI
-    _OPENAI_OK = bool(os.getenv("OPENAI_API_KEY"))
-except Exception:
-    _OPENAI_OK = False
-
-
-TECH_REGEX = re.compile(
-    r"\b(python|typescript|javascript|react|vue|node|fastapi|flask|django|"
-    r"sql|postgres|mysql|mongodb|redis|aws|gcp|azure|docker|kubernetes|"
-    r"terraform|airflow|spark|hadoop|kafka|elasticsearch|grpc|"
-    r"pytorch|tensorflow|sklearn|huggingface|llm|rag|vector|milvus|weaviate|"
-    r"snowflake|databricks|bigquery|lambda|s3|cloudfront|sagemaker)\b",
-    re.I,
+# Optional OpenAI (keep soft dependency). The SDK is imported with the first call, and
+# never in mock mode (HIRESENSE_MOCK=1).
+_OPENAI_OK = bool(os.getenv("OPENAI_API_KEY")) and os.getenv("HIRESENSE_MOCK", "0") not in ("1", "true", "True")
+
+from agents.answer_features import (
+    FAILURE_WORDS,
+    METRIC_PATTERN,
+    OWNERSHIP_WORDS,
+    STAR_WORDS,
+    TECH_WORDS,
+    AnswerFeatures,
+    word_regex,
 )
+from agents.followup_rules import pack_for_role, rule_packs, topic_bit, topic_names
+from agents.rubric import coaching_from_features, rubric_from_features
+from agents.session_layout import Shared, label, share
+from db.session_store import SessionStore, make_backend
 
-STAR_HINTS = {
-    "situation": re.compile(r"\b(situation|context|problem|background)\b", re.I),
-    "task": re.compile(r"\b(task|goal|objective|role)\b", re.I),
-    "action": re.compile(r"\b(action|implemented|built|designed|led|drove|migrated)\b", re.I),
-    "result": re.compile(r"\b(result|impact|outcome|metric|improved|reduced|increased|saved)\b", re.I),
-}
-
-METRIC_REGEX = re.compile(r"\b\d+(\.\d+)?\s?(%|percent|x|k|m|mn|million|billion|\$|sec|ms|req/s|rps|errors|latency|cost)\b", re.I)
-OWNERSHIP_REGEX = re.compile(r"\b(I|my|me|myself|led|owned|drove|designed|architected|authored)\b", re.I)
-FAILURE_REGEX = re.compile(r"\b(failed|outage|incident|postmortem|rollback|bug|regression|oncall)\b", re.I)
+TECH_REGEX = word_regex(TECH_WORDS)
+STAR_HINTS = {piece: word_regex(words) for piece, words in STAR_WORDS.items()}
+METRIC_REGEX = re.compile(METRIC_PATTERN, re.I)
+OWNERSHIP_REGEX = word_regex(OWNERSHIP_WORDS)
+FAILURE_REGEX = word_regex(FAILURE_WORDS)
 
 # --------- Helper planning utilities ---------
+# Single-signal checks for ad-hoc callers; the agent itself analyzes each answer once
+# with AnswerFeatures and reads every signal off that.
 def has_metric(text: str) -> bool:
     return bool(METRIC_REGEX.search(text or ""))
 
@@ -51,202 +49,242 @@ def shows_ownership(text: str) -> bool:
 
 # --------- State & templates ---------
 class SessionState:
+    """
+    Per-candidate planner state. Asked topics are bits (see agents/followup_rules.py);
+    the parsed resume and JD are shared by content hash (agents/session_layout.py), so
+    read them as values and assign new dicts rather than mutating them.
+    """
+    __slots__ = ("turn", "asked", "recent", "_resume", "_jd", "role")
+
     def __init__(self):
         self.turn: int = 0
-        self.asked_topics: List[str] = []
-        self.resume: Dict = {}
-        self.jd: Dict = {}
-
-    def mark(self, topic: str):
-        if topic not in self.asked_topics:
-            self.asked_topics.append(topic)
+        self.asked: int = 0                 # topic bitflags
+        self.recent: Tuple[str, ...] = ()   # last 3 topics asked, for the LLM de-dup guard
+        self._resume: Optional[Shared] = None
+        self._jd: Optional[Shared] = None
+        self.role: str = ""
+
+    @property
+    def resume(self) -> Dict:
+        return self._resume.value if self._resume is not None else {}
+
+    @resume.setter
+    def resume(self, value: Dict):
+        self._resume = share(value) if value else None
+
+    @property
+    def jd(self) -> Dict:
+        return self._jd.value if self._jd is not None else {}
+
+    @jd.setter
+    def jd(self, value: Dict):
+        self._jd = share(value) if value else None
+
+    def mark(self, topic: str, bit: int = 0):
+        bit = bit or topic_bit(topic)
+        if not self.asked & bit:
+            self.asked |= bit
+            self.recent = (self.recent + (label(topic),))[-3:]
+
+    def reset_topics(self):
+        self.asked, self.recent = 0, ()
+
+    def copy(self) -> "SessionState":
+        st = SessionState()
+        for name in self.__slots__:
+            setattr(st, name, getattr(self, name))
+        return st
+
+    @property
+    def asked_topics(self) -> List[str]:
+        return topic_names(self.asked)
+
+    def to_json(self) -> str:
+        return json.dumps({"turn": self.turn, "asked_topics": self.asked_topics, "recent": list(self.recent),
+                           "resume": self.resume, "jd": self.jd, "role": self.role})
+
+    @classmethod
+    def from_json(cls, raw: str) -> "SessionState":
+        data = json.loads(raw)
+        st = cls()
+        st.turn, st.resume, st.jd = data["turn"], data["resume"], data["jd"]
+        st.role = label(data.get("role"))
+        for topic in data["asked_topics"]:  # names, not bits: bit numbering is per process
+            st.asked |= topic_bit(topic)
+        st.recent = tuple(data.get("recent", data["asked_topics"][-3:]))
+        return st
 
 class InterviewAgent:
     """
     Conversation manager with light planning:
-    - Tracks state per candidate
+    - Tracks state per candidate (shareable across workers, see db/session_store.py)
     - Picks diverse follow-ups based on the candidate's last answer
     - Uses OpenAI if available, otherwise robust templates
     """
-    def __init__(self):
-        self.state: Dict[str, SessionState] = {}
-        self.client = OpenAI() if _OPENAI_OK else None
+    def __init__(self, state: Optional[SessionStore] = None):
+        self.state: SessionStore = state if state is not None else SessionStore(
+            "agent_state",
+            backend=make_backend(),
+            dumps=SessionState.to_json,
+            loads=SessionState.from_json,
+            factory=SessionState,
+        )
+        self._client = None
+        rule_packs()  # compile the role packs now: a bad pack fails at startup, not mid-interview
+
+    @property
+    def client(self):
+        if self._client is None and _OPENAI_OK:
+            try:
+                from agents.openai_clients import get_openai_client
+                self._client = get_openai_client()
+            except Exception:
+                return None
+        return self._client
 
     # ---------- Public API used by app.py ----------
     def question_from_resume(self, candidate: str, parsed_resume: Dict) -> str:
-        st = self.state.setdefault(candidate, SessionState())
-        st.resume = parsed_resume or {}
-        st.turn = 0
-        st.asked_topics = []
-
-        # Try to tailor the opener from resume skills/experience
-        skills = st.resume.get("skills") or []
-        exps = st.resume.get("experiences") or []
-        if skills:
-            pri_skill = skills[0]
-            q = f"To start, could you walk me through a recent project where you used {pri_skill}? Focus on your role and the measurable impact."
-        elif exps:
-            q = f"Pick one of the experiences on your resume that best reflects this role. What was the challenge, and what changed because of your work?"
-        else:
-            q = "Could you walk me through a project you’re proud of and your specific impact?"
-        st.mark("opener")
-        st.turn = 1
-        return q
+        def apply(st: SessionState) -> str:
+            st.resume = parsed_resume or {}
+            st.turn = 0
+            st.reset_topics()
+
+            # Try to tailor the opener from resume skills/experience
+            skills = st.resume.get("skills") or []
+            exps = st.resume.get("experiences") or []
+            if skills:
+                pri_skill = skills[0]
+                q = f"To start, could you walk me through a recent project where you used {pri_skill}? Focus on your role and the measurable impact."
+            elif exps:
+                q = f"Pick one of the experiences on your resume that best reflects this role. What was the challenge, and what changed because of your work?"
+            else:
+                q = "Could you walk me through a project you’re proud of and your specific impact?"
+            st.mark("opener")
+            st.turn = 1
+            return q
+
+        return self.state.update(candidate, apply)
 
     def start_interview(self, candidate: str, jd_info: Dict) -> str:
-        st = self.state.setdefault(candidate, SessionState())
-        st.jd = jd_info or {}
-        st.turn = 1
-        st.asked_topics = []
-
-        focus = (jd_info.get("focus") or ["impact"])[0]
-        level = jd_info.get("seniority") or "mid"
-        if focus.lower() in ("system design", "architecture"):
-            q = "Let’s start with system design: design a high-level architecture for a solution you recently shipped. What were the key components and trade-offs?"
-        elif level.lower() in ("senior", "staff", "lead"):
-            q = "Tell me about a project where you led the direction. How did you align stakeholders and what outcome did you drive?"
-        else:
-            q = "Could you walk me through a project you’re proud of and your specific impact?"
-        st.mark("opener")
-        return q
+        def apply(st: SessionState) -> str:
+            st.jd = jd_info or {}
+            st.role = label(st.jd.get("role"))
+            st.turn = 1
+            st.reset_topics()
+
+            focus = (jd_info.get("focus") or ["impact"])[0]
+            level = jd_info.get("seniority") or "mid"
+            if focus.lower() in ("system design", "architecture"):
+                q = "Let’s start with system design: design a high-level architecture for a solution you recently shipped. What were the key components and trade-offs?"
+            elif level.lower() in ("senior", "staff", "lead"):
+                q = "Tell me about a project where you led the direction. How did you align stakeholders and what outcome did you drive?"
+            else:
+                q = "Could you walk me through a project you’re proud of and your specific impact?"
+            st.mark("opener")
+            return q
+
+        return self.state.update(candidate, apply)
 
     def handle_answer(self, candidate: str, answer: str) -> Tuple[str, str]:
         """
         Returns (followup_question, coaching_feedback)
         """
-        st = self.state.setdefault(candidate, SessionState())
-        st.turn += 1
+        feats = AnswerFeatures.of(answer)  # one scan, shared by the planner and the coaching
+        # LLM call runs outside the state update: it must not be repeated on a retry.
+        snapshot = self.state.get_or_create(candidate)
+        llm_q = self._llm_followup(answer, snapshot) if self.client else None
 
-        # Try LLM for follow-up if available. If not, use templates.
-        if self.client:
-            try:
-                sys = (
-                    "You are a precise technical interviewer. Ask a single, concise follow-up question "
-                    "that advances depth. Avoid repeating previous questions. Prefer specifics: metrics, "
-                    "trade-offs, constraints, failure modes, scale, testing, or ownership."
-                )
-                user = f"Candidate answer: {answer}\nAlready covered: {', '.join(st.asked_topics) or 'none'}"
-                chat = self.client.chat.completions.create(
-                    model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-                    messages=[
-                        {"role": "system", "content": sys},
-                        {"role": "user", "content": user},
-                    ],
-                    temperature=0.3,
-                    max_tokens=120,
-                )
-                q = chat.choices[0].message.content.strip()
-                # Light de-dup guard
-                if any(tag in q.lower() for tag in st.asked_topics[-3:]):
-                    q = self._rule_based_followup(answer, st)
-            except Exception:
-                q = self._rule_based_followup(answer, st)
-        else:
-            q = self._rule_based_followup(answer, st)
+        def apply(st: SessionState) -> str:
+            st.turn += 1
+            q = llm_q
+            # Light de-dup guard; templates when the LLM is unavailable
+            if q is None or any(tag in q.lower() for tag in st.recent):
+                q = self._rule_based_followup(answer, st, feats)
+            return q
+
+        q = self.state.update(candidate, apply)
 
         # Coaching
-        feedback = self._coaching(answer)
+        feedback = self._coaching(answer, feats)
 
         return (q, feedback)
 
-    def rubric_scores(self, transcript: str) -> Dict:
+    def plan_followup(self, candidate: str, answer: str, feats: Optional[AnswerFeatures] = None,
+                      role: str = "") -> Tuple[str, str]:
+        """
+        Rule-based turn only (no network): the fast fallback when the LLM misses its
+        latency budget. Probes already used for this candidate are not repeated; `role`
+        selects the rule pack.
+        """
+        f = feats if feats is not None else AnswerFeatures.of(answer)
+
+        def apply(st: SessionState) -> str:
+            return self._plan(st, answer, f, role)
+
+        q = self.state.update(candidate, apply) if candidate else apply(SessionState())
+        return (q, self._coaching(answer, f))
+
+    def preview_followup(self, candidate: str, answer: str, feats: Optional[AnswerFeatures] = None,
+                         role: str = "") -> Tuple[str, str, SessionState]:
+        """
+        plan_followup on a copy of the candidate's state, which is returned rather than
+        saved: for speculative turns (drafts) that may never be used. See adopt_plan().
+        """
+        f = feats if feats is not None else AnswerFeatures.of(answer)
+        current = self.state.get(candidate) if candidate else None
+        st = current.copy() if current is not None else SessionState()
+        return self._plan(st, answer, f, role), self._coaching(answer, f), st
+
+    def adopt_plan(self, candidate: str, planned: SessionState) -> bool:
+        """Saves a previewed state; False if the candidate's turn has moved on since the preview."""
+        def apply(st: SessionState) -> bool:
+            if st.turn != planned.turn - 1:
+                return False
+            for name in SessionState.__slots__:
+                setattr(st, name, getattr(planned, name))
+            return True
+        return self.state.update(candidate, apply)
+
+    def _plan(self, st: SessionState, answer: str, f: AnswerFeatures, role: str) -> str:
+        st.turn += 1
+        if role:
+            st.role = label(role)
+        return self._rule_based_followup(answer, st, f)
+
+    def _llm_followup(self, answer: str, st: SessionState) -> Optional[str]:
+        try:
+            sys = (
+                "You are a precise technical interviewer. Ask a single, concise follow-up question "
+                "that advances depth. Avoid repeating previous questions. Prefer specifics: metrics, "
+                "trade-offs, constraints, failure modes, scale, testing, or ownership."
+            )
+            user = f"Candidate answer: {answer}\nAlready covered: {', '.join(st.asked_topics) or 'none'}"
+            chat = self.client.chat.completions.create(
+                model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+                messages=[
+                    {"role": "system", "content": sys},
+                    {"role": "user", "content": user},
+                ],
+                temperature=0.3,
+                max_tokens=120,
+            )
+            return chat.choices[0].message.content.strip()
+        except Exception:
+            return None
+
+    def rubric_scores(self, transcript: str, feats: Optional[AnswerFeatures] = None) -> Dict:
         # Keep lightweight local rubric (you already render this on the UI)
-        depth = min(100, 40 + 10 * transcript.lower().count("why"))
-        metrics = 90 if METRIC_REGEX.search(transcript or "") else 50
-        structure = 90 if all(h.search(transcript or "") for h in STAR_HINTS.values()) else 60
-        clarity = 80
-        overall = round((depth + metrics + structure + clarity) / 4)
-        return {
-            "overall": overall,
-            "categories": [
-                {"name": "Depth", "score": depth, "rationale": "Probes root cause, trade-offs, constraints."},
-                {"name": "Metrics", "score": metrics, "rationale": "Uses %/$/latency/scale."},
-                {"name": "Structure", "score": structure, "rationale": "STAR / structured narrative."},
-                {"name": "Clarity", "score": clarity, "rationale": "Clear, concise communication."},
-            ],
-            "notes": "Auto-scored locally for demo purposes.",
-        }
+        # `feats`: features already computed for this text (e.g. OR-ed per-answer features);
+        # live sessions should keep a RubricAccumulator instead of re-scoring the transcript.
+        return rubric_from_features(feats if feats is not None else AnswerFeatures.of(transcript))
 
     # ---------- Internal: rule-based planner ----------
-    def _rule_based_followup(self, answer: str, st: SessionState) -> str:
-        text = (answer or "").strip()
-        asked = set(st.asked_topics)
-
-        # 1) Missing result/metric → ask impact
-        if "metrics" not in asked and not has_metric(text):
-            st.mark("metrics")
-            return "What measurable result did you achieve (e.g., % improvement, time saved, cost reduced, or scale handled)?"
-
-        # 2) Missing STAR pieces → ask the first missing one
-        if "star-result" not in asked and not has_star_piece(text, "result"):
-            st.mark("star-result")
-            return "What was the outcome? Please quantify the result if possible."
-        if "star-action" not in asked and not has_star_piece(text, "action"):
-            st.mark("star-action")
-            return "What specific actions did you personally take? Call out key design or implementation steps."
-        if "star-task" not in asked and not has_star_piece(text, "task"):
-            st.mark("star-task")
-            return "What was your exact scope or responsibility in this project?"
-        if "star-situation" not in asked and not has_star_piece(text, "situation"):
-            st.mark("star-situation")
-            return "Briefly set the context—what problem or constraint were you addressing?"
-
-        # 3) No technology specifics → ask architecture/tech stack
-        if "tech" not in asked and not mentions_tech(text):
-            st.mark("tech")
-            return "What technologies or architecture choices did you use, and why were they a good fit?"
-
-        # 4) Ownership/leadership
-        if "ownership" not in asked and not shows_ownership(text):
-            st.mark("ownership")
-            return "Which parts did you personally own end-to-end, and where did you have to influence others?"
-
-        # 5) Trade-offs & constraints (depth)
-        if "tradeoffs" not in asked:
-            st.mark("tradeoffs")
-            return "What trade-offs did you consider (e.g., latency vs. throughput, cost vs. reliability)? Why that choice?"
-
-        # 6) Failure/learning
-        if "failure" not in asked and not FAILURE_REGEX.search(text):
-            st.mark("failure")
-            return "Tell me about a failure or incident on this project. What went wrong and what changed after?"
-
-        # 7) Testing/quality
-        if "quality" not in asked:
-            st.mark("quality")
-            return "How did you test and validate the solution (load testing, chaos, unit/integration, data quality checks)?"
-
-        # 8) Scale & performance
-        if "scale" not in asked:
-            st.mark("scale")
-            return "What scale does it run at now (requests/sec, data size, latency, error budget), and how did you ensure performance?"
-
-        # 9) Security/Compliance
-        if "security" not in asked:
-            st.mark("security")
-            return "Any security, privacy, or compliance requirements you had to meet? How did that affect the design?"
-
-        # 10) Collaboration
-        if "collab" not in asked:
-            st.mark("collab")
-            return "Who did you collaborate with (PMs, data, SRE, design)? How did you drive alignment or handle disagreements?"
-
-        # Fallback—rotate a generic probe that still moves forward
-        st.mark("wrap")
-        return "If you had another month, what would you improve or measure next, and why?"
-
-    def _coaching(self, answer: str) -> str:
-        text = answer or ""
-        tips: List[str] = []
-        if not has_metric(text):
-            tips.append("Add a metric: %, $, time saved, scale, latency, or error rate.")
-        cov = star_coverage(text)
-        if cov < 3:
-            tips.append("Use STAR: Situation → Task → Action → Result.")
-        if not mentions_tech(text):
-            tips.append("Mention specific technologies and design choices.")
-        if not shows_ownership(text):
-            tips.append("Clarify your personal role and decisions.")
-        if not tips:
-            tips.append("Great structure—consider adding a brief trade-off you evaluated.")
-        return " ".join(tips)
+    def _rule_based_followup(self, answer: str, st: SessionState, feats: Optional[AnswerFeatures] = None) -> str:
+        # Rules live in agents/role_packs/*.json; see agents/followup_rules.py
+        f = feats if feats is not None else AnswerFeatures.of(answer)
+        rule = pack_for_role(st.role).pick(f.flags, st.asked)
+        st.mark(rule.topic, rule.bit)
+        return rule.question
+
+    def _coaching(self, answer: str, feats: Optional[AnswerFeatures] = None) -> str:
+        return coaching_from_features(feats if feats is not None else AnswerFeatures.of(answer))
@@ -0,0 +1,89 @@
+from __future__ import annotations
+import re
+from typing import List
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JsonFieldStream:
+    """
+    Incremental extractor for one string field of a JSON object that is still
+    being streamed, e.g. {"followup": "..."} token by token.
+
+    feed(chunk) returns the newly decoded characters of that field (possibly "").
+    Chunks are kept in a list; `raw` joins them so the caller can json.loads the
+    text once complete. Each feed only scans its own chunk (plus a short carried
+    tail), so a streamed response costs O(n) overall.
+    """
+    _KEY_TAIL = 64  # chars kept while looking for the key, for a key split across chunks
+
+    def __init__(self, field: str):
+        self._chunks: List[str] = []
+        self._parts: List[str] = []
+        self.done = False
+        self._key = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self._scan = ""                  # text not yet matched against the key
+        self._found = False
+        self._tail = ""                  # unread text inside the string (a split escape)
+
+    @property
+    def raw(self) -> str:
+        return "".join(self._chunks)
+
+    @property
+    def value(self) -> str:
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> str:
+        chunk = chunk or ""
+        self._chunks.append(chunk)
+        if self.done:
+            return ""
+        if not self._found:
+            self._scan += chunk
+            m = self._key.search(self._scan)
+            if not m:
+                self._scan = self._scan[-(self._KEY_TAIL + len(self._key.pattern)):]
+                return ""
+            self._found = True
+            raw, self._scan = self._scan[m.end():], ""
+        else:
+            raw = self._tail + chunk
+
+        out = []
+        i, n = 0, len(raw)
+        while i < n:
+            ch = raw[i]
+            if ch == '"':
+                self.done = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            # escape sequence: wait for the rest of it if it is split across chunks
+            if i + 1 >= n:
+                break
+            esc = raw[i + 1]
+            if esc == "u":
+                if i + 6 > n:
+                    break
+                code = int(raw[i + 2:i + 6], 16)
+                # surrogate pair → need the low half too
+                if 0xD800 <= code < 0xDC00:
+                    if i + 12 > n:
+                        break
+                    low = int(raw[i + 8:i + 12], 16)
+                    out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                    i += 12
+                else:
+                    out.append(chr(code))
+                    i += 6
+            else:
+                out.append(_ESCAPES.get(esc, esc))
+                i += 2
+        self._tail = "" if self.done else raw[i:]
+        delta = "".join(out)
+        self._parts.append(delta)
+        return delta
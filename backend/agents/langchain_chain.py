@@ -1,93 +1,135 @@
 from __future__ import annotations
-import os, json, random
-from typing import Dict
-from collections import defaultdict
+import os, json, random, asyncio, time, threading, weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, Optional, Tuple
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.runnables import RunnableWithMessageHistory
-from langchain_community.chat_message_histories import ChatMessageHistory
+from agents.history import BoundedChatHistory, estimate_tokens
+from db.session_store import SessionStore, make_backend
+from agents.json_stream import JsonFieldStream
+from agents.llm_cache import make_llm_cache, prompt_key
+from agents.hedging import TURN_BUDGET_S, DeadlineExceeded, TurnStats, hedged
+from agents.interview_agent import InterviewAgent, SessionState
+from agents.metrics import FALLBACKS, LLM_TOKENS, stage
 
 # ----------------------------
 # Config
 # ----------------------------
 OPENAI_KEY = os.getenv("OPENAI_API_KEY")
 MOCK_MODE = os.getenv("HIRESENSE_MOCK", "0") in ("1", "true", "True")
+LLM_TIMEOUT_S = float(os.getenv("HIRESENSE_LLM_TIMEOUT", "20"))          # per call, incl. queueing
+LLM_MAX_CONCURRENCY = int(os.getenv("HIRESENSE_LLM_CONCURRENCY", "32"))  # in-flight calls per loop
+# Opt-in: leave the resume out of the opening-question prompt, so every candidate on a
+# requisition (same role/seniority/tone/JD) gets the same opener — one LLM call, then cache hits.
+SHARED_OPENERS = os.getenv("HIRESENSE_SHARED_OPENERS", "0") in ("1", "true", "True")
 
 # ----------------------------
 # Per-candidate chat histories
 # ----------------------------
-_HISTORY: Dict[str, ChatMessageHistory] = defaultdict(ChatMessageHistory)
+_HISTORY: SessionStore = SessionStore(
+    "history",
+    backend=make_backend(),
+    dumps=BoundedChatHistory.to_json,
+    loads=BoundedChatHistory.from_json,
+    factory=BoundedChatHistory,
+)
 
-def get_history(candidate: str) -> ChatMessageHistory:
-    return _HISTORY[candidate]
+def get_history(candidate: str) -> BoundedChatHistory:
+    return _HISTORY.get_or_create(candidate)
 
 def reset_history(candidate: str):
-    _HISTORY[candidate] = ChatMessageHistory()
+    _HISTORY[candidate] = BoundedChatHistory()
+    _RULE_PLANNER.state.pop(candidate, None)
 
-def add_pair_to_history(candidate: str, user_text: str, ai_text: str | None = None):
-    h = get_history(candidate)
-    if user_text:
-        h.add_user_message(user_text)
-    if ai_text:
-        h.add_ai_message(ai_text)
+def _appender(user_text: str, ai_text: str | None):
+    def apply(h: BoundedChatHistory) -> str:
+        question = h.last_ai_text()
+        if user_text:
+            h.add_user_message(user_text)
+        if ai_text:
+            h.add_ai_message(ai_text)
+        return question
+    return apply
+
+def add_pair_to_history(candidate: str, user_text: str, ai_text: str | None = None) -> str:
+    """Append one exchange; returns the question `user_text` answers (the previous AI message)."""
+    # read-modify-write; optimistic-locked when workers share the backend
+    return _HISTORY.update(candidate, _appender(user_text, ai_text))
+
+# Async variants for request handlers: backend I/O runs off the event loop.
+async def aget_history(candidate: str) -> BoundedChatHistory:
+    return await _HISTORY.aget_or_create(candidate)
+
+async def areset_history(candidate: str):
+    await _HISTORY.aset(candidate, BoundedChatHistory())
+    await _RULE_PLANNER.state.apop(candidate)
+
+async def aadd_pair_to_history(candidate: str, user_text: str, ai_text: str | None = None) -> str:
+    return await _HISTORY.aupdate(candidate, _appender(user_text, ai_text))
+
+def history_store_stats() -> Dict:
+    return _HISTORY.stats()
+
+def history_stats() -> Dict:
+    per_session = {
+        cand: {"bytes": h.memory_bytes(), "prompt_tokens": h.prompt_tokens()}
+        for cand, h in list(_HISTORY.items())
+    }
+    return {
+        "sessions": len(per_session),
+        "total_bytes": sum(v["bytes"] for v in per_session.values()),
+        "per_session": per_session,
+    }
 
 # ----------------------------
 # LLMs (bound to key if present)
 # ----------------------------
-def _maybe_llm(model="gpt-4o-mini", temperature=0.2):
-    # In mock mode or no key → return None so we skip remote calls.
-    if MOCK_MODE or not OPENAI_KEY:
-        return None
-    return ChatOpenAI(model=model, temperature=temperature, api_key=OPENAI_KEY)
-
-llm_json = _maybe_llm(model="gpt-4o-mini", temperature=0)       # deterministic JSON
-llm_chat = _maybe_llm(model="gpt-4o-mini", temperature=0.3)     # natural question style
-
-# ----------------------------
-# Prompts
-# ----------------------------
-SYSTEM_BASE = """You are HireSense, a senior interview agent for {role} ({seniority}) with a {tone} tone.
-You adapt questions to the candidate's background and drive to concrete, metric-driven outcomes.
-You always avoid redundancy and move the conversation forward.
-"""
-
-FIRST_Q_TEMPLATE = ChatPromptTemplate.from_messages([
-    ("system", SYSTEM_BASE + """
-You are starting an interview. You have optional resume text and job description.
-Produce exactly ONE concise opening question tailored to the candidate.
-Keep it specific and grounded in resume/JD themes. Avoid pleasantries.
-"""),
-    ("human", """RESUME (optional):
-----------------
-{resume_text}
-
-JOB DESCRIPTION (optional):
----------------------------
-{jd_text}
-
-Return only the question, no extra text."""),
-])
-
-FOLLOWUP_JSON_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", SYSTEM_BASE + """
-Continue the interview based on the conversation so far and the candidate's latest answer.
-You must return a strict JSON object with two keys:
-- "followup": a single next question (concise, non-redundant, drives to metrics/impact/tradeoffs).
-- "feedback": a short coaching tip (1 sentence) to help the candidate improve their next answer.
-
-Rules:
-- Ask something NEW. Do not repeat prior questions.
-- Prefer metrics (%/$/time saved/scale), decisions & trade-offs, validation/experiments, ownership, and lessons learned.
-- Keep tone {tone}.
-- JSON only, no markdown, no extra commentary.
-"""),
-    MessagesPlaceholder("history"),
-    ("human", """Candidate's latest answer:
-{candidate_response}
-
-Return JSON ONLY like: {"followup":"...","feedback":"..."}"""),
-])
+# LangChain and the OpenAI SDK are imported with the first LLM call (agents/llm_chains.py):
+# in mock mode or without a key the chains stay None and neither is ever loaded.
+LLM_ENABLED = not MOCK_MODE and bool(OPENAI_KEY)
+
+llm_json = None   # deterministic JSON
+llm_chat = None   # natural question style
+
+# Response cache in front of the chains (memory LRU → SQLite tier, see agents/llm_cache.py).
+# A hit skips LangChain entirely; HIRESENSE_LLM_CACHE=off disables it.
+LLM_CACHE = make_llm_cache() if LLM_ENABLED else None
+
+def llm_cache_stats() -> Dict:
+    return LLM_CACHE.stats() if LLM_CACHE is not None else {"mode": "off"}
+
+# ----------------------------
+# Runnables (composed once, reused for every request)
+# ----------------------------
+FIRST_Q_CHAIN = None
+FOLLOWUP_CHAIN = None
+_FIRST_Q_FP = ""   # cache-key fingerprints: template text + model config
+_FOLLOWUP_FP = ""
+_CHAINS_READY = not LLM_ENABLED
+_CHAINS_LOCK = threading.Lock()
+
+def configure_llms(json_llm, chat_llm):
+    """(Re)bind the LLMs and rebuild the shared runnables. Also used by benchmarks to inject fakes."""
+    global llm_json, llm_chat, FIRST_Q_CHAIN, FOLLOWUP_CHAIN, _FIRST_Q_FP, _FOLLOWUP_FP, _CHAINS_READY
+    from agents.llm_chains import build_chains
+    llm_json, llm_chat = json_llm, chat_llm
+    FIRST_Q_CHAIN, FOLLOWUP_CHAIN, _FIRST_Q_FP, _FOLLOWUP_FP = build_chains(json_llm, chat_llm, get_history)
+    _CHAINS_READY = True
+
+def _chains() -> Tuple[Optional[object], Optional[object]]:
+    """(FIRST_Q_CHAIN, FOLLOWUP_CHAIN), built on first use."""
+    if not _CHAINS_READY:
+        with _CHAINS_LOCK:
+            if not _CHAINS_READY:
+                from agents.llm_chains import make_llm
+                configure_llms(make_llm(temperature=0), make_llm(temperature=0.3))
+    return FIRST_Q_CHAIN, FOLLOWUP_CHAIN
+
+# Sync callers wait on a worker so the turn budget applies to them too
+_SYNC_POOL = ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY, thread_name_prefix="hiresense-llm")
+
+def _session_config(candidate: str) -> dict:
+    return {"configurable": {"session_id": candidate}}
 
 # ----------------------------
 # Fallback generators (local / no LLM)
@@ -106,71 +148,335 @@ def _fallback_opening(role: str, seniority: str, tone: str, resume_text: str, jd
     if "sql" in (resume_text + jd_text).lower(): cue = " (data model choices welcome)"
     return random.choice(OPENERS) + cue
 
-def _fallback_followup_and_feedback(answer: str) -> Dict[str, str]:
-    wants_metric = "metric" not in answer.lower() and "%" not in answer and "$" not in answer
-    if wants_metric:
-        return {
-            "followup": "Thanks — can you quantify the outcome (e.g., % improvement, time saved, scale handled, or error rate change)?",
-            "feedback": "Tie your actions to a concrete metric and be explicit about your personal role.",
-        }
-    return {
-        "followup": "What trade-offs did you consider, and how did you validate the approach (experiments, load tests, user studies)?",
-        "feedback": "Great; briefly mention alternatives you rejected and why.",
-    }
+# The rule-based planner answers in microseconds, so it is also the fallback when the
+# model misses the turn budget. It keeps its own per-candidate state (probes already used).
+_RULE_PLANNER = InterviewAgent(state=SessionStore(
+    "fallback_plan",
+    backend=make_backend(),
+    dumps=SessionState.to_json,
+    loads=SessionState.from_json,
+    factory=SessionState,
+))
+
+# Set while a draft is being answered (adraft_followup_and_feedback): the planner then
+# works on a copy of the candidate's state, kept here until the draft is actually used.
+_DRAFT_PLANS: "ContextVar[Optional[Dict[str, SessionState]]]" = ContextVar("draft_plans", default=None)
+
+def _fallback_followup_and_feedback(answer: str, candidate: str = "", role: str = "",
+                                    reason: str = "no_llm") -> Dict[str, str]:
+    """`reason` (metrics): no_llm | deadline | error."""
+    FALLBACKS.inc(reason=reason)
+    drafts = _DRAFT_PLANS.get()
+    with stage("fallback"):
+        if drafts is None:
+            followup, feedback = _RULE_PLANNER.plan_followup(candidate, answer or "", role=role)
+        else:
+            followup, feedback, drafts[candidate] = _RULE_PLANNER.preview_followup(candidate, answer or "", role=role)
+    return {"followup": followup, "feedback": feedback}
+
+async def _afallback_followup_and_feedback(*args) -> Dict[str, str]:
+    return await _RULE_PLANNER.state.offload(_fallback_followup_and_feedback, *args)
+
+# ----------------------------
+# Async call guard (timeout + concurrency limit)
+# ----------------------------
+# One semaphore per event loop: asyncio primitives bind to the loop that first
+# waits on them, and tests/benchmarks may run several loops in one process.
+_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def _llm_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _SEMAPHORES.get(loop)
+    if sem is None:
+        sem = _SEMAPHORES[loop] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return sem
+
+async def _ainvoke_guarded(runnable, inputs: dict, config: dict | None = None):
+    async def _call():
+        async with _llm_semaphore():
+            return await runnable.ainvoke(inputs, config=config)
+    with stage("llm_wait"):
+        result = await asyncio.wait_for(_call(), timeout=LLM_TIMEOUT_S)
+    _count_tokens(inputs, config, result.content)
+    return result
+
+def _count_tokens(inputs: dict, config: Optional[dict], completion: str) -> None:
+    # estimates (no tokenizer): the variable part of the prompt, its history and the reply
+    session_id = ((config or {}).get("configurable") or {}).get("session_id")
+    prompt = sum(estimate_tokens(v) for v in inputs.values() if isinstance(v, str))
+    if session_id:
+        prompt += get_history(session_id).prompt_tokens()
+    LLM_TOKENS.inc(prompt, direction="prompt")
+    LLM_TOKENS.inc(estimate_tokens(completion or ""), direction="completion")
+
+# ----------------------------
+# Turn latency budget (hedged follow-up calls, see agents/hedging.py)
+# ----------------------------
+TURN_STATS = TurnStats()
+
+def turn_latency_stats() -> Dict:
+    return TURN_STATS.stats()
+
+def _can_hedge() -> bool:
+    # a duplicate request only helps if it doesn't queue behind everyone else's
+    return not _llm_semaphore().locked()
+
+# ----------------------------
+# Response cache: keys + single-flight for concurrent identical prompts
+# ----------------------------
+_INFLIGHT: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = weakref.WeakKeyDictionary()
+
+# prompt_build stage: the prompt's variable parts (history included) → cache key
+def _first_q_key(inputs: dict) -> str:
+    with stage("prompt_build"):
+        return prompt_key([_FIRST_Q_FP, inputs["role"], inputs["seniority"], inputs["tone"],
+                           inputs["resume_text"], inputs["jd_text"]])
+
+def _followup_key(candidate: str, inputs: dict) -> str:
+    with stage("prompt_build"):
+        history = get_history(candidate).pairs() if candidate else []
+        return prompt_key([_FOLLOWUP_FP, inputs["role"], inputs["seniority"], inputs["tone"],
+                           *(f"{kind}: {text}" for kind, text in history), inputs["candidate_response"]])
+
+async def _acached(key: str, produce) -> str:
+    """
+    Cached value for `key`, else `await produce()` (which must return the validated text
+    or raise). Concurrent misses on the same key share one call: on a screening day many
+    candidates open the same requisition at once.
+    """
+    if LLM_CACHE is None:
+        return await produce()
+    hit = await LLM_CACHE.aget(key)
+    if hit is not None:
+        return hit
+    inflight = _INFLIGHT.setdefault(asyncio.get_running_loop(), {})
+    leader = inflight.get(key)
+    if leader is not None:
+        LLM_CACHE.count("coalesced")
+        value = await asyncio.shield(leader)
+        return value if value is not None else await produce()  # leader failed: try on our own
+    fut = inflight[key] = asyncio.get_running_loop().create_future()
+    try:
+        value = await produce()
+    except BaseException:
+        fut.set_result(None)
+        raise
+    finally:
+        inflight.pop(key, None)
+    fut.set_result(value)
+    await LLM_CACHE.aput(key, value)
+    return value
 
 # ----------------------------
 # Public builders with safe fallbacks
 # ----------------------------
+def _first_q_inputs(role: str, seniority: str, tone: str, resume_text: str, jd_text: str) -> dict:
+    return {
+        "role": role,
+        "seniority": seniority,
+        "tone": tone,
+        "resume_text": "" if SHARED_OPENERS else (resume_text or ""),
+        "jd_text": jd_text or "",
+    }
+
+def _parse_followup(content: str) -> Dict[str, str]:
+    with stage("json_parse"):
+        data = json.loads(content)
+        followup = str(data.get("followup") or "").strip()
+        feedback = str(data.get("feedback") or "").strip()
+    if not followup:
+        raise ValueError("empty followup")
+    return {"followup": followup, "feedback": feedback}
+
+def _followup_inputs(role: str, seniority: str, tone: str, candidate_response: str) -> dict:
+    return {
+        "role": role,
+        "seniority": seniority,
+        "tone": tone,
+        "candidate_response": candidate_response,
+    }
+
+def _opener_text(out) -> str:
+    q = (out.content or "").strip()
+    if not q:
+        raise ValueError("empty opener")
+    return q
+
 def build_first_question(role: str, seniority: str, tone: str, resume_text: str, jd_text: str) -> str:
+    first_q_chain, _ = _chains()
     # Mock / no key
-    if llm_chat is None:
+    if first_q_chain is None:
         return _fallback_opening(role, seniority, tone, resume_text, jd_text)
 
+    inputs = _first_q_inputs(role, seniority, tone, resume_text, jd_text)
+    key = _first_q_key(inputs) if LLM_CACHE is not None else None
     try:
-        chain = FIRST_Q_TEMPLATE | llm_chat
-        out = chain.invoke({
-            "role": role,
-            "seniority": seniority,
-            "tone": tone,
-            "resume_text": resume_text or "",
-            "jd_text": jd_text or "",
-        })
-        q = (out.content or "").strip()
-        return q or _fallback_opening(role, seniority, tone, resume_text, jd_text)
+        q = LLM_CACHE.get(key) if key else None
+        if q is None:
+            q = _opener_text(first_q_chain.invoke(inputs))
+            if key:
+                LLM_CACHE.put(key, q)
+        return q
     except Exception as e:
         # Quota / network / anything → graceful fallback
         return _fallback_opening(role, seniority, tone, resume_text, jd_text)
 
 def build_followup_and_feedback(candidate: str, role: str, seniority: str, tone: str, candidate_response: str) -> Dict[str, str]:
-    if llm_json is None:
-        return _fallback_followup_and_feedback(candidate_response)
+    _, followup_chain = _chains()
+    if followup_chain is None:
+        return _fallback_followup_and_feedback(candidate_response, candidate, role)
 
+    inputs = _followup_inputs(role, seniority, tone, candidate_response)
+    key = _followup_key(candidate, inputs) if LLM_CACHE is not None else None
+    t0 = time.perf_counter()
     try:
-        prompt = FOLLOWUP_JSON_PROMPT
-        runnable = prompt | llm_json
-
-        def _get_history(_: dict) -> ChatMessageHistory:
-            return get_history(candidate)
-
-        runner = RunnableWithMessageHistory(
-            runnable=runnable,
-            get_session_history=_get_history,
-            history_messages_key="history",
-        )
-
-        result = runner.invoke({
-            "role": role,
-            "seniority": seniority,
-            "tone": tone,
-            "candidate_response": candidate_response,
-        })
-
-        content = result.content
-        data = json.loads(content)
-        followup = str(data.get("followup") or "").strip()
-        feedback = str(data.get("feedback") or "").strip()
-        if not followup:
-            raise ValueError("empty followup")
-        return {"followup": followup, "feedback": feedback}
+        raw = LLM_CACHE.get(key) if key else None
+        if raw is None:
+            # same budget as the async path; a late reply is abandoned to the worker thread
+            fut = _SYNC_POOL.submit(followup_chain.invoke, inputs, config=_session_config(candidate))
+            with stage("llm_wait"):
+                result = fut.result(timeout=TURN_BUDGET_S)
+            _count_tokens(inputs, _session_config(candidate), result.content)
+            raw = json.dumps(_parse_followup(result.content))
+            if key:
+                LLM_CACHE.put(key, raw)
+        TURN_STATS.record_turn(time.perf_counter() - t0, "llm")
+        return json.loads(raw)
+    except FutureTimeout:
+        TURN_STATS.record_turn(time.perf_counter() - t0, "deadline_fallbacks")
+        reason = "deadline"
+    except Exception:
+        TURN_STATS.record_turn(time.perf_counter() - t0, "error_fallbacks")
+        reason = "error"
+    return _fallback_followup_and_feedback(candidate_response, candidate, role, reason)
+
+# Async variants used by the API: never block the event loop on a model round trip.
+async def abuild_first_question(role: str, seniority: str, tone: str, resume_text: str, jd_text: str) -> str:
+    first_q_chain, _ = _chains()
+    if first_q_chain is None:
+        return _fallback_opening(role, seniority, tone, resume_text, jd_text)
+
+    inputs = _first_q_inputs(role, seniority, tone, resume_text, jd_text)
+
+    async def produce() -> str:
+        return _opener_text(await _ainvoke_guarded(first_q_chain, inputs))
+
+    try:
+        return await _acached(_first_q_key(inputs), produce)
+    except Exception:
+        # Timeout / quota / network → graceful fallback
+        return _fallback_opening(role, seniority, tone, resume_text, jd_text)
+
+async def abuild_followup_and_feedback(candidate: str, role: str, seniority: str, tone: str, candidate_response: str) -> Dict[str, str]:
+    _, followup_chain = _chains()
+    if followup_chain is None:
+        return await _afallback_followup_and_feedback(candidate_response, candidate, role)
+
+    inputs = _followup_inputs(role, seniority, tone, candidate_response)
+    if candidate:  # loaded off the loop; the cache key, prompt and token count then read memory
+        await aget_history(candidate)
+
+    async def attempt() -> str:
+        result = await _ainvoke_guarded(followup_chain, inputs, config=_session_config(candidate))
+        return json.dumps(_parse_followup(result.content))  # a malformed reply loses the race like an error
+
+    async def produce() -> str:
+        # only well-formed replies get cached; the rule-based fallback never does
+        return await hedged(attempt, TURN_BUDGET_S, TURN_STATS, can_hedge=_can_hedge)
+
+    t0 = time.perf_counter()
+    try:
+        out = json.loads(await _acached(_followup_key(candidate, inputs), produce))
+        TURN_STATS.record_turn(time.perf_counter() - t0, "llm")
+        return out
+    except DeadlineExceeded:
+        TURN_STATS.record_turn(time.perf_counter() - t0, "deadline_fallbacks")
+        reason = "deadline"
+    except Exception:
+        TURN_STATS.record_turn(time.perf_counter() - t0, "error_fallbacks")
+        reason = "error"
+    return await _afallback_followup_and_feedback(candidate_response, candidate, role, reason)
+
+async def adraft_followup_and_feedback(candidate: str, role: str, seniority: str, tone: str,
+                                      candidate_response: str) -> Tuple[Dict[str, str], Optional[SessionState]]:
+    """
+    abuild_followup_and_feedback for a speculative draft, leaving the rule planner alone:
+    if the fallback answers, it plans on a copy of the candidate's state, returned with
+    the result. Pass that to aadopt_draft_plan() only when the draft is actually used.
+    """
+    plans: Dict[str, SessionState] = {}
+    token = _DRAFT_PLANS.set(plans)
+    try:
+        out = await abuild_followup_and_feedback(candidate, role, seniority, tone, candidate_response)
+    finally:
+        _DRAFT_PLANS.reset(token)
+    return out, plans.get(candidate)
+
+async def aadopt_draft_plan(candidate: str, plan: Optional[SessionState]) -> bool:
+    """Saves a used draft's planner state; False if the interview moved on since (draft is stale)."""
+    if plan is None:
+        return True
+    return await _RULE_PLANNER.state.offload(_RULE_PLANNER.adopt_plan, candidate, plan)
+
+async def astream_followup_and_feedback(
+    candidate: str, role: str, seniority: str, tone: str, candidate_response: str
+) -> AsyncIterator[Tuple[str, object]]:
+    """
+    Streams the follow-up as it is generated.
+    Yields ("token", str) for each new piece of the followup text, then exactly one
+    ("done", {"followup", "feedback"}). The "done" payload is authoritative: if the
+    stream fails midway it carries the fallback, which replaces any partial text.
+    """
+    _, followup_chain = _chains()
+    if followup_chain is None:
+        out = await _afallback_followup_and_feedback(candidate_response, candidate, role)
+        yield "token", out["followup"]
+        yield "done", out
+        return
+
+    inputs = _followup_inputs(role, seniority, tone, candidate_response)
+    if candidate:
+        await aget_history(candidate)
+    key = _followup_key(candidate, inputs) if LLM_CACHE is not None else None
+    cached = await LLM_CACHE.aget(key) if key else None
+    if cached is not None:
+        TURN_STATS.record_turn(0.0, "llm")
+        out = json.loads(cached)
+        yield "token", out["followup"]
+        yield "done", out
+        return
+
+    # The budget bounds time to first token; once text is flowing, each chunk gets LLM_TIMEOUT_S.
+    parser = JsonFieldStream("followup")
+    t0 = time.perf_counter()
+    outcome = "llm"
+    try:
+        with stage("llm_wait"):  # includes handing tokens to the client as they arrive
+            async with _llm_semaphore():
+                stream = followup_chain.astream(inputs, config=_session_config(candidate)).__aiter__()
+                started = False
+                while True:
+                    timeout = LLM_TIMEOUT_S if started else max(0.0, TURN_BUDGET_S - (time.perf_counter() - t0))
+                    try:
+                        chunk = await asyncio.wait_for(stream.__anext__(), timeout=timeout)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        if not started:
+                            outcome = "deadline_fallbacks"
+                        raise
+                    delta = parser.feed(chunk.content or "")
+                    if delta:
+                        started = True
+                        yield "token", delta
+        _count_tokens(inputs, _session_config(candidate), parser.raw)
+        out = _parse_followup(parser.raw)
+        if key:
+            await LLM_CACHE.aput(key, json.dumps(out))
     except Exception:
-        return _fallback_followup_and_feedback(candidate_response)
+        if outcome == "llm":
+            outcome = "error_fallbacks"
+        out = await _afallback_followup_and_feedback(candidate_response, candidate, role,
+                                                     "deadline" if outcome == "deadline_fallbacks" else "error")
+    TURN_STATS.record_turn(time.perf_counter() - t0, outcome)
+    yield "done", out
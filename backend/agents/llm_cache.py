@@ -0,0 +1,189 @@
+from __future__ import annotations
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Config
+# ----------------------------
+LLM_CACHE_MODE = os.getenv("HIRESENSE_LLM_CACHE", "sqlite")                    # off | memory | sqlite
+LLM_CACHE_MAX_ITEMS = int(os.getenv("HIRESENSE_LLM_CACHE_MAX", "4096"))        # in-memory LRU
+LLM_CACHE_DISK_MAX_ITEMS = int(os.getenv("HIRESENSE_LLM_CACHE_DISK_MAX", "100000"))
+LLM_CACHE_TTL_S = float(os.getenv("HIRESENSE_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+_PRUNE_EVERY = 512  # disk writes between expiry/size prunes
+_WS = re.compile(r"\s+")
+
+def prompt_key(parts: Iterable[str]) -> str:
+    """sha256 over the prompt's parts (template fingerprint, model config, inputs, history),
+    each whitespace-normalized so cosmetic differences in pasted JDs/resumes still hit."""
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(_WS.sub(" ", p or "").strip().encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class _SQLiteTier:
+    """Second tier on the app's SQLAlchemy engine; survives restarts and is shared by workers."""
+    def __init__(self, max_items: int):
+        from db.database import Base, SessionLocal, engine
+        from db.models import LLMCacheEntry
+        from sqlalchemy.exc import OperationalError
+        try:
+            Base.metadata.create_all(bind=engine, tables=[LLMCacheEntry.__table__])
+        except OperationalError as e:
+            if "already exists" not in str(e):  # workers booting at once race on CREATE TABLE
+                raise
+        self._session, self._model = SessionLocal, LLMCacheEntry
+        self.max_items = max_items
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._session() as db:
+            row = db.get(self._model, key)
+            if row is None or row.expires_at < time.time():
+                return None
+            return row.value
+
+    def put(self, key: str, value: str, expires_at: float) -> None:
+        with self._session() as db:
+            db.merge(self._model(key=key, value=value, created_at=time.time(), expires_at=expires_at))
+            db.commit()
+        self._writes += 1
+        if self._writes % _PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self) -> int:
+        M = self._model
+        with self._session() as db:
+            n = db.query(M).filter(M.expires_at < time.time()).delete()
+            excess = db.query(M).count() - self.max_items
+            if excess > 0:
+                oldest = db.query(M.key).order_by(M.created_at).limit(excess).scalar_subquery()
+                n += db.query(M).filter(M.key.in_(oldest)).delete(synchronize_session=False)
+            db.commit()
+            return n
+
+    def clear(self) -> None:
+        with self._session() as db:
+            db.query(self._model).delete()
+            db.commit()
+
+
+class LLMResponseCache:
+    """
+    Model outputs by prompt key: an in-memory LRU in front of an optional SQLite tier, with a TTL.
+    Values are the final text (after validation by the caller), so a malformed reply is never pinned.
+    """
+    def __init__(self, max_items: int = LLM_CACHE_MAX_ITEMS, ttl_s: float = LLM_CACHE_TTL_S,
+                 disk: bool = True, disk_max_items: int = LLM_CACHE_DISK_MAX_ITEMS):
+        self.max_items = max_items
+        self.ttl_s = ttl_s
+        self._mem: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._disk = _SQLiteTier(disk_max_items) if disk else None
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0, "expired": 0,
+                         "coalesced": 0}
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def _mem_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._mem.get(key)
+            if item is None:
+                return None
+            if item[0] < time.time():
+                del self._mem[key]
+                self.counters["expired"] += 1
+                return None
+            self._mem.move_to_end(key)
+            self.counters["memory_hits"] += 1
+            return item[1]
+
+    def _mem_put(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._mem[key] = (expires_at, value)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_items:
+                self._mem.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        value = self._disk.get(key) if self._disk is not None else None
+        self.count("disk_hits" if value is not None else "misses")
+        if value is not None:
+            self._mem_put(key, value, time.time() + self.ttl_s)
+        return value
+
+    # ---------- Public API ----------
+    def get(self, key: str) -> Optional[str]:
+        value = self._mem_get(key)
+        return value if value is not None else self._disk_get(key)
+
+    def put(self, key: str, value: str) -> None:
+        expires_at = time.time() + self.ttl_s
+        self._mem_put(key, value, expires_at)
+        self.count("writes")
+        if self._disk is not None:
+            try:
+                self._disk.put(key, value, expires_at)
+            except Exception as e:  # a cache write must never fail the request
+                logger.warning("LLM cache disk write failed: %s", e)
+
+    async def aget(self, key: str) -> Optional[str]:
+        # memory hits stay on the event loop; only the disk tier goes to a thread
+        value = self._mem_get(key)
+        if value is None and self._disk is not None:
+            value = await asyncio.get_running_loop().run_in_executor(None, self._disk_get, key)
+        elif value is None:
+            self.count("misses")
+        return value
+
+    async def aput(self, key: str, value: str) -> None:
+        expires_at = time.time() + self.ttl_s
+        self._mem_put(key, value, expires_at)
+        self.count("writes")
+        if self._disk is not None:
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self._disk.put, key, value, expires_at)
+            except Exception as e:
+                logger.warning("LLM cache disk write failed: %s", e)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            c = dict(self.counters)
+            size = len(self._mem)
+        lookups = c["memory_hits"] + c["disk_hits"] + c["misses"]
+        return {
+            "mode": "sqlite" if self._disk is not None else "memory",
+            "size": size,
+            "max_items": self.max_items,
+            "ttl_s": self.ttl_s,
+            **c,
+            "hit_rate": round((c["memory_hits"] + c["disk_hits"]) / lookups, 4) if lookups else 0.0,
+            # misses that still didn't call the model (they joined an identical in-flight call)
+            "calls_saved_rate": round((c["memory_hits"] + c["disk_hits"] + c["coalesced"]) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def make_llm_cache(mode: str = LLM_CACHE_MODE) -> Optional[LLMResponseCache]:
+    if mode in ("off", "0", "", "none"):
+        return None
+    return LLMResponseCache(disk=(mode == "sqlite"))
@@ -0,0 +1,112 @@
+"""
+LangChain prompts, models and runnables for the interview turns.
+
+Importing this module loads langchain_core / langchain_openai (most of the API's startup
+time), so agents/langchain_chain.py only imports it on the first LLM call — never in
+mock mode or without a key.
+"""
+from __future__ import annotations
+import os
+from typing import Callable, Optional, Tuple
+
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from agents.llm_cache import prompt_key
+from agents.openai_clients import get_async_openai_client, get_openai_client
+
+# ----------------------------
+# Prompts
+# ----------------------------
+SYSTEM_BASE = """You are HireSense, a senior interview agent for {role} ({seniority}) with a {tone} tone.
+You adapt questions to the candidate's background and drive to concrete, metric-driven outcomes.
+You always avoid redundancy and move the conversation forward.
+"""
+
+FIRST_Q_TEMPLATE = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_BASE + """
+You are starting an interview. You have optional resume text and job description.
+Produce exactly ONE concise opening question tailored to the candidate.
+Keep it specific and grounded in resume/JD themes. Avoid pleasantries.
+"""),
+    ("human", """RESUME (optional):
+----------------
+{resume_text}
+
+JOB DESCRIPTION (optional):
+---------------------------
+{jd_text}
+
+Return only the question, no extra text."""),
+])
+
+FOLLOWUP_JSON_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_BASE + """
+Continue the interview based on the conversation so far and the candidate's latest answer.
+You must return a strict JSON object with two keys:
+- "followup": a single next question (concise, non-redundant, drives to metrics/impact/tradeoffs).
+- "feedback": a short coaching tip (1 sentence) to help the candidate improve their next answer.
+
+Rules:
+- Ask something NEW. Do not repeat prior questions.
+- Prefer metrics (%/$/time saved/scale), decisions & trade-offs, validation/experiments, ownership, and lessons learned.
+- Keep tone {tone}.
+- JSON only, no markdown, no extra commentary.
+"""),
+    MessagesPlaceholder("history"),
+    ("human", """Candidate's latest answer:
+{candidate_response}
+
+Return JSON ONLY like: {{"followup":"...","feedback":"..."}}"""),
+])
+
+# ----------------------------
+# Models
+# ----------------------------
+def make_llm(model: str = "gpt-4o-mini", temperature: float = 0.2):
+    from langchain_openai import ChatOpenAI
+    # Share one pooled HTTP client per process so connections / TLS sessions are reused
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        client=get_openai_client().chat.completions,
+        async_client=get_async_openai_client().chat.completions,
+    )
+
+# ----------------------------
+# Runnables
+# ----------------------------
+# The candidate id travels in config={"configurable": {"session_id": ...}};
+# history is read-only here — the API owns writes via add_pair_to_history.
+class _WithSessionHistory(Runnable):
+    """Adds the session's chat history to the prompt inputs under "history"."""
+    # A plain Runnable rather than RunnablePassthrough.assign(RunnableLambda(...)):
+    # the callback layer repr()s every step per call, and RunnableLambda's repr
+    # reads the function source from disk (~10 ms/request).
+    def __init__(self, get_history: Callable):
+        self._get_history = get_history
+
+    def invoke(self, input: dict, config: Optional[RunnableConfig] = None) -> dict:
+        session_id = ((config or {}).get("configurable") or {}).get("session_id")
+        return {**input, "history": self._get_history(session_id).messages if session_id else []}
+
+    async def ainvoke(self, input: dict, config: Optional[RunnableConfig] = None, **kwargs) -> dict:
+        return self.invoke(input, config)
+
+def _fingerprint(template: ChatPromptTemplate, llm) -> str:
+    parts = [getattr(getattr(m, "prompt", None), "template", None) or getattr(m, "variable_name", "")
+             for m in template.messages]
+    parts += [type(llm).__name__, str(getattr(llm, "model_name", "")), str(getattr(llm, "temperature", ""))]
+    return prompt_key(parts)
+
+def build_chains(json_llm, chat_llm, get_history: Callable) -> Tuple[Optional[Runnable], Optional[Runnable], str, str]:
+    """(first-question chain, follow-up chain, and their cache-key fingerprints: template text + model config)"""
+    first_q = (FIRST_Q_TEMPLATE | chat_llm) if chat_llm is not None else None
+    followup = (_WithSessionHistory(get_history) | FOLLOWUP_JSON_PROMPT | json_llm) if json_llm is not None else None
+    return (
+        first_q,
+        followup,
+        _fingerprint(FIRST_Q_TEMPLATE, chat_llm) if chat_llm is not None else "",
+        _fingerprint(FOLLOWUP_JSON_PROMPT, json_llm) if json_llm is not None else "",
+    )
@@ -0,0 +1,248 @@
+"""
+In-process metrics in the Prometheus text format (GET /metrics), no client library needed.
+
+- `REQUEST_SECONDS`: per-route request latency histogram (MetricsMiddleware, route
+  templates as labels, so /ws/interview/{candidate} is one series)
+- `STAGE_SECONDS` + `stage()`: per-stage timers of an interview turn (pdf_extract,
+  prompt_build, llm_wait, json_parse, fallback)
+- `FALLBACKS`, `LLM_TOKENS`: fallback reasons taken and estimated token counts
+- `gauge()`: values read at scrape time (store sizes, queue depths)
+- `profile_turn()`: optional pyinstrument sampling profile of a turn, written as an HTML
+  flamegraph when the turn was slower than HIRESENSE_PROFILE_SLOW_MS
+"""
+from __future__ import annotations
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Config
+# ----------------------------
+PROFILE_SLOW_MS = float(os.getenv("HIRESENSE_PROFILE_SLOW_MS", "0"))   # 0 = profiler off
+PROFILE_DIR = os.getenv("HIRESENSE_PROFILE_DIR", "./profiles")
+PROFILE_KEEP = int(os.getenv("HIRESENSE_PROFILE_KEEP", "50"))            # newest flamegraphs kept
+
+_LE_INF = 'le="+Inf"'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 1.5, 2.5, 5.0, 10.0, 30.0)
+
+def _labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _num(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+# ----------------------------
+# Metric types
+# ----------------------------
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, n: float = 1, **labels: str) -> None:
+        key = tuple(labels.get(k, "") for k in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + n
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        out += [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items]
+        return out
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # bucket counts..., +Inf count, sum
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels.get(k, "") for k in self.labelnames)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            s[i] += 1
+            s[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, s in items:
+            running = 0.0
+            for le, n in zip(self.buckets, s):
+                running += n
+                bound = 'le="%s"' % _num(le)
+                out.append(f"{self.name}_bucket{_labels(self.labelnames, key, bound)} {_num(running)}")
+            running += s[len(self.buckets)]
+            out.append(f"{self.name}_bucket{_labels(self.labelnames, key, _LE_INF)} {_num(running)}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, key)} {_num(running)}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(s[-1])}")
+        return out
+
+
+class Gauge:
+    """Read at scrape time: `fn()` returns a number, or {label value: number} for one label."""
+    def __init__(self, name: str, help: str, fn: Callable, label: str = ""):
+        self.name, self.help, self.fn, self.label = name, help, fn, label
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            value = self.fn()
+        except Exception as e:
+            logger.warning("Metric %s failed: %s", self.name, e)
+            return out
+        if isinstance(value, dict):
+            out += [f"{self.name}{_labels((self.label,), (k,))} {_num(v)}" for k, v in sorted(value.items())]
+        else:
+            out.append(f"{self.name} {_num(value)}")
+        return out
+
+# ----------------------------
+# Registry
+# ----------------------------
+_REGISTRY: Dict[str, object] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+def _register(metric):
+    with _REGISTRY_LOCK:
+        return _REGISTRY.setdefault(metric.name, metric)
+
+def counter(name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, help, labels))
+
+def histogram(name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help, labels, buckets))
+
+def gauge(name: str, help: str, fn: Callable, label: str = "") -> Gauge:
+    """Registers (or replaces) a scrape-time gauge."""
+    g = Gauge(name, help, fn, label)
+    with _REGISTRY_LOCK:
+        _REGISTRY[name] = g
+    return g
+
+def render() -> str:
+    with _REGISTRY_LOCK:
+        metrics = list(_REGISTRY.values())
+    lines: List[str] = []
+    for m in metrics:
+        lines += m.render()
+    return "\n".join(lines) + "\n"
+
+REQUEST_SECONDS = histogram("hiresense_http_request_seconds", "HTTP request latency by route (until the body is sent).",
+                            ("method", "route", "status"))
+STAGE_SECONDS = histogram("hiresense_stage_seconds", "Time spent per interview-turn stage.", ("stage",))
+FALLBACKS = counter("hiresense_fallbacks_total", "Turns answered by the rule-based fallback, by reason.", ("reason",))
+LLM_TOKENS = counter("hiresense_llm_tokens_estimated_total",
+                     "LLM tokens (estimated at ~4 characters/token) by direction.", ("direction",))
+STARTED_AT = time.time()
+gauge("hiresense_uptime_seconds", "Seconds since the process started.", lambda: time.time() - STARTED_AT)
+
+# ----------------------------
+# Stage timers
+# ----------------------------
+@contextmanager
+def stage(name: str):
+    """Times the block into hiresense_stage_seconds{stage=name}; works across awaits."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - t0, stage=name)
+
+# ----------------------------
+# ASGI middleware: per-route request histogram
+# ----------------------------
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        t0 = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_SECONDS.observe(time.perf_counter() - t0, method=scope.get("method", ""),
+                                    route=getattr(route, "path", "unmatched"), status=str(status["code"]))
+
+# ----------------------------
+# Optional sampling profiler (pyinstrument) for slow turns
+# ----------------------------
+_PROFILER_OK: Optional[bool] = None
+
+def _profiler_available() -> bool:
+    global _PROFILER_OK
+    if _PROFILER_OK is None:
+        try:
+            import pyinstrument  # noqa: F401  optional dependency
+            _PROFILER_OK = True
+        except Exception:
+            logger.warning("HIRESENSE_PROFILE_SLOW_MS is set but pyinstrument is not installed; profiling off")
+            _PROFILER_OK = False
+    return _PROFILER_OK
+
+def _write_profile(profiler, name: str, elapsed_ms: float) -> None:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{elapsed_ms:.0f}ms.html")
+    with open(path, "w") as fh:
+        fh.write(profiler.output_html())
+    files = sorted(f for f in os.listdir(PROFILE_DIR) if f.endswith(".html"))
+    for old in files[:-PROFILE_KEEP]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old))
+        except OSError:
+            pass
+
+@asynccontextmanager
+async def profile_turn(name: str):
+    """Samples the block with pyinstrument; keeps a flamegraph if it took > PROFILE_SLOW_MS."""
+    if PROFILE_SLOW_MS <= 0 or not _profiler_available():
+        yield
+        return
+    from pyinstrument import Profiler
+    profiler = Profiler(async_mode="enabled")
+    t0 = time.perf_counter()
+    try:
+        profiler.start()
+    except RuntimeError:  # another profile already active in this context
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.stop()
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        if elapsed_ms > PROFILE_SLOW_MS:
+            try:
+                _write_profile(profiler, name, elapsed_ms)
+            except Exception as e:
+                logger.warning("Profile write failed: %s", e)
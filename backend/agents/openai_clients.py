@@ -0,0 +1,43 @@
+from __future__ import annotations
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # the SDK is imported on first client use: mock mode never loads it
+    import httpx
+    import openai
+
+# ----------------------------
+# Shared, pooled OpenAI clients (one per process)
+# ----------------------------
+# Every ChatOpenAI instance and InterviewAgent reuse the same connection pool,
+# so keep-alive connections and TLS sessions survive across requests.
+HTTP_MAX_CONNECTIONS = int(os.getenv("HIRESENSE_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HIRESENSE_HTTP_MAX_KEEPALIVE", "20"))
+HTTP_TIMEOUT_S = float(os.getenv("HIRESENSE_HTTP_TIMEOUT", "30"))
+
+def _limits() -> "httpx.Limits":
+    import httpx
+    return httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=60.0,
+    )
+
+@lru_cache(maxsize=None)
+def get_openai_client() -> "openai.OpenAI":
+    import httpx
+    import openai
+    return openai.OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=httpx.Client(limits=_limits(), timeout=HTTP_TIMEOUT_S),
+    )
+
+@lru_cache(maxsize=None)
+def get_async_openai_client() -> "openai.AsyncOpenAI":
+    import httpx
+    import openai
+    return openai.AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=httpx.AsyncClient(limits=_limits(), timeout=HTTP_TIMEOUT_S),
+    )
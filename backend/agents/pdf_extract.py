@@ -0,0 +1,259 @@
+from __future__ import annotations
+import asyncio
+import functools
+import hashlib
+import io
+import mmap
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
+
+# ----------------------------
+# Config
+# ----------------------------
+PDF_WORKERS = int(os.getenv("HIRESENSE_PDF_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))  # 0 → in-process
+PDF_TIMEOUT_S = float(os.getenv("HIRESENSE_PDF_TIMEOUT", "10"))
+PDF_MAX_PAGES = int(os.getenv("HIRESENSE_PDF_MAX_PAGES", "10"))
+PDF_MAX_BYTES = int(os.getenv("HIRESENSE_PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_CACHE_ITEMS = int(os.getenv("HIRESENSE_PDF_CACHE_ITEMS", "2048"))
+
+# ----------------------------
+# Worker side (runs in the pool; must stay importable and picklable)
+# ----------------------------
+def _read_pages(stream, max_pages: int) -> str:
+    from pypdf import PdfReader
+    reader = PdfReader(stream)
+    pages = []
+    for p in reader.pages[:max_pages]:
+        try:
+            pages.append(p.extract_text() or "")
+        except Exception:
+            pages.append("")
+    return "\n".join(pages)
+
+def _extract_worker(src: Union[bytes, str], max_pages: int) -> Optional[str]:
+    """`src` is the PDF bytes, or a path to a spooled upload (memory-mapped, never copied)."""
+    try:
+        import pypdf  # noqa: F401
+    except Exception:
+        return None
+    try:
+        if isinstance(src, bytes):
+            return _read_pages(io.BytesIO(src), max_pages)
+        with open(src, "rb") as fh:
+            try:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):  # empty file / fs without mmap
+                return _read_pages(fh, max_pages)
+            try:
+                return _read_pages(mm, max_pages)
+            finally:
+                try:
+                    mm.close()
+                except BufferError:
+                    pass  # still referenced by the reader; freed with it
+    except Exception:
+        return None
+
+class PdfExtractError(Exception):
+    """Extraction did not finish (timed out, or its worker died). Not cached: worth retrying."""
+
+def _serve(conn) -> None:
+    """Worker process main loop: one (fn, args) at a time until the parent closes the pipe."""
+    while True:
+        try:
+            fn, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            conn.send((True, fn(*args)))
+        except Exception as e:
+            conn.send((False, e))
+
+# ----------------------------
+# Worker pool + content-hash cache (parent side)
+# ----------------------------
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_serve, args=(child,), daemon=True)
+        self.proc.start()
+        child.close()
+
+    def call(self, fn, args, timeout: float):
+        self.conn.send((fn, args))
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"no result after {timeout:g}s")
+        ok, value = self.conn.recv()  # EOFError: the process died mid-task
+        if not ok:
+            raise value
+        return value
+
+    def kill(self) -> None:
+        self.proc.terminate()
+        self.proc.join(1)
+        self.conn.close()
+
+class _WorkerPool:
+    """
+    Up to `size` worker processes, each running one task at a time. A task that times
+    out or crashes costs only its own worker (terminated, replaced on the next call);
+    the other in-flight tasks keep running. The timeout bounds the work itself, not
+    time spent waiting for a free worker.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        # spawn: forking a threaded server process is not safe
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._dispatch = ThreadPoolExecutor(max_workers=size, thread_name_prefix="pdf-dispatch")
+        self.counters = {"started": 0, "killed": 0}
+
+    def call(self, fn, *args, timeout: float):
+        with self._slots:
+            with self._lock:
+                if self._closed:
+                    raise PdfExtractError("extraction pool is shut down")
+                worker = self._idle.pop() if self._idle else None
+            if worker is not None and not worker.proc.is_alive():
+                self._kill(worker)
+                worker = None
+            if worker is None:
+                worker = _Worker(self._ctx)
+                with self._lock:
+                    self.counters["started"] += 1
+            try:
+                result = worker.call(fn, args, timeout)
+            except (TimeoutError, EOFError, OSError):
+                self._kill(worker)
+                raise
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(worker)
+                    return result
+            worker.kill()
+            return result
+
+    async def acall(self, fn, *args, timeout: float):
+        """call() from the event loop; waiting for a free worker happens on a dispatch thread."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._dispatch, functools.partial(self.call, fn, *args, timeout=timeout))
+
+    def _kill(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._lock:
+            self.counters["killed"] += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+        self._dispatch.shutdown(wait=False, cancel_futures=True)
+
+_POOL: Optional[_WorkerPool] = None
+_POOL_LOCK = threading.Lock()
+_CACHE: "OrderedDict[str, Optional[str]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+STATS = {"cache_hits": 0, "cache_misses": 0, "timeouts": 0, "crashes": 0, "too_large": 0}
+
+def _pool() -> _WorkerPool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = _WorkerPool(PDF_WORKERS)
+        return _POOL
+
+def shutdown() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def _cache_get(key: str):
+    with _CACHE_LOCK:
+        if key in _CACHE:
+            _CACHE.move_to_end(key)
+            STATS["cache_hits"] += 1
+            return True, _CACHE[key]
+        STATS["cache_misses"] += 1
+        return False, None
+
+def _cache_put(key: str, text: Optional[str]) -> None:
+    with _CACHE_LOCK:
+        _CACHE[key] = text
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > PDF_CACHE_ITEMS:
+            _CACHE.popitem(last=False)
+
+def _precheck(size: int, key: Optional[str]):
+    """(done, text): oversized input is 'done' with no text, like a cache hit on None."""
+    if size > PDF_MAX_BYTES:
+        STATS["too_large"] += 1
+        return True, None
+    return _cache_get(key)
+
+def _failed(e: BaseException) -> PdfExtractError:
+    if isinstance(e, TimeoutError):
+        STATS["timeouts"] += 1
+        return PdfExtractError(f"PDF extraction timed out after {PDF_TIMEOUT_S:g}s")
+    STATS["crashes"] += 1  # the worker died (OOM, crash in a C extension)
+    return PdfExtractError("PDF extraction worker crashed")
+
+def _run(src: Union[bytes, str], key: str) -> Optional[str]:
+    if PDF_WORKERS <= 0:
+        text = _extract_worker(src, PDF_MAX_PAGES)
+    else:
+        try:
+            text = _pool().call(_extract_worker, src, PDF_MAX_PAGES, timeout=PDF_TIMEOUT_S)
+        except (TimeoutError, EOFError, OSError) as e:
+            raise _failed(e) from e
+    _cache_put(key, text)
+    return text
+
+async def _arun(src: Union[bytes, str], key: str) -> Optional[str]:
+    if PDF_WORKERS <= 0:
+        text = await asyncio.get_running_loop().run_in_executor(None, _extract_worker, src, PDF_MAX_PAGES)
+    else:
+        try:
+            text = await _pool().acall(_extract_worker, src, PDF_MAX_PAGES, timeout=PDF_TIMEOUT_S)
+        except (TimeoutError, EOFError, OSError) as e:
+            raise _failed(e) from e
+    _cache_put(key, text)
+    return text
+
+def extract_pdf_text(data: bytes, digest: Optional[str] = None) -> Optional[str]:
+    """
+    Text of the first PDF_MAX_PAGES pages, or None if unreadable/too large.
+    Raises PdfExtractError if the parse timed out or its worker crashed.
+    """
+    if len(data) > PDF_MAX_BYTES:
+        return _precheck(len(data), None)[1]
+    key = digest or content_hash(data)
+    found, text = _precheck(len(data), key)
+    return text if found else _run(data, key)
+
+async def aextract_pdf_text(data: bytes, digest: Optional[str] = None) -> Optional[str]:
+    """Async variant for request handlers: never parses on the event loop."""
+    if len(data) > PDF_MAX_BYTES:
+        return _precheck(len(data), None)[1]
+    if digest is None:
+        digest = await asyncio.get_running_loop().run_in_executor(None, content_hash, data)
+    found, text = _precheck(len(data), digest)
+    return text if found else await _arun(data, digest)
+
+async def aextract_pdf_file(path: str, size: int, digest: str) -> Optional[str]:
+    """Like aextract_pdf_text for a file already on disk (the worker maps it; no bytes are pickled)."""
+    found, text = _precheck(size, digest)
+    return text if found else await _arun(path, digest)
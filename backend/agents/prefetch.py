@@ -0,0 +1,123 @@
+from __future__ import annotations
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# ----------------------------
+# Config
+# ----------------------------
+DRAFT_MIN_CHARS = int(os.getenv("HIRESENSE_DRAFT_MIN_CHARS", "40"))    # shorter drafts aren't worth a call
+DRAFT_SLACK_CHARS = int(os.getenv("HIRESENSE_DRAFT_SLACK", "40"))      # final may add this much to the draft
+DRAFT_TTL_S = float(os.getenv("HIRESENSE_DRAFT_TTL", "300"))
+DRAFT_MAX_SESSIONS = int(os.getenv("HIRESENSE_DRAFT_MAX", "2000"))
+
+def _norm(text: str) -> str:
+    return " ".join((text or "").split())
+
+def close_enough(draft: str, final: str) -> bool:
+    """True if `final` is the draft, or the draft plus a short tail (a last clause, punctuation)."""
+    d, f = _norm(draft), _norm(final)
+    if not d:
+        return False
+    if f == d:
+        return True
+    return f.startswith(d) and len(f) - len(d) <= max(DRAFT_SLACK_CHARS, len(d) // 10)
+
+
+class _Draft:
+    __slots__ = ("text", "task", "created")
+
+    def __init__(self, text: str, task: "asyncio.Task"):
+        self.text = text
+        self.task = task
+        self.created = time.monotonic()
+
+
+class Prefetcher:
+    """
+    Speculative work per candidate, started from debounced partial answers.
+
+    `submit(candidate, draft, compute)` runs `compute()` in the background, replacing
+    (and cancelling) the previous draft's task unless the new draft still closely extends
+    it. `take(candidate, final)` hands back that result when the final answer matches the
+    draft, awaiting it if it is still running; otherwise the caller computes as usual.
+    Tasks belong to the running event loop, so this is per-process state.
+    """
+    def __init__(self, max_sessions: int = DRAFT_MAX_SESSIONS, ttl_s: float = DRAFT_TTL_S):
+        self.max_sessions = max_sessions
+        self.ttl_s = ttl_s
+        self._drafts: Dict[str, _Draft] = {}
+        self.counters = {"submitted": 0, "started": 0, "kept": 0, "ignored": 0, "cancelled": 0,
+                         "hits": 0, "stale": 0, "misses": 0, "failed": 0}
+
+    def _cancel(self, d: Optional[_Draft]) -> None:
+        if d is not None and not d.task.done():
+            d.task.cancel()
+            self.counters["cancelled"] += 1
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        for cand in [c for c, d in self._drafts.items() if now - d.created > self.ttl_s]:
+            self._cancel(self._drafts.pop(cand))
+        while len(self._drafts) >= self.max_sessions:  # dicts keep insertion order: oldest first
+            self._cancel(self._drafts.pop(next(iter(self._drafts))))
+
+    def submit(self, candidate: str, draft: str, compute: Callable[[], Awaitable[Any]]) -> str:
+        """'started' | 'kept' (the running draft still covers this one) | 'ignored' (too short)."""
+        self.counters["submitted"] += 1
+        if len(_norm(draft)) < DRAFT_MIN_CHARS:
+            self.counters["ignored"] += 1
+            return "ignored"
+        current = self._drafts.get(candidate)
+        if current is not None and close_enough(current.text, draft) and _usable(current.task):
+            self.counters["kept"] += 1
+            return "kept"
+        self._cancel(self._drafts.pop(candidate, None))
+        self._sweep()
+        task = asyncio.get_running_loop().create_task(compute())
+        task.add_done_callback(_consume_exception)
+        self._drafts[candidate] = _Draft(draft, task)
+        self.counters["started"] += 1
+        return "started"
+
+    async def take(self, candidate: str, final: str) -> Optional[Any]:
+        """The prefetched result if it applies to `final`; None means compute it yourself."""
+        d = self._drafts.pop(candidate, None)
+        if d is None:
+            self.counters["misses"] += 1
+            return None
+        if not close_enough(d.text, final):
+            self._cancel(d)
+            self.counters["stale"] += 1
+            return None
+        try:
+            result = await asyncio.shield(d.task)
+        except (Exception, asyncio.CancelledError):
+            if not d.task.done():  # we were cancelled ourselves, not the prefetch
+                raise
+            self.counters["failed"] += 1
+            return None
+        self.counters["hits"] += 1
+        return result
+
+    def discard(self, candidate: str) -> None:
+        self._cancel(self._drafts.pop(candidate, None))
+
+    def stats(self) -> Dict:
+        c = dict(self.counters)
+        answered = c["hits"] + c["stale"] + c["misses"] + c["failed"]
+        return {
+            "pending": len(self._drafts),
+            **c,
+            "hit_rate": round(c["hits"] / answered, 4) if answered else 0.0,
+        }
+
+
+def _usable(task: "asyncio.Task") -> bool:
+    return not task.done() or (not task.cancelled() and task.exception() is None)
+
+def _consume_exception(task: "asyncio.Task") -> None:
+    # a failed or superseded draft is expected; don't log "exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
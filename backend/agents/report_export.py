@@ -0,0 +1,315 @@
+"""
+Interview reports straight from the database: `transcripts` + `candidates` + `interview_scores`.
+
+    curl 'localhost:8000/reports/export.csv'                      # one row per answered turn
+    curl 'localhost:8000/reports/export.ndjson?candidate=Ann'     # one object per interview
+    curl -o reports.zip 'localhost:8000/reports/bundle.zip'       # one PDF per interview
+    cd backend && python -m agents.report_export bundle -o reports.zip
+
+Transcripts are streamed in (interview_id, turn) order (the ix_transcripts_interview_turn
+index), oldest interview first, and grouped into interviews (db/transcripts.interview_key:
+a restarted interview is its own report) a chunk at a time; scores are looked up per chunk. CSV
+and NDJSON are written as the rows arrive. PDFs are rendered in a process pool with a
+bounded number of chunks in flight and appended to a zip that is streamed as it grows,
+so memory stays flat however many interviews are exported (apart from the zip's central
+directory, a few hundred bytes per file).
+"""
+from __future__ import annotations
+import csv
+import io
+import json
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# ----------------------------
+# Config
+# ----------------------------
+EXPORT_WORKERS = int(os.getenv("HIRESENSE_EXPORT_WORKERS", str(os.cpu_count() or 2)))
+EXPORT_CHUNK = int(os.getenv("HIRESENSE_EXPORT_CHUNK", "100"))     # interviews per query batch / pool task
+EXPORT_POOL_MIN = 2 * EXPORT_CHUNK                                  # smaller bundles render in-process
+
+CSV_COLUMNS = ["interview_id", "candidate_id", "candidate", "turn", "question", "answer", "feedback", "created_at",
+               "overall", "rubric_version"]
+
+# {"interview_id", "candidate_id", "candidate", "turns": [{"turn", "question", "answer", "feedback", "created_at"}],
+#  "score": {"overall", "rubric", "dashboard", "coaching", "rubric_version", "scored_at"} | None}
+Interview = Dict
+
+# ----------------------------
+# Reading
+# ----------------------------
+def iter_interviews(candidates: Optional[Sequence[str]] = None, chunk: int = EXPORT_CHUNK) -> Iterator[List[Interview]]:
+    """Chunks of whole interviews with their stored score; `candidates` filters by name."""
+    from sqlalchemy import select
+    from db.database import engine, ensure_table
+    from agents.batch_scoring import ensure_score_table
+    from db.models import Candidate as C, InterviewTranscript as T
+    from db.transcripts import interview_key
+    for model in (C, T):
+        ensure_table(model)
+    ensure_score_table()
+    q = (select(interview_key(T), T.candidate_id, C.name, T.turn, T.question, T.answer, T.feedback, T.created_at)
+         .outerjoin(C, C.id == T.candidate_id)
+         .order_by(T.interview_id, T.candidate_id, T.turn, T.id))
+    if candidates:
+        q = q.where(C.name.in_(list(candidates)))
+
+    out: List[Interview] = []
+    cur: Optional[Interview] = None
+    with engine.connect() as conn, engine.connect() as lookup:
+        for key, cid, name, turn, question, answer, feedback, created_at in (
+                conn.execution_options(stream_results=True, yield_per=2000).execute(q)):
+            if cur is None or cur["interview_id"] != key:
+                if cur is not None:
+                    out.append(cur)
+                    if len(out) >= chunk:
+                        yield _with_scores(lookup, out)
+                        out = []
+                cur = {"interview_id": key, "candidate_id": cid, "candidate": name or "", "turns": [], "score": None}
+            cur["turns"].append({"turn": turn, "question": question or "", "answer": answer or "",
+                                 "feedback": feedback or "", "created_at": created_at})
+        if cur is not None:
+            out.append(cur)
+        if out:
+            yield _with_scores(lookup, out)
+
+
+def _with_scores(conn, interviews: List[Interview]) -> List[Interview]:
+    from sqlalchemy import select
+    from db.models import InterviewScore as S
+    rows = conn.execute(select(S.interview_id, S.overall, S.rubric, S.dashboard, S.coaching, S.rubric_version,
+                               S.scored_at).where(S.interview_id.in_([iv["interview_id"] for iv in interviews])))
+    scores = {r.interview_id: {"overall": r.overall, "rubric": json.loads(r.rubric or "null"),
+                               "dashboard": json.loads(r.dashboard or "null"),
+                               "coaching": json.loads(r.coaching or "[]"),
+                               "rubric_version": r.rubric_version, "scored_at": r.scored_at} for r in rows}
+    for iv in interviews:
+        iv["score"] = scores.get(iv["interview_id"])
+    return interviews
+
+# ----------------------------
+# CSV / NDJSON
+# ----------------------------
+def export_csv(candidates: Optional[Sequence[str]] = None) -> Iterator[str]:
+    """Header, then one row per answered turn; yields one text block per chunk of interviews."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(CSV_COLUMNS)
+    for chunk in iter_interviews(candidates):
+        for iv in chunk:
+            score = iv["score"] or {}
+            for t in iv["turns"]:
+                writer.writerow([iv["interview_id"], iv["candidate_id"], iv["candidate"], t["turn"], t["question"],
+                                 t["answer"], t["feedback"], t["created_at"], score.get("overall", ""),
+                                 score.get("rubric_version", "")])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def export_ndjson(candidates: Optional[Sequence[str]] = None) -> Iterator[str]:
+    for chunk in iter_interviews(candidates):
+        yield "".join(json.dumps(iv) + "\n" for iv in chunk)
+
+# ----------------------------
+# PDF (worker side: runs in the pool; must stay importable and picklable)
+# ----------------------------
+_PAGE_W, _PAGE_H, _MARGIN = 595, 842, 50           # A4, points
+_LINE, _LINES_PER_PAGE, _WRAP = 13, 56, 92          # Helvetica 10pt
+_ASCII = str.maketrans({"\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"', "\u2013": "-",
+                        "\u2014": "-", "\u2026": "...", "\u2192": "->", "\u2022": "*"})
+
+def _pdf_text(text: str) -> str:
+    text = str(text).translate(_ASCII).encode("latin-1", errors="replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _wrap(text: str, width: int = _WRAP, indent: str = "") -> List[str]:
+    lines: List[str] = []
+    for para in (text or "").splitlines() or [""]:
+        line = ""
+        for word in para.split():
+            while len(word) > width:  # unbreakable run (URL, hash)
+                if line:
+                    lines.append(line)
+                    line = ""
+                lines.append(indent + word[:width])
+                word = word[width:]
+            if not word:
+                continue
+            if line and len(line) + 1 + len(word) > width:
+                lines.append(line)
+                line = ""
+            line = (line + " " + word) if line else indent + word
+        lines.append(line)
+    return lines
+
+def _report_lines(iv: Interview) -> List[Tuple[str, str]]:
+    """(font, text) lines of one report; font "B" = bold heading, "R" = regular."""
+    score = iv["score"] or {}
+    out = [("B", "HireSense - Interview Report"),
+           ("R", f"Candidate: {iv['candidate'] or '#' + str(iv['candidate_id'])}   Answers: {len(iv['turns'])}"),
+           ("R", f"Interview: {iv['interview_id']}"),
+           ("R", "Generated: " + time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime())), ("R", "")]
+    if score:
+        out.append(("B", f"Overall score: {score.get('overall')}   (rubric {score.get('rubric_version')})"))
+        for c in (score.get("rubric") or {}).get("categories", []):
+            out.append(("R", f"  {c.get('name')}: {c.get('score')}"))
+        dash = score.get("dashboard") or {}
+        if dash:
+            out.append(("R", "  Dashboard: " + ", ".join(f"{k} {v}" for k, v in dash.items())))
+    else:
+        out.append(("R", "Not scored yet (POST /transcripts/rescore)."))
+    coaching = score.get("coaching") or []
+    for i, t in enumerate(iv["turns"]):
+        out += [("R", ""), ("B", f"Turn {t['turn']}")]
+        out += [("R", ln) for ln in _wrap("Q: " + t["question"])]
+        out += [("R", ln) for ln in _wrap("A: " + t["answer"])]
+        if t["feedback"]:
+            out += [("R", ln) for ln in _wrap("Feedback: " + t["feedback"])]
+        if i < len(coaching) and coaching[i]:
+            out += [("R", ln) for ln in _wrap("Coaching: " + str(coaching[i]))]
+    return out
+
+def render_pdf(iv: Interview) -> bytes:
+    """A paginated text PDF (built-in Helvetica, Flate-compressed pages); no dependencies."""
+    lines = _report_lines(iv)
+    pages = [lines[i:i + _LINES_PER_PAGE] for i in range(0, len(lines), _LINES_PER_PAGE)] or [[]]
+    n = len(pages)
+    fonts = 3 + 2 * n  # object ids: 1 catalog, 2 pages, then (page, content) pairs, then 2 fonts
+    objs = [b"<< /Type /Catalog /Pages 2 0 R >>",
+            ("<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{3 + 2 * i} 0 R" for i in range(n)), n)).encode()]
+    for i, page in enumerate(pages):
+        objs.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_PAGE_W} {_PAGE_H}] "
+                     f"/Resources << /Font << /R {fonts} 0 R /B {fonts + 1} 0 R >> >> "
+                     f"/Contents {4 + 2 * i} 0 R >>").encode())
+        ops = [f"BT {_LINE} TL {_MARGIN} {_PAGE_H - _MARGIN} Td"]
+        font = None
+        for f, text in page:
+            if f != font:
+                ops.append(f"/{f} {12 if f == 'B' else 10} Tf")
+                font = f
+            ops.append(f"({_pdf_text(text)}) '")
+        ops.append(f"/R 8 Tf 1 0 0 1 {_PAGE_W - _MARGIN - 40} 30 Tm (Page {i + 1} of {n}) Tj ET")
+        stream = zlib.compress("\n".join(ops).encode("latin-1"), 6)
+        objs.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{off:010d} 00000 n \n".encode() for off in offsets)
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+def report_filename(iv: Interview) -> str:
+    """<interview id>_<candidate>.pdf: unique per interview, and sorted oldest first."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", iv["candidate"] or "").strip("_") or "candidate"
+    return f"{re.sub(r'[^A-Za-z0-9-]+', '-', iv['interview_id'])}_{slug}.pdf"
+
+def _render_chunk(chunk: List[Interview]) -> List[Tuple[str, bytes]]:
+    return [(report_filename(iv), render_pdf(iv)) for iv in chunk]
+
+# ----------------------------
+# Zip bundle (parent side)
+# ----------------------------
+class _Drain(io.RawIOBase):
+    """Write-only, unseekable sink for ZipFile; the bytes written so far are taken with take()."""
+    def __init__(self):
+        self._buf = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._buf += b
+        return len(b)
+
+    def take(self) -> bytes:
+        data, self._buf = bytes(self._buf), bytearray()
+        return data
+
+
+def export_bundle(candidates: Optional[Sequence[str]] = None, workers: int = EXPORT_WORKERS,
+                  chunk: int = EXPORT_CHUNK) -> Iterator[bytes]:
+    """
+    Zip of one PDF per interview, yielded as it is written. Chunks are rendered in a
+    process pool, at most ~2 per worker in flight, and written in order; a bundle with
+    fewer than EXPORT_POOL_MIN interviews (known after the first chunks) stays in-process.
+    """
+    sink = _Drain()
+    zf = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED)  # pages are already deflated
+    it = iter_interviews(candidates, chunk)
+    head: List[List[Interview]] = []
+    for c in it:  # look ahead just far enough to know whether a pool pays off
+        head.append(c)
+        if sum(map(len, head)) >= EXPORT_POOL_MIN:
+            break
+
+    def rendered() -> Iterator[List[Tuple[str, bytes]]]:
+        if sum(map(len, head)) < EXPORT_POOL_MIN or workers <= 1:
+            for c in head:
+                yield _render_chunk(c)
+            for c in it:
+                yield _render_chunk(c)
+            return
+        # spawn: safe from a threaded server
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            pending = [pool.submit(_render_chunk, c) for c in head]
+            try:
+                while pending:
+                    while len(pending) < 2 * workers:
+                        nxt = next(it, None)
+                        if nxt is None:
+                            break
+                        pending.append(pool.submit(_render_chunk, nxt))
+                    yield pending.pop(0).result()  # in order: the zip follows interview order
+            finally:  # client went away: don't render the rest
+                for fut in pending:
+                    fut.cancel()
+
+    for files in rendered():
+        for name, pdf in files:
+            zf.writestr(zipfile.ZipInfo(name, time.gmtime()[:6]), pdf)
+        yield sink.take()
+    zf.close()
+    yield sink.take()
+
+
+def main():
+    import argparse
+    import sys
+    ap = argparse.ArgumentParser(description="Export stored interviews as CSV, NDJSON or a zip of PDF reports.")
+    ap.add_argument("format", choices=["csv", "ndjson", "bundle"])
+    ap.add_argument("-o", "--output", help="file to write (default: stdout)")
+    ap.add_argument("--candidate", action="append", help="candidate name (repeatable; default: all)")
+    ap.add_argument("--workers", type=int, default=EXPORT_WORKERS, help="PDF render processes (bundle)")
+    args = ap.parse_args()
+    if args.format == "bundle":
+        parts = export_bundle(args.candidate, workers=args.workers)
+    else:
+        gen = export_csv if args.format == "csv" else export_ndjson
+        parts = (s.encode("utf-8") for s in gen(args.candidate))
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for part in parts:
+            out.write(part)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,12 @@
 from __future__ import annotations
-import io
 import re
 from typing import Dict, List, Union, Optional
 
+from agents.pdf_extract import extract_pdf_text
+
 def _try_pdf_text(data: bytes) -> Optional[str]:
-    try:
-        from pypdf import PdfReader
-    except Exception:
-        return None
-    try:
-        with io.BytesIO(data) as fh:
-            reader = PdfReader(fh)
-            pages = []
-            for p in reader.pages:
-                try:
-                    pages.append(p.extract_text() or "")
-                except Exception:
-                    pages.append("")
-            return "\n".join(pages)
-    except Exception:
-        return None
+    # Parsed in a worker process (bounded pages/bytes/time), cached by content hash
+    return extract_pdf_text(data)
 
 def _extract_text(data: Union[str, bytes]) -> str:
     if isinstance(data, str):
@@ -42,7 +29,9 @@ def _normalize_lines(block: str) -> List[str]:
     return [ln for ln in lines if 2 <= len(ln.split()) <= 20][:10]
 
 def parse_resume(data: Union[str, bytes]) -> Dict:
-    text = _extract_text(data)
+    return _parse_text(_extract_text(data))
+
+def _parse_text(text: str) -> Dict:
     skills: List[str] = []
     exps: List[str] = []
 
@@ -0,0 +1,139 @@
+from __future__ import annotations
+import json
+from typing import Dict, List, Optional
+
+from agents.answer_features import STAR_WORDS, AnswerFeatures
+
+# ----------------------------
+# Scoring (pure functions of accumulated counters)
+# ----------------------------
+def rubric_from_features(f: AnswerFeatures) -> Dict:
+    """The local demo rubric (InterviewAgent.rubric_scores) from already-computed features."""
+    depth = min(100, 40 + 10 * f.why_count)
+    metrics = 90 if f.has_metric else 50
+    structure = 90 if f.star_coverage == len(STAR_WORDS) else 60
+    clarity = 80
+    overall = round((depth + metrics + structure + clarity) / 4)
+    return {
+        "overall": overall,
+        "categories": [
+            {"name": "Depth", "score": depth, "rationale": "Probes root cause, trade-offs, constraints."},
+            {"name": "Metrics", "score": metrics, "rationale": "Uses %/$/latency/scale."},
+            {"name": "Structure", "score": structure, "rationale": "STAR / structured narrative."},
+            {"name": "Clarity", "score": clarity, "rationale": "Clear, concise communication."},
+        ],
+        "notes": "Auto-scored locally for demo purposes.",
+    }
+
+def coaching_from_features(f: AnswerFeatures) -> str:
+    """One answer's coaching tips (InterviewAgent._coaching) from already-computed features."""
+    tips: List[str] = []
+    if not f.has_metric:
+        tips.append("Add a metric: %, $, time saved, scale, latency, or error rate.")
+    if f.star_coverage < 3:
+        tips.append("Use STAR: Situation → Task → Action → Result.")
+    if not f.mentions_tech:
+        tips.append("Mention specific technologies and design choices.")
+    if not f.shows_ownership:
+        tips.append("Clarify your personal role and decisions.")
+    if not tips:
+        tips.append("Great structure—consider adding a brief trade-off you evaluated.")
+    return " ".join(tips)
+
+def _five(share: float) -> int:
+    return max(1, min(5, round(1 + 4 * share)))
+
+class RubricAccumulator:
+    """Running rubric counters for one interview; each turn costs one scan of that turn only.
+
+    `scores()` / `dashboard()` read the counters, so polling them during a live
+    interview is O(1) no matter how long the transcript has grown."""
+    __slots__ = ("flags", "why_count", "answers", "words", "star_total", "metric_answers",
+                 "tech_answers", "ownership_answers", "failure_answers")
+
+    def __init__(self):
+        self.flags = 0  # OR of every turn's AnswerFeatures flags (questions included, like the transcript)
+        self.why_count = 0
+        self.answers = 0
+        self.words = 0
+        self.star_total = 0
+        self.metric_answers = 0
+        self.tech_answers = 0
+        self.ownership_answers = 0
+        self.failure_answers = 0
+
+    def _merge(self, f: AnswerFeatures) -> None:
+        self.flags |= f.flags
+        self.why_count += f.why_count
+
+    def add_question(self, text: str) -> None:
+        self._merge(AnswerFeatures.of(text))
+
+    def add_answer(self, text: str, feats: Optional[AnswerFeatures] = None) -> None:
+        f = feats if feats is not None else AnswerFeatures.of(text)
+        self._merge(f)
+        self.answers += 1
+        self.words += len((text or "").split())
+        self.star_total += f.star_coverage
+        self.metric_answers += f.has_metric
+        self.tech_answers += f.mentions_tech
+        self.ownership_answers += f.shows_ownership
+        self.failure_answers += f.mentions_failure
+
+    @classmethod
+    def from_transcript(cls, transcript: str) -> "RubricAccumulator":
+        """For callers that only have the rendered transcript ("Candidate: ..." / "Agent: ..." lines)."""
+        acc = cls()
+        for line in (transcript or "").splitlines():
+            speaker, sep, text = line.partition(":")
+            if sep and speaker.strip().lower() in ("candidate", "you", "user"):
+                acc.add_answer(text)
+            else:
+                acc.add_question(line)
+        return acc
+
+    # ---------- Reads ----------
+    def scores(self) -> Dict:
+        return rubric_from_features(AnswerFeatures(self.flags, self.why_count))
+
+    def dashboard(self) -> Dict:
+        """Shape used by RecruiterDashboard.jsx: 1-5 scores + rationale + summary."""
+        n = self.answers or 1
+        star_share = self.star_total / (n * len(STAR_WORDS))
+        metric_share = self.metric_answers / n
+        tech_share = self.tech_answers / n
+        owner_share = self.ownership_answers / n
+        scores = {
+            "Communication": _five(star_share),
+            "TechnicalDepth": _five(0.7 * tech_share + 0.3 * min(1.0, self.why_count / 5)),
+            "ProblemSolving": _five(0.5 * min(1.0, self.failure_answers / 2) + 0.5 * metric_share),
+            "ProductThinking": _five(metric_share),
+            "CultureAdd": _five(owner_share),
+        }
+        rationale = {
+            "Communication": f"STAR coverage {star_share:.0%} across {self.answers} answer(s).",
+            "TechnicalDepth": f"Named technologies in {tech_share:.0%} of answers; {self.why_count} 'why' probe(s).",
+            "ProblemSolving": f"{self.failure_answers} answer(s) discuss failures/incidents; metrics in {metric_share:.0%}.",
+            "ProductThinking": f"Quantified impact in {metric_share:.0%} of answers.",
+            "CultureAdd": f"Clear personal ownership in {owner_share:.0%} of answers.",
+        }
+        avg_words = self.words / n
+        return {
+            "scores": scores,
+            "rationale": rationale,
+            "overallSummary": (
+                f"{self.answers} answer(s), ~{avg_words:.0f} words each; "
+                f"overall {self.scores()['overall']}/100 on the local rubric."
+            ),
+        }
+
+    # ---------- Persistence (SessionStore dumps/loads) ----------
+    def to_json(self) -> str:
+        return json.dumps({k: getattr(self, k) for k in self.__slots__})
+
+    @classmethod
+    def from_json(cls, raw: str) -> "RubricAccumulator":
+        acc = cls()
+        for k, v in json.loads(raw).items():
+            setattr(acc, k, v)
+        return acc
@@ -0,0 +1,150 @@
+"""
+Compact building blocks for per-candidate session state.
+
+- `label()`: role / seniority / tone strings are interned, so 50k sessions for the same
+  requisition hold one "Software Engineer" between them.
+- `share()`: big immutable values (resume text, parsed resumes, JD descriptions) are kept
+  once per content hash and referenced by every session that has them. An entry lives as
+  long as some session references it (weak registry); serialization writes the value, so
+  the durable tier is unchanged and reloading re-shares it.
+- `JobConfig`: the per-candidate role pack, in slots.
+- `TextLog`: append-only UTF-8 buffer for transcript text (agents/history.py).
+"""
+from __future__ import annotations
+import hashlib
+import json
+import sys
+import threading
+import weakref
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# ----------------------------
+# Interned labels
+# ----------------------------
+def label(value: Optional[str]) -> str:
+    return sys.intern(value) if value else ""
+
+# ----------------------------
+# Content-addressed shared values
+# ----------------------------
+class Shared:
+    """One immutable value (str, or a dict treated as read-only) and its content hash."""
+    __slots__ = ("key", "value", "__weakref__")
+
+    def __init__(self, key: str, value: Any):
+        self.key = key
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Shared({self.key[:12]})"
+
+
+_SHARED: "weakref.WeakValueDictionary[str, Shared]" = weakref.WeakValueDictionary()
+_SHARED_LOCK = threading.Lock()
+
+def content_key(value: Any) -> str:
+    raw = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+def share(value: Any) -> Shared:
+    key = content_key(value)
+    with _SHARED_LOCK:
+        entry = _SHARED.get(key)
+        if entry is None:
+            entry = _SHARED[key] = Shared(key, value)
+        return entry
+
+def shared_stats() -> Dict:
+    with _SHARED_LOCK:
+        values = [e.value for e in list(_SHARED.values())]
+    return {
+        "values": len(values),
+        "text_bytes": sum(len(v) for v in values if isinstance(v, str)),
+    }
+
+# ----------------------------
+# Per-candidate role pack
+# ----------------------------
+class JobConfig:
+    __slots__ = ("role", "seniority", "tone", "focus", "_description")
+
+    def __init__(self, role: str = "Software Engineer", seniority: str = "Mid", tone: str = "Professional",
+                 focus: Optional[List[str]] = None, description: str = ""):
+        self.role = label(role)
+        self.seniority = label(seniority)
+        self.tone = label(tone)
+        self.focus: Tuple[str, ...] = tuple(label(f) for f in focus or ())
+        # a requisition's JD is the same text for every candidate on it
+        self._description: Optional[Shared] = share(description) if description else None
+
+    @property
+    def description(self) -> str:
+        return self._description.value if self._description is not None else ""
+
+    def to_json(self) -> str:
+        return json.dumps({"role": self.role, "seniority": self.seniority, "tone": self.tone,
+                           "focus": list(self.focus), "description": self.description})
+
+    @classmethod
+    def from_json(cls, raw: str) -> "JobConfig":
+        return cls(**json.loads(raw))
+
+# ----------------------------
+# Append-only transcript text
+# ----------------------------
+class TextLog:
+    """
+    (kind, text) entries in one UTF-8 bytearray plus an offsets array: ~1 byte per ASCII
+    character and 5 bytes of bookkeeping per entry, instead of a message object each.
+    Entries are only appended, or dropped from the front (`drop()`); the dead prefix is
+    reclaimed once it outweighs the live part.
+    """
+    __slots__ = ("_buf", "_ends", "_kinds", "_first", "_base")
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._ends = array("I")      # end offset of each entry in _buf (+ _base)
+        self._kinds = bytearray()    # one byte per entry, caller-defined
+        self._first = 0              # index of the first live entry
+        self._base = 0               # bytes already cut from the front of _buf
+
+    def __len__(self) -> int:
+        return len(self._ends) - self._first
+
+    def append(self, kind: int, text: str) -> None:
+        self._buf += text.encode("utf-8", "surrogatepass")
+        self._ends.append(self._base + len(self._buf))
+        self._kinds.append(kind)
+
+    def _span(self, i: int) -> Tuple[int, int]:
+        start = self._ends[i - 1] if i > 0 else 0
+        return max(start, self._base) - self._base, self._ends[i] - self._base
+
+    def __getitem__(self, i: int) -> Tuple[int, str]:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        j = self._first + i
+        a, b = self._span(j)
+        return self._kinds[j], self._buf[a:b].decode("utf-8", "surrogatepass")
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def drop(self, n: int) -> None:
+        """Forget the oldest `n` entries."""
+        self._first = min(len(self._ends), self._first + n)
+        dead = (self._ends[self._first - 1] - self._base) if self._first else 0
+        if dead and dead * 2 >= len(self._buf):
+            self._buf = self._buf[dead:]  # a copy: del would keep the old allocation
+            self._base += dead
+            del self._ends[:self._first]
+            del self._kinds[:self._first]
+            self._first = 0
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._buf) + sys.getsizeof(self._ends) + sys.getsizeof(self._kinds)
@@ -0,0 +1,295 @@
+"""
+Candidate search over parsed resumes, persisted in SQLite.
+
+Two structures, both keyed by `candidates.id` and updated in the same transaction as the
+candidate row (one upsert per /upload_resume, one batch per bulk-ingest flush):
+
+- Skill postings: for each normalized skill token (the parser's skills list plus every
+  TECH_WORDS technology in the text) a BM25 term weight, precomputed at index time from
+  the token's frequency in the resume (a declared skill counts SKILLS_WEIGHT mentions)
+  and the resume length. Stored impact-ordered (a single-skill query is an index range
+  scan) and indexed by candidate (AND queries probe the other skills per candidate).
+- An FTS5 table (skills, body) ranked with FTS5's bm25(): free-text words and prefix
+  queries ("kube*"). It scores every matching row, so it is the slower path.
+
+SQLite only; on other databases the index reports itself disabled.
+"""
+from __future__ import annotations
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from agents.answer_features import TECH_WORDS, word_regex
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Config
+# ----------------------------
+SEARCH_ENABLED = os.getenv("HIRESENSE_SEARCH", "1") in ("1", "true", "True")
+SKILLS_WEIGHT = float(os.getenv("HIRESENSE_SEARCH_SKILLS_WEIGHT", "4.0"))  # a declared skill = this many mentions
+SEARCH_MAX_LIMIT = 200
+_BACKFILL_BATCH = 2000
+_STATS_TTL_S = 60.0       # document frequencies drift slowly; cache them this long
+_BM25_K1, _BM25_B = 1.2, 0.75
+_AVG_DOC_TERMS = 400.0    # fixed average length: impacts can't depend on the rest of the corpus
+
+_FTS = "candidate_search"
+_POSTINGS = "candidate_skill_postings"
+TECH_REGEX = word_regex(TECH_WORDS)
+# symbols the tokenizer would split off: keep "c++" / "c#" / "node.js" distinct from "c" / "node"
+_SYMBOLS = (("c++", "cplusplus"), ("c#", "csharp"), ("f#", "fsharp"), (".net", "dotnet"), (".js", "js"))
+_NON_WORD = re.compile(r"[^\w]+")
+
+def normalize_skill(skill: str) -> str:
+    """'Node.js' → 'nodejs', 'C++' → 'cplusplus', 'Apache Kafka' → 'apache kafka'."""
+    s = (skill or "").lower().strip()
+    for sym, word in _SYMBOLS:
+        s = s.replace(sym, word)
+    return _NON_WORD.sub(" ", s).strip()
+
+def skill_tokens(skills: Iterable[str], text: str) -> List[str]:
+    """De-duplicated skill tokens: declared skills first, then technologies found in the text."""
+    out: Dict[str, None] = {}
+    for s in skills:
+        for tok in normalize_skill(s).split():
+            out[tok] = None
+    for m in TECH_REGEX.findall(text or ""):
+        out[m.lower()] = None
+    return list(out)
+
+def _impacts(skills: List[str], text: str) -> Dict[str, float]:
+    """token → BM25 term weight (without IDF) for this resume."""
+    terms = normalize_skill(text).split()
+    tf = Counter(terms)
+    declared = {t for s in skills for t in normalize_skill(s).split()}
+    norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * len(terms) / _AVG_DOC_TERMS)
+    out = {}
+    for tok in skill_tokens(skills, text):
+        f = tf[tok] + (SKILLS_WEIGHT if tok in declared else 0.0)
+        out[tok] = round(f * (_BM25_K1 + 1) / (f + norm), 4)
+    return out
+
+def _query_terms(q: str) -> Tuple[List[str], bool]:
+    terms: Dict[str, None] = {}
+    prefix = False
+    for raw in (q or "").split():
+        prefix = prefix or raw.endswith("*")
+        for tok in normalize_skill(raw.rstrip("*")).split():
+            terms[tok] = None
+    return list(terms), prefix
+
+def _fts_query(q: str, match_all: bool) -> str:
+    """User text → an FTS5 expression of quoted terms (no operator injection); 'kube*' keeps its star."""
+    terms = []
+    for raw in (q or "").split():
+        star = "*" if raw.endswith("*") else ""
+        for part in normalize_skill(raw.rstrip("*")).split():
+            terms.append('"' + part.replace('"', '""') + '"' + star)
+    return (" AND " if match_all else " OR ").join(terms)
+
+def _snippet(text: str, terms: List[str], width: int = 12) -> str:
+    words = (text or "").split()
+    wanted = set(terms)
+    for i, w in enumerate(words):
+        if normalize_skill(w).replace(" ", "") in wanted:
+            lo, hi = max(0, i - width // 2), min(len(words), i + width // 2)
+            out = words[lo:i] + [f"[{w}]"] + words[i + 1:hi]
+            return ("…" if lo else "") + " ".join(out) + ("…" if hi < len(words) else "")
+    return " ".join(words[:width]) + ("…" if len(words) > width else "")
+
+
+class SkillsIndex:
+    def __init__(self):
+        from db.database import engine, ensure_table
+        from db.models import Candidate
+        self.engine = engine
+        self.enabled = False
+        self._lock = threading.Lock()  # uploads upsert by name: read-then-write
+        self._df: Dict[str, Tuple[float, int]] = {}  # token -> (fetched at, df)
+        self._docs: Tuple[float, int] = (0.0, 0)
+        self.counters = {"indexed": 0, "searches": 0, "skills_path": 0, "fulltext_path": 0}
+        if not (SEARCH_ENABLED and engine.dialect.name == "sqlite"):
+            return
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+        ensure_table(Candidate)
+        try:
+            with engine.begin() as conn:
+                created = conn.execute(text(
+                    "SELECT count(*) FROM sqlite_master WHERE name = :n"), {"n": _FTS}).scalar() == 0
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS} USING fts5("
+                    "skills, body, tokenize='unicode61 remove_diacritics 2', prefix='3')"))
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {_POSTINGS} (token TEXT NOT NULL, impact REAL NOT NULL, "
+                    "candidate_id INTEGER NOT NULL, PRIMARY KEY (token, impact, candidate_id)) WITHOUT ROWID"))
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_skill_postings_candidate ON {_POSTINGS} (candidate_id, token)"))
+        except OperationalError as e:  # sqlite built without FTS5
+            logger.warning("Candidate search disabled: %s", e)
+            return
+        self.enabled = True
+        if created:
+            self.backfill()
+
+    # ---------- Writes ----------
+    def index_rows(self, conn, items: Iterable[Tuple[int, List[str], str]]) -> int:
+        """(candidate id, skills, resume text) rows, inside the caller's transaction."""
+        if not self.enabled:
+            return 0
+        from sqlalchemy import text
+        docs, postings = [], []
+        for cid, skills, body in items:
+            impacts = _impacts(skills, body or "")
+            docs.append({"id": cid, "skills": " ".join(impacts), "body": body or ""})
+            postings += [{"t": tok, "i": imp, "c": cid} for tok, imp in impacts.items()]
+        if not docs:
+            return 0
+        ids = [{"id": d["id"]} for d in docs]
+        conn.execute(text(f"DELETE FROM {_FTS} WHERE rowid = :id"), ids)
+        conn.execute(text(f"DELETE FROM {_POSTINGS} WHERE candidate_id = :id"), ids)
+        conn.execute(text(f"INSERT INTO {_FTS} (rowid, skills, body) VALUES (:id, :skills, :body)"), docs)
+        if postings:
+            conn.execute(text(f"INSERT INTO {_POSTINGS} (token, impact, candidate_id) VALUES (:t, :i, :c)"), postings)
+        self.counters["indexed"] += len(docs)
+        return len(docs)
+
+    def upsert_candidate(self, name: str, resume_text: str, skills: List[str]) -> Optional[int]:
+        """Store an uploaded resume on the candidate's row (created if new) and reindex it."""
+        if not self.enabled:
+            return None
+        from sqlalchemy import func, insert, select, update
+        from db.models import Candidate
+        with self._lock, self.engine.begin() as conn:
+            cid = conn.execute(select(func.min(Candidate.id)).where(Candidate.name == name)).scalar()
+            values = {"resume_text": resume_text, "skills": json.dumps(skills)}
+            if cid is None:
+                cid = conn.execute(insert(Candidate.__table__).values(name=name, source="upload", **values)).inserted_primary_key[0]
+            else:
+                conn.execute(update(Candidate.__table__).where(Candidate.id == cid).values(**values))
+            self.index_rows(conn, [(cid, skills, resume_text)])
+        return cid
+
+    def backfill(self) -> int:
+        """Index every stored candidate (first start on a database that already has some)."""
+        from sqlalchemy import select
+        from db.models import Candidate
+        n, last = 0, 0
+        while True:
+            with self.engine.begin() as conn:
+                rows = conn.execute(select(Candidate.id, Candidate.skills, Candidate.resume_text)
+                                    .where(Candidate.id > last).order_by(Candidate.id).limit(_BACKFILL_BATCH)).all()
+                if not rows:
+                    return n
+                n += self.index_rows(conn, [(r.id, json.loads(r.skills or "[]"), r.resume_text or "") for r in rows])
+                last = rows[-1].id
+
+    # ---------- Reads ----------
+    def _doc_freqs(self, conn, tokens: List[str]) -> Tuple[int, Dict[str, int]]:
+        from sqlalchemy import text
+        now = time.monotonic()
+        if now - self._docs[0] > _STATS_TTL_S:
+            self._docs = (now, conn.execute(text(f"SELECT count(*) FROM {_FTS}_docsize")).scalar() or 0)
+        out = {}
+        for t in tokens:
+            hit = self._df.get(t)
+            if hit is None or now - hit[0] > _STATS_TTL_S:
+                hit = self._df[t] = (now, conn.execute(
+                    text(f"SELECT count(*) FROM {_POSTINGS} WHERE token = :t"), {"t": t}).scalar())
+            out[t] = hit[1]
+        return self._docs[1], out
+
+    def _top_by_postings(self, conn, tokens: List[str], n_docs: int, dfs: Dict[str, int],
+                         k: int, match_all: bool) -> List[Tuple[float, int]]:
+        """
+        Top-k by sum(idf * impact), scored inside SQLite:
+        one token → the first k postings of its range (already impact-ordered);
+        AND → walk the rarest token's postings and probe the others by (candidate_id, token);
+        OR → aggregate every posting of the query tokens.
+        """
+        from sqlalchemy import text
+        idf = {t: math.log(1 + (n_docs - dfs[t] + 0.5) / (dfs[t] + 0.5)) for t in tokens}
+        if len(tokens) == 1:
+            sql = (f"SELECT candidate_id, impact * :w0 FROM {_POSTINGS} WHERE token = :t0 "
+                   "ORDER BY impact DESC, candidate_id LIMIT :k")
+            params = {"t0": tokens[0], "w0": idf[tokens[0]]}
+        elif match_all:
+            order = sorted(tokens, key=dfs.get)  # cost ~ df of the rarest token
+            joins = " ".join(f"JOIN {_POSTINGS} p{i} ON p{i}.candidate_id = p0.candidate_id AND p{i}.token = :t{i}"
+                             for i in range(1, len(order)))
+            score = " + ".join(f"p{i}.impact * :w{i}" for i in range(len(order)))
+            sql = (f"SELECT p0.candidate_id, {score} AS score FROM {_POSTINGS} p0 {joins} "
+                   "WHERE p0.token = :t0 ORDER BY score DESC, p0.candidate_id LIMIT :k")
+            params = {f"{x}{i}": v for i, t in enumerate(order) for x, v in (("t", t), ("w", idf[t]))}
+        else:
+            values = ", ".join(f"(:t{i}, :w{i})" for i in range(len(tokens)))
+            sql = (f"WITH q(token, w) AS (VALUES {values}) "
+                   f"SELECT p.candidate_id, sum(q.w * p.impact) AS score FROM q JOIN {_POSTINGS} p ON p.token = q.token "
+                   "GROUP BY p.candidate_id ORDER BY score DESC, p.candidate_id LIMIT :k")
+            params = {f"{x}{i}": v for i, t in enumerate(tokens) for x, v in (("t", t), ("w", idf[t]))}
+        return [(s, c) for c, s in conn.execute(text(sql), {**params, "k": k})]
+
+    def _top_by_fts(self, conn, q: str, k: int, match_all: bool) -> List[Tuple[float, int]]:
+        from sqlalchemy import text
+        expr = _fts_query(q, match_all)
+        if not expr:
+            return []
+        sql = text(f"SELECT rowid, bm25({_FTS}, :w, 1.0) AS score FROM {_FTS} "
+                   f"WHERE {_FTS} MATCH :q ORDER BY score LIMIT :k")
+        # bm25() is "lower is better" and negative; flip it for API consumers
+        return [(-r.score, r.rowid) for r in conn.execute(sql, {"q": expr, "w": SKILLS_WEIGHT, "k": k})]
+
+    def search(self, q: str, limit: int = 20, match_all: bool = True) -> Dict:
+        from sqlalchemy import bindparam, select
+        from db.models import Candidate
+        t0 = time.perf_counter()
+        k = max(1, min(limit, SEARCH_MAX_LIMIT))
+        tokens, prefix = _query_terms(q)
+        results: List[Dict] = []
+        path = "none"
+        if self.enabled and tokens:
+            with self.engine.connect() as conn:
+                n_docs, dfs = self._doc_freqs(conn, tokens) if not prefix else (0, {})
+                if not prefix and all(dfs.values()):
+                    path, top = "skills", self._top_by_postings(conn, tokens, n_docs, dfs, k, match_all)
+                else:  # a word no resume lists as a skill, or a prefix: full-text BM25
+                    path, top = "fulltext", self._top_by_fts(conn, q, k, match_all)
+                if top:
+                    rows = {r.id: r for r in conn.execute(
+                        select(Candidate.id, Candidate.name, Candidate.skills, Candidate.resume_text)
+                        .where(Candidate.id.in_(bindparam("ids", expanding=True))), {"ids": [c for _, c in top]})}
+                    results = [{"candidate_id": c, "candidate": rows[c].name, "score": round(s, 4),
+                                "skills": json.loads(rows[c].skills or "[]"),
+                                "snippet": _snippet(rows[c].resume_text, tokens)}
+                               for s, c in top if c in rows]
+            self.counters[f"{path}_path"] += 1
+        self.counters["searches"] += 1
+        return {"query": q, "match": "all" if match_all else "any", "path": path, "results": results,
+                "took_ms": round((time.perf_counter() - t0) * 1000, 2)}
+
+    def stats(self) -> Dict:
+        if not self.enabled:
+            return {"enabled": False}
+        from sqlalchemy import text
+        with self.engine.connect() as conn:
+            docs = conn.execute(text(f"SELECT count(*) FROM {_FTS}_docsize")).scalar()
+            postings = conn.execute(text(f"SELECT count(*) FROM {_POSTINGS}")).scalar()
+        return {"enabled": True, "documents": docs, "skill_postings": postings, **self.counters}
+
+
+_INDEX: Optional[SkillsIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+def get_skills_index() -> SkillsIndex:
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = SkillsIndex()
+        return _INDEX
@@ -0,0 +1,172 @@
+"""
+One answer at a time per candidate, and each answer processed once.
+
+Every turn has a key: the client's Idempotency-Key (header or `idempotency_key` form
+field) or, without one, a hash of the answer text. A request whose key is
+
+- already being processed is coalesced onto that run (one LLM call, same result);
+- already answered is replayed from a small LRU of results (IDEMPOTENCY_TTL_S for
+  client keys, DUPLICATE_WINDOW_S for text hashes, so a candidate can still give the
+  same short answer twice in an interview);
+- new runs under the candidate's lock, so history, rubric and transcript appends of
+  concurrent turns never interleave.
+
+Reusing a client key with a different answer is a conflict (IdempotencyConflict).
+State is per process, like the event loop (agents/prefetch.py).
+"""
+from __future__ import annotations
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# ----------------------------
+# Config
+# ----------------------------
+IDEMPOTENCY_TTL_S = float(os.getenv("HIRESENSE_IDEMPOTENCY_TTL", "600"))
+DUPLICATE_WINDOW_S = float(os.getenv("HIRESENSE_DUPLICATE_WINDOW", "15"))   # keyless identical answers
+IDEMPOTENCY_MAX = int(os.getenv("HIRESENSE_IDEMPOTENCY_MAX", "5000"))      # results kept for replay
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a different answer."""
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(" ".join((text or "").split()).encode("utf-8")).hexdigest()
+
+
+class _Lock:
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class TurnGuard:
+    def __init__(self, max_results: int = IDEMPOTENCY_MAX):
+        self.max_results = max_results
+        self._locks: Dict[str, _Lock] = {}
+        self._inflight: Dict[Tuple[str, str], Tuple[str, "asyncio.Future"]] = {}
+        self._results: "OrderedDict[Tuple[str, str], Tuple[float, str, Any]]" = OrderedDict()
+        self.counters = {"new": 0, "coalesced": 0, "replayed": 0, "conflicts": 0, "failed": 0}
+
+    @staticmethod
+    def key_for(answer: str, idempotency_key: Optional[str] = None) -> str:
+        return "k:" + idempotency_key if idempotency_key else "h:" + _digest(answer)
+
+    # ---------- Serialization ----------
+    @asynccontextmanager
+    async def lock(self, candidate: str):
+        """Held for the whole turn; entries go away with their last user."""
+        entry = self._locks.get(candidate)
+        if entry is None:
+            entry = self._locks[candidate] = _Lock()
+        entry.users += 1
+        try:
+            async with entry.lock:
+                yield
+        finally:
+            entry.users -= 1
+            if entry.users == 0 and self._locks.get(candidate) is entry:
+                del self._locks[candidate]
+
+    # ---------- Idempotency ----------
+    def claim(self, candidate: str, key: str, answer: str) -> Tuple[str, Any]:
+        """
+        ("replayed", result) | ("coalesced", future) | ("owner", None).
+        The owner runs the turn with start(), which calls finish() or fail() for the key.
+        """
+        k, digest = (candidate, key), _digest(answer)
+        hit = self._results.get(k)
+        if hit is not None:
+            expires, seen, result = hit
+            if expires > time.monotonic():
+                self._check(seen, digest)
+                self._results.move_to_end(k)
+                self.counters["replayed"] += 1
+                return "replayed", result
+            del self._results[k]
+        running = self._inflight.get(k)
+        if running is not None:
+            self._check(running[0], digest)
+            self.counters["coalesced"] += 1
+            return "coalesced", running[1]
+        fut = asyncio.get_running_loop().create_future()
+        fut.add_done_callback(_consume_exception)
+        self._inflight[k] = (digest, fut)
+        self.counters["new"] += 1
+        return "owner", None
+
+    def _check(self, seen: str, digest: str) -> None:
+        if seen != digest:
+            self.counters["conflicts"] += 1
+            raise IdempotencyConflict("Idempotency-Key was already used for a different answer")
+
+    def finish(self, candidate: str, key: str, result: Any) -> None:
+        k = (candidate, key)
+        digest, fut = self._inflight.pop(k)
+        ttl = IDEMPOTENCY_TTL_S if key.startswith("k:") else DUPLICATE_WINDOW_S
+        self._results[k] = (time.monotonic() + ttl, digest, result)
+        self._results.move_to_end(k)
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+        if not fut.done():
+            fut.set_result(result)
+
+    def fail(self, candidate: str, key: str, exc: BaseException) -> None:
+        """Nothing is stored: the next request with this key runs again."""
+        entry = self._inflight.pop((candidate, key), None)
+        self.counters["failed"] += 1
+        if entry is not None and not entry[1].done():
+            if isinstance(exc, asyncio.CancelledError):  # shutdown
+                exc = RuntimeError("the original request for this answer was cancelled")
+            entry[1].set_exception(exc)
+
+    def start(self, candidate: str, key: str, fn: Callable[[], Awaitable[Any]]) -> "asyncio.Task":
+        """
+        Runs the owner's turn under the candidate's lock as its own task: a client that
+        disconnects doesn't cancel it, so its retry is replayed rather than run again.
+        """
+        async def own() -> Any:
+            try:
+                async with self.lock(candidate):
+                    result = await fn()
+            except BaseException as e:
+                self.fail(candidate, key, e)
+                raise
+            self.finish(candidate, key, result)
+            return result
+        task = asyncio.get_running_loop().create_task(own())
+        task.add_done_callback(_consume_exception)
+        return task
+
+    async def run(self, candidate: str, key: str, answer: str,
+                  fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, str]:
+        """(result, "new" | "coalesced" | "replayed")."""
+        outcome, value = self.claim(candidate, key, answer)
+        if outcome == "replayed":
+            return value, outcome
+        if outcome == "owner":
+            value = self.start(candidate, key, fn)
+            outcome = "new"
+        return await asyncio.shield(value), outcome
+
+    def forget(self, candidate: str) -> None:
+        """Drops stored results (a restarted interview must not replay the previous one)."""
+        for k in [k for k in self._results if k[0] == candidate]:
+            del self._results[k]
+
+    # ---------- Introspection ----------
+    def stats(self) -> Dict:
+        return {"locked": len(self._locks), "inflight": len(self._inflight),
+                "stored": len(self._results), **self.counters}
+
+
+def _consume_exception(fut: "asyncio.Future") -> None:
+    if not fut.cancelled():
+        fut.exception()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+from agents.pdf_extract import PDF_MAX_BYTES, PdfExtractError, aextract_pdf_file, aextract_pdf_text
+
+# ----------------------------
+# Config
+# ----------------------------
+UPLOAD_MAX_BYTES = int(os.getenv("HIRESENSE_UPLOAD_MAX_BYTES", str(PDF_MAX_BYTES)))
+UPLOAD_SPOOL_BYTES = int(os.getenv("HIRESENSE_UPLOAD_SPOOL_BYTES", str(1024 * 1024)))  # above this → temp file
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+class UploadRejected(Exception):
+    """Carries the HTTP status the handler should answer with (413 too large, 415 wrong type,
+    503 the PDF could not be parsed in time; retrying may succeed)."""
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+def sniff(head: bytes, filename: str = "") -> Optional[str]:
+    """'pdf' | 'zip' | 'text' from the first bytes, or None for any other binary format."""
+    if head.startswith(b"%PDF"):
+        return "pdf"
+    if head.startswith((b"PK\x03\x04", b"PK\x05\x06")):
+        return "zip"
+    if filename.lower().endswith(".pdf") or b"\x00" in head:
+        return None  # claims to be a PDF but isn't / some other binary format
+    return "text"
+
+# ----------------------------
+# Spooled upload
+# ----------------------------
+class SpooledUpload:
+    """An upload copied chunk-by-chunk: small ones stay in memory, large ones go to a named temp file
+    so the PDF worker can map it by path. The sha256 is computed on the way in."""
+
+    def __init__(self, kind: str, size: int, digest: str, buf: Optional[bytearray], path: Optional[str]):
+        self.kind = kind
+        self.size = size
+        self.digest = digest
+        self._buf = buf
+        self.path = path
+
+    def read_bytes(self) -> bytes:
+        if self._buf is not None:
+            return bytes(self._buf)
+        with open(self.path, "rb") as fh:
+            return fh.read()
+
+    def text(self, errors: str = "ignore") -> str:
+        return self.read_bytes().decode("utf-8", errors=errors)
+
+    async def extract_text(self, errors: str = "ignore") -> Optional[str]:
+        """PDF text via the worker pool (None if unreadable), or the decoded text upload.
+        A parse that timed out or crashed is UploadRejected(503)."""
+        if self.kind != "pdf":
+            return self.text(errors)
+        try:
+            if self.path is not None:
+                return await aextract_pdf_file(self.path, self.size, self.digest)
+            return await aextract_pdf_text(bytes(self._buf), self.digest)
+        except PdfExtractError as e:
+            raise UploadRejected(503, f"{e}; please try again")
+
+    def close(self) -> None:
+        self._buf = None
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+async def spool_upload(file, max_bytes: int = UPLOAD_MAX_BYTES, kinds=("pdf", "text"),
+                       spool_bytes: int = UPLOAD_SPOOL_BYTES) -> SpooledUpload:
+    """Stream a Starlette UploadFile into a SpooledUpload.
+
+    Raises UploadRejected as soon as the first chunk has the wrong magic bytes (not one of
+    `kinds`) or the running total passes `max_bytes`; at most one chunk over the limit is
+    ever held. Past `spool_bytes` the upload goes to a temp file (0: always on disk)."""
+    h = hashlib.sha256()
+    buf: Optional[bytearray] = bytearray()
+    fh = None
+    size = 0
+    kind = None
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            if kind is None:
+                kind = sniff(chunk[:1024], file.filename or "")
+                if kind not in kinds:
+                    what = "a zip archive" if kinds == ("zip",) else "a PDF or plain-text resume"
+                    raise UploadRejected(415, f"Unsupported file type; upload {what}")
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadRejected(413, f"Upload exceeds {max_bytes} bytes")
+            h.update(chunk)
+            if fh is None and size > spool_bytes:
+                fh = tempfile.NamedTemporaryFile(prefix="hiresense-", suffix=".upload", delete=False)
+                fh.write(buf)
+                buf = None
+            if fh is not None:
+                fh.write(chunk)
+            else:
+                buf += chunk
+    except BaseException:
+        if fh is not None:
+            fh.close()
+            os.unlink(fh.name)
+        raise
+    path = None
+    if fh is not None:
+        fh.close()
+        path = fh.name
+    if kind is None and "text" not in kinds:
+        raise UploadRejected(415, "Empty upload")
+    return SpooledUpload(kind or "text", size, h.hexdigest(), buf, path)
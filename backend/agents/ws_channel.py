@@ -0,0 +1,276 @@
+"""
+Persistent interview channel: /ws/interview/{candidate}?last_seq=N (see app.py).
+
+Frames are small JSON objects with a "type".
+
+client → server
+    {"type": "answer", "text": "...", "id": "a-17"}  id: optional, makes re-sends after a reconnect safe
+    {"type": "draft", "text": "..."}                 partial answer, warms the follow-up (/answer/draft)
+    {"type": "pong"} | {"type": "ping"}
+
+server → client
+    {"type": "ready", "seq": N, "resumed": bool}     after connect; then any frames with seq > last_seq
+                                                     (N < last_seq: the server restarted, count from N)
+    {"type": "token", "text": "..."}                 follow-up text as generated (no seq, may be dropped)
+    {"type": "followup", "seq", "id", "followup", "feedback"}
+    {"type": "rubric", "seq", "scores", "rationale", "overallSummary", "rubric"}
+    {"type": "resync", "seq", "question", "rubric"}  last_seq is older than the replay buffer
+    {"type": "ping"} | {"type": "pong"} | {"type": "error", "code", "message"}
+
+Durable frames get a per-candidate `seq` and are kept in a small ring buffer, so a client
+that reconnects with ?last_seq=N gets what it missed. Turns run outside the connection:
+one that finishes while the client is away is replayed on reconnect.
+
+Backpressure: each connection has a bounded outbound queue. Token frames are dropped when
+it is full (the followup frame carries the full text); if durable frames back up, the
+connection is closed with 1013 and the client resumes from its last seq. At most
+WS_MAX_PENDING answers queue per candidate. One sweeper per event loop sends heartbeats
+and closes peers silent for WS_IDLE_S, so an idle interview costs a receive coroutine,
+a sender coroutine and its ring buffer.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import os
+import time
+import weakref
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Config
+# ----------------------------
+WS_HEARTBEAT_S = float(os.getenv("HIRESENSE_WS_HEARTBEAT", "20"))   # server ping interval
+WS_IDLE_S = float(os.getenv("HIRESENSE_WS_IDLE", "60"))              # close after this long without a frame
+WS_OUTBOX = int(os.getenv("HIRESENSE_WS_OUTBOX", "256"))             # queued frames per connection
+WS_REPLAY = int(os.getenv("HIRESENSE_WS_REPLAY", "64"))              # durable frames kept per candidate
+WS_MAX_PENDING = int(os.getenv("HIRESENSE_WS_MAX_PENDING", "2"))     # answers queued per candidate
+WS_CHANNEL_TTL_S = float(os.getenv("HIRESENSE_WS_TTL", "1800"))      # forget a disconnected channel after this
+
+_SLOW_CONSUMER = 1013   # "try again later": reconnect and resume
+_REPLACED = 4000        # another connection took over this candidate
+
+Emit = Callable[[Dict], None]
+# turn(candidate, answer_text, emit) -> durable frames to send once the turn is done
+TurnFn = Callable[[str, str, Emit], Awaitable[list]]
+DraftFn = Callable[[str, str], Any]
+ResyncFn = Callable[[str], Awaitable[Dict]]
+
+
+def _dumps(frame: Dict) -> str:
+    return json.dumps(frame, separators=(",", ":"))
+
+
+class _Connection:
+    __slots__ = ("ws", "outbox", "sender", "last_seen", "closed", "__weakref__")
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.outbox: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=WS_OUTBOX)
+        self.sender: Optional[asyncio.Task] = None
+        self.last_seen = time.monotonic()
+        self.closed = False
+
+
+class _Channel:
+    """Per-candidate state that outlives a connection: seq counter, replay ring, turn queue."""
+    __slots__ = ("seq", "ring", "conn", "lock", "pending", "answer_ids", "touched")
+
+    def __init__(self):
+        self.seq = 0
+        self.ring: deque = deque(maxlen=WS_REPLAY)   # (seq, encoded frame)
+        self.conn: Optional[_Connection] = None
+        self.lock = asyncio.Lock()                   # turns run one at a time, in order
+        self.pending = 0
+        self.answer_ids: deque = deque(maxlen=32)    # recent client answer ids (dedupe re-sends)
+        self.touched = time.monotonic()
+
+
+class ChannelHub:
+    """All interview channels of this process (they hold asyncio state, so: per event loop)."""
+    def __init__(self):
+        self._channels: Dict[str, _Channel] = {}
+        self._sweepers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Task]" = weakref.WeakKeyDictionary()
+        self.counters = {"connects": 0, "resumes": 0, "resyncs": 0, "replayed": 0, "frames": 0,
+                         "tokens_dropped": 0, "slow_closes": 0, "idle_closes": 0, "answers": 0,
+                         "duplicates": 0, "busy": 0}
+
+    # ---------- Sending ----------
+    def _offer(self, ch: _Channel, text: str, droppable: bool) -> None:
+        conn = ch.conn
+        if conn is None or conn.closed:
+            return
+        try:
+            conn.outbox.put_nowait(text)
+            self.counters["frames"] += 1
+        except asyncio.QueueFull:
+            if droppable:
+                self.counters["tokens_dropped"] += 1
+                return
+            # the client can't keep up with durable frames: drop the connection, it resumes by seq
+            self.counters["slow_closes"] += 1
+            self._close(ch, conn, _SLOW_CONSUMER)
+
+    def _emit(self, ch: _Channel, frame: Dict) -> None:
+        """Durable frame: numbered, kept for replay, then sent if a client is connected."""
+        ch.seq += 1
+        frame["seq"] = ch.seq
+        text = _dumps(frame)
+        ch.ring.append((ch.seq, text))
+        self._offer(ch, text, droppable=False)
+
+    def _close(self, ch: Optional[_Channel], conn: _Connection, code: int) -> None:
+        if conn.closed:
+            return
+        conn.closed = True
+        if ch is not None and ch.conn is conn:
+            ch.conn = None
+        while True:  # make room for the close marker
+            try:
+                conn.outbox.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        conn.outbox.put_nowait(None)
+        asyncio.get_running_loop().create_task(_safe_close(conn.ws, code))
+
+    async def _send_loop(self, conn: _Connection) -> None:
+        try:
+            while True:
+                text = await conn.outbox.get()
+                if text is None:
+                    return
+                await conn.ws.send_text(text)
+        except Exception:
+            conn.closed = True
+
+    # ---------- Heartbeats ----------
+    def _ensure_sweeper(self) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._sweepers.get(loop)
+        if task is None or task.done():
+            self._sweepers[loop] = loop.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self) -> None:
+        ping = _dumps({"type": "ping"})
+        while True:
+            await asyncio.sleep(WS_HEARTBEAT_S)
+            now = time.monotonic()
+            for cand, ch in list(self._channels.items()):
+                conn = ch.conn
+                if conn is not None:
+                    if now - conn.last_seen > WS_IDLE_S:
+                        self.counters["idle_closes"] += 1
+                        self._close(ch, conn, 1001)
+                    else:
+                        self._offer(ch, ping, droppable=True)
+                elif ch.pending == 0 and now - ch.touched > WS_CHANNEL_TTL_S:
+                    del self._channels[cand]
+
+    # ---------- Connection lifecycle ----------
+    async def serve(self, ws, candidate: str, last_seq: int, turn: TurnFn,
+                    draft: Optional[DraftFn] = None, resync: Optional[ResyncFn] = None) -> None:
+        await ws.accept()
+        self._ensure_sweeper()
+        ch = self._channels.get(candidate)
+        if ch is None:
+            ch = self._channels[candidate] = _Channel()
+        if ch.conn is not None:
+            self._close(ch, ch.conn, _REPLACED)
+        conn = ch.conn = _Connection(ws)
+        conn.sender = asyncio.get_running_loop().create_task(self._send_loop(conn))
+        ch.touched = time.monotonic()
+        self.counters["connects"] += 1
+
+        resumed = last_seq >= 0
+        self._offer(ch, _dumps({"type": "ready", "seq": ch.seq, "resumed": resumed}), droppable=False)
+        if resumed:
+            self.counters["resumes"] += 1
+            oldest = ch.ring[0][0] if ch.ring else ch.seq + 1
+            if last_seq > ch.seq or last_seq + 1 < oldest:
+                # missed more than we kept, or numbered by a previous process: send the current state
+                self.counters["resyncs"] += 1
+                self._emit(ch, {"type": "resync", **((await resync(candidate)) if resync else {})})
+            else:
+                for seq, text in list(ch.ring):
+                    if seq > last_seq:
+                        self.counters["replayed"] += 1
+                        self._offer(ch, text, droppable=False)
+
+        try:
+            async for raw in ws.iter_text():
+                conn.last_seen = ch.touched = time.monotonic()
+                try:
+                    msg = json.loads(raw)
+                    kind = msg.get("type")
+                except Exception:
+                    self._offer(ch, _dumps({"type": "error", "code": "bad_frame", "message": "expected a JSON object"}), False)
+                    continue
+                if kind == "answer":
+                    self._on_answer(ch, candidate, msg, turn)
+                elif kind == "draft":
+                    if draft is not None and isinstance(msg.get("text"), str):
+                        draft(candidate, msg["text"])
+                elif kind == "ping":
+                    self._offer(ch, _dumps({"type": "pong"}), droppable=True)
+                elif kind != "pong":
+                    self._offer(ch, _dumps({"type": "error", "code": "unknown_type", "message": str(kind)}), False)
+        except Exception:
+            pass  # disconnect mid-receive
+        finally:
+            self._close(ch, conn, 1000)
+            await asyncio.gather(conn.sender, return_exceptions=True)
+
+    def _on_answer(self, ch: _Channel, candidate: str, msg: Dict, turn: TurnFn) -> None:
+        text, answer_id = msg.get("text"), msg.get("id")
+        if not isinstance(text, str) or not text.strip():
+            self._offer(ch, _dumps({"type": "error", "code": "empty_answer", "message": "answer text is required"}), False)
+            return
+        if answer_id is not None and answer_id in ch.answer_ids:
+            self.counters["duplicates"] += 1  # a re-send after reconnect: the result is (or will be) in the replay
+            return
+        if ch.pending >= WS_MAX_PENDING:
+            self.counters["busy"] += 1
+            self._offer(ch, _dumps({"type": "error", "code": "busy", "id": answer_id,
+                                    "message": "previous answers are still being processed"}), False)
+            return
+        if answer_id is not None:
+            ch.answer_ids.append(answer_id)
+        ch.pending += 1
+        self.counters["answers"] += 1
+        task = asyncio.get_running_loop().create_task(self._run_turn(ch, candidate, text, answer_id, turn))
+        task.add_done_callback(_consume_exception)
+
+    async def _run_turn(self, ch: _Channel, candidate: str, text: str, answer_id: Any, turn: TurnFn) -> None:
+        try:
+            async with ch.lock:
+                def emit_token(frame: Dict) -> None:
+                    self._offer(ch, _dumps(frame), droppable=True)
+                for frame in await turn(candidate, text, emit_token):
+                    if frame.get("type") == "followup":
+                        frame["id"] = answer_id
+                    self._emit(ch, frame)
+        except Exception as e:
+            logger.warning("WebSocket turn failed: %s", e)
+            self._emit(ch, {"type": "error", "code": "turn_failed", "id": answer_id, "message": "could not process answer"})
+        finally:
+            ch.pending -= 1
+            ch.touched = time.monotonic()
+
+    # ---------- Introspection ----------
+    def stats(self) -> Dict:
+        connected = sum(1 for ch in self._channels.values() if ch.conn is not None)
+        return {"channels": len(self._channels), "connected": connected, **self.counters}
+
+
+async def _safe_close(ws, code: int) -> None:
+    try:
+        await ws.close(code=code)
+    except Exception:
+        pass
+
+def _consume_exception(task: "asyncio.Task") -> None:
+    if not task.cancelled():
+        task.exception()
@@ -1,24 +1,57 @@
-import io
 import os
+import json
+import asyncio
+import logging
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict
 
-# --- Load .env BEFORE importing anything that constructs ChatOpenAI ---
+# --- Load .env BEFORE importing the agents: they read OPENAI_API_KEY / HIRESENSE_MOCK at import ---
 from dotenv import load_dotenv
 ENV_PATH = Path(__file__).resolve().parent / ".env"
 load_dotenv(ENV_PATH)
-print("OPENAI_API_KEY loaded:", "OK" if os.getenv("OPENAI_API_KEY") else "NOT FOUND")
+logger = logging.getLogger(__name__)
+logger.info("OPENAI_API_KEY %s", "loaded" if os.getenv("OPENAI_API_KEY") else "not set")
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Query, Response, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
+from db.session_store import SessionStore, make_backend
+from agents.pdf_extract import shutdown as shutdown_pdf_pool
+from agents.uploads import UploadRejected, spool_upload
+from agents.rubric import RubricAccumulator, coaching_from_features
+from agents.answer_features import AnswerFeatures
+from agents.prefetch import Prefetcher
+from db.transcripts import TranscriptWriter, make_transcript_writer, new_interview_id
+from agents.bulk_ingest import ingest as bulk_ingest_path
+from agents.batch_scoring import rescore as rescore_transcripts
+from agents.report_export import export_bundle, export_csv, export_ndjson
+from agents.resume_parser import parse_resume
+from agents.skills_index import SkillsIndex, get_skills_index
+from agents.session_layout import JobConfig, share, shared_stats
+from agents import metrics
+from agents.metrics import MetricsMiddleware, profile_turn, stage
+from agents.ws_channel import ChannelHub
+from agents.turn_guard import IdempotencyConflict, TurnGuard
+
 # LangChain chain utilities
 from agents.langchain_chain import (
-    build_first_question,
-    build_followup_and_feedback,
-    add_pair_to_history,
-    reset_history,
+    LLM_ENABLED,
+    MOCK_MODE,
+    abuild_first_question,
+    abuild_followup_and_feedback,
+    aadopt_draft_plan,
+    adraft_followup_and_feedback,
+    astream_followup_and_feedback,
+    aadd_pair_to_history,
+    aget_history,
+    areset_history,
+    history_stats,
+    history_store_stats,
+    llm_cache_stats,
+    turn_latency_stats,
 )
 
 app = FastAPI(title="HireSense Interview API (LangChain)")
@@ -31,54 +64,159 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-route latency histograms for GET /metrics (agents/metrics.py)
+app.add_middleware(MetricsMiddleware)
 
 # -----------------------------
 # In-memory stores
 # -----------------------------
-RESUMES: Dict[str, str] = {}
-JD_CACHE: Dict[str, Dict] = {}  # optional per-candidate JD config
+# Bounded (LRU + idle TTL); HIRESENSE_SESSION_BACKEND=sqlite adds a write-through
+# durable tier so a restart doesn't lose live interviews.
+# Resume text is shared by content hash and role/tone strings are interned
+# (agents/session_layout.py): what a session costs is mostly what is unique to it.
+RESUMES: SessionStore = SessionStore("resumes", backend=make_backend(),
+                                     dumps=lambda s: s.value, loads=share)
+JD_CACHE: SessionStore = SessionStore(  # optional per-candidate JD config
+    "jd",
+    backend=make_backend(),
+    dumps=JobConfig.to_json,
+    loads=JobConfig.from_json,
+)
+RUBRICS: SessionStore = SessionStore(  # running rubric counters, updated once per turn
+    "rubric",
+    backend=make_backend(),
+    dumps=RubricAccumulator.to_json,
+    loads=RubricAccumulator.from_json,
+    factory=RubricAccumulator,
+)
+
+INTERVIEWS: SessionStore = SessionStore("interviews", backend=make_backend())  # candidate -> current interview id
+
+# Durable record of every answered turn, written behind the request (db/transcripts.py).
+# Created on startup: it opens the database and starts a writer thread.
+TRANSCRIPTS: Optional[TranscriptWriter] = None
+
+# Skill postings + FTS5 index over stored resumes for recruiter search (agents/skills_index.py).
+# Created on startup: opening it creates its tables and backfills stored resumes.
+SKILLS_INDEX: Optional[SkillsIndex] = None
+
+# Follow-ups warmed from debounced drafts (/answer/draft); per process, like the event loop
+PREFETCH = Prefetcher()
+
+# One turn at a time per candidate; duplicate answers coalesced / replayed (agents/turn_guard.py)
+TURNS = TurnGuard()
+
+# Persistent interview connections (/ws/interview/{candidate}): seq + replay buffer per candidate
+CHANNELS = ChannelHub()
+
+# Scrape-time gauges for GET /metrics
+metrics.gauge("hiresense_session_store_items", "Live entries per session store.",
+              lambda: {st["namespace"]: st["size"] for st in
+                       (RESUMES.stats(), JD_CACHE.stats(), RUBRICS.stats(), INTERVIEWS.stats(), history_store_stats())}, label="store")
+metrics.gauge("hiresense_shared_values", "Distinct shared resume/JD values held in memory.",
+              lambda: shared_stats()["values"])
+metrics.gauge("hiresense_transcript_queue", "Transcript rows waiting to be written.",
+              lambda: TRANSCRIPTS.stats()["pending"] if TRANSCRIPTS is not None else 0)
+metrics.gauge("hiresense_llm_turns", "Follow-up turns by outcome (llm / deadline / error fallbacks).",
+              lambda: {k: v for k, v in turn_latency_stats().items()
+                       if k in ("llm", "deadline_fallbacks", "error_fallbacks", "hedged")}, label="outcome")
+metrics.gauge("hiresense_ws_channels", "Interview channels held / with a connected client.",
+              lambda: {k: v for k, v in CHANNELS.stats().items() if k in ("channels", "connected")}, label="state")
+metrics.gauge("hiresense_answer_requests", "Answer requests by outcome (new / coalesced / replayed / conflicts).",
+              lambda: {k: v for k, v in TURNS.stats().items()
+                       if k in ("new", "coalesced", "replayed", "conflicts")}, label="outcome")
 
 # -----------------------------
 # Helpers
 # -----------------------------
-def extract_text_from_upload(file: UploadFile) -> str:
-    """Best-effort text extraction; never crash API if dependency or file is bad."""
-    name = (file.filename or "").lower()
-    data = file.file.read()
-    if not data:
-        return ""
-
-    # text files
-    if name.endswith((".txt", ".md")):
-        try:
-            return data.decode("utf-8", errors="ignore")
-        except Exception:
-            return ""
+async def extract_text_from_upload(file: UploadFile) -> str:
+    """Best-effort text extraction; never crash API if dependency or file is bad.
 
-    # pdf files
-    if name.endswith(".pdf"):
-        try:
-            from pypdf import PdfReader  # lazy import to avoid import-time errors
-            reader = PdfReader(io.BytesIO(data))
-            return "\n".join([(p.extract_text() or "") for p in reader.pages[:10]])
-        except Exception as e:
-            print("PDF parse error:", e)
+    The upload is streamed to a size-capped spool (UploadRejected on oversize / wrong type);
+    PDFs are parsed in a worker process straight from that spool, cached by content hash."""
+    with await spool_upload(file) as up:
+        if up.size == 0:
             return ""
+        with stage("pdf_extract"):
+            text = await up.extract_text()
+        if text is None:
+            logger.warning("PDF parse error: %s", file.filename)
+        return text or ""
+
+async def record_exchange(candidate: str, answer: str, followup: str, feedback: str = "",
+                          feats: Optional[AnswerFeatures] = None) -> None:
+    """Append one turn to the chat history, the candidate's rubric counters and the transcript log."""
+    question = await aadd_pair_to_history(candidate, user_text=answer, ai_text=followup)
+
+    def apply(acc: RubricAccumulator) -> int:
+        if answer:
+            acc.add_answer(answer, feats)
+        acc.add_question(followup)
+        return acc.answers
+
+    turn = await RUBRICS.aupdate(candidate, apply)
+    if TRANSCRIPTS is not None and answer:
+        TRANSCRIPTS.record(candidate, turn, question, answer, feedback,
+                           interview_id=await INTERVIEWS.aget(candidate))
 
-    # default: try decode
+async def index_resume(candidate: str, text: str) -> None:
+    """Keep the candidate's stored resume and search entry current; never fails the upload."""
+    if SKILLS_INDEX is None or not SKILLS_INDEX.enabled or not text:
+        return
+    parsed = parse_resume(text)
     try:
-        return data.decode("utf-8", errors="ignore")
-    except Exception:
-        return ""
+        await run_in_threadpool(SKILLS_INDEX.upsert_candidate, candidate, parsed["raw_text"], parsed["skills"])
+    except Exception as e:
+        logger.warning("Search index update failed: %s", e)
 
-def default_role_pack():
-    return {
-        "role": "Software Engineer",
-        "seniority": "Mid",
-        "tone": "Professional",
-        "focus": [],
-        "description": "",
-    }
+def _followup_job(candidate: str, text: str, draft: bool = False):
+    """
+    Coroutine producing {"text", "features", "out", "plan"} for an answer, or for a draft
+    of one: then the rule planner's state is left untouched and returned as "plan", to be
+    saved only if /answer uses the draft (_take_draft).
+    """
+    async def job() -> Dict:
+        pack = await JD_CACHE.aget(candidate, default_role_pack())
+        feats = AnswerFeatures.of(text)
+        args = dict(candidate=candidate, role=pack.role, seniority=pack.seniority, tone=pack.tone,
+                    candidate_response=text)
+        if draft:
+            out, plan = await adraft_followup_and_feedback(**args)
+        else:
+            out, plan = await abuild_followup_and_feedback(**args), None
+        return {"text": text, "features": feats, "out": out, "plan": plan}
+    return job
+
+async def _take_draft(candidate: str, response: str) -> Optional[Dict]:
+    """The turn prefetched from a draft of `response`, if usable; its planner state is saved now."""
+    pre = await PREFETCH.take(candidate, response)
+    if pre is None or not await aadopt_draft_plan(candidate, pre["plan"]):
+        return None
+    if _features_if_same(pre, response) is None:
+        # the final answer extends the draft: coach what was actually sent
+        pre = {**pre, "out": {**pre["out"], "feedback": coaching_from_features(AnswerFeatures.of(response))}}
+    return pre
+
+def _features_if_same(pre: Dict, response: str) -> Optional[AnswerFeatures]:
+    # the draft's analysis is only reusable verbatim; a longer final answer gets its own scan
+    return pre["features"] if pre["text"] == response else None
+
+def default_role_pack() -> JobConfig:
+    return _DEFAULT_PACK
+
+_DEFAULT_PACK = JobConfig()
+
+@app.on_event("startup")
+def on_startup():
+    global TRANSCRIPTS, SKILLS_INDEX
+    TRANSCRIPTS = make_transcript_writer()
+    SKILLS_INDEX = get_skills_index()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    if TRANSCRIPTS is not None:
+        TRANSCRIPTS.close()  # write out queued turns
+    shutdown_pdf_pool()
 
 # -----------------------------
 # Models
@@ -96,6 +234,7 @@ class StartRequest(BaseModel):
 
 class StartResponse(BaseModel):
     first_question: str
+    interview_id: str = ""
 
 class AnswerResponse(BaseModel):
     followup: str
@@ -109,62 +248,343 @@ class AnswerResponse(BaseModel):
 @app.post("/upload_resume/", response_model=UploadAck)
 async def upload_resume(candidate: str = Form(...), file: UploadFile = File(...)):
     try:
-        text = extract_text_from_upload(file)
-        RESUMES[candidate] = text or ""
+        text = await extract_text_from_upload(file)
+        await RESUMES.aset(candidate, share(text or ""))
+        await index_resume(candidate, text or "")
         return {"ok": True}
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
-        print("Upload error:", e)
+        logger.exception("Upload error: %s", e)
         raise HTTPException(status_code=400, detail="Could not parse resume")
 
+@app.get("/candidates/search")
+async def search_candidates(q: str, limit: int = 20, match: str = "all"):
+    """
+    Ranked candidates for a skills query, e.g. ?q=kafka python&match=all (or any).
+    BM25 over normalized skills (weighted) and resume text; 'kube*' matches by prefix.
+    """
+    if SKILLS_INDEX is None or not SKILLS_INDEX.enabled:
+        raise HTTPException(status_code=503, detail="Candidate search needs the SQLite FTS5 backend")
+    return await run_in_threadpool(SKILLS_INDEX.search, q, limit, match != "any")
+
+BULK_MAX_BYTES = int(os.getenv("HIRESENSE_BULK_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+@app.post("/candidates/bulk")
+async def bulk_ingest(file: UploadFile = File(...)):
+    """
+    Import a zip of resumes (PDF / .txt / .md) into `candidates`, parsed across cores.
+    Streams NDJSON progress events (see agents/bulk_ingest.py); documents already
+    imported (same content hash) are skipped, so an interrupted import can be re-sent.
+    """
+    try:
+        up = await spool_upload(file, max_bytes=BULK_MAX_BYTES, kinds=("zip",), spool_bytes=0)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    def events():
+        # sync generator: Starlette iterates it on a worker thread, off the event loop
+        with up:
+            for ev in bulk_ingest_path(up.path):
+                yield json.dumps(ev) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.post("/transcripts/rescore")
+async def rescore(dry_run: bool = False):
+    """
+    Re-score every stored interview with the current rubric and coaching, across cores
+    (see agents/batch_scoring.py). Streams NDJSON progress; with ?dry_run=true nothing is
+    written and the final event reports what would change against the stored scores.
+    """
+    if TRANSCRIPTS is not None:
+        await run_in_threadpool(TRANSCRIPTS.flush, 5.0)  # include turns still queued for write
+
+    def events():
+        for ev in rescore_transcripts(dry_run=dry_run):
+            yield json.dumps(ev) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+_EXPORTS = {
+    "csv": (export_csv, "text/csv; charset=utf-8"),
+    "ndjson": (export_ndjson, "application/x-ndjson"),
+}
+
+@app.get("/reports/export.{fmt}")
+async def export_reports(fmt: str, candidate: Optional[List[str]] = Query(None)):
+    """
+    Stored transcripts and scores, streamed row by row (see agents/report_export.py):
+    CSV has one row per answered turn, NDJSON one object per interview. Repeat
+    ?candidate=<name> to export only those candidates.
+    """
+    if fmt not in _EXPORTS:
+        raise HTTPException(status_code=404, detail="Use export.csv or export.ndjson")
+    if TRANSCRIPTS is not None:
+        await run_in_threadpool(TRANSCRIPTS.flush, 5.0)  # include turns still queued for write
+    gen, media_type = _EXPORTS[fmt]
+    # sync generator: Starlette iterates it on a worker thread, off the event loop
+    return StreamingResponse(gen(candidate), media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="hiresense-interviews.{fmt}"'})
+
+@app.get("/reports/bundle.zip")
+async def export_report_bundle(candidate: Optional[List[str]] = Query(None)):
+    """Zip of one PDF report per interview, rendered across cores and streamed as it is written."""
+    if TRANSCRIPTS is not None:
+        await run_in_threadpool(TRANSCRIPTS.flush, 5.0)
+    return StreamingResponse(export_bundle(candidate), media_type="application/zip",
+                             headers={"Content-Disposition": 'attachment; filename="hiresense-reports.zip"'})
+
 @app.post("/start_interview", response_model=StartResponse)
 @app.post("/start_interview/", response_model=StartResponse)
 async def start_interview(payload: StartRequest):
     # cache role pack for this candidate (optional)
-    JD_CACHE[payload.candidate] = {
-        "role": payload.role,
-        "seniority": payload.seniority,
-        "tone": payload.tone,
-        "focus": payload.focus or [],
-        "description": payload.description or "",
-    }
-
-    # reset conversation history on start
-    reset_history(payload.candidate)
-
-    resume_text = RESUMES.get(payload.candidate, "")
-    jd_text = JD_CACHE[payload.candidate]["description"]
-
-    first_q = build_first_question(
+    job = JobConfig(
         role=payload.role,
         seniority=payload.seniority,
         tone=payload.tone,
-        resume_text=resume_text,
-        jd_text=jd_text,
+        focus=payload.focus or [],
+        description=payload.description or "",
     )
+    await JD_CACHE.aset(payload.candidate, job)
+
+    # reset conversation history (and the running rubric) on start; waits for a turn in progress
+    async with TURNS.lock(payload.candidate):
+        PREFETCH.discard(payload.candidate)
+        TURNS.forget(payload.candidate)
+        await areset_history(payload.candidate)
+        await RUBRICS.aset(payload.candidate, RubricAccumulator())
+        interview_id = new_interview_id()  # transcript rows of this run are grouped by it
+        await INTERVIEWS.aset(payload.candidate, interview_id)
+
+        resume = await RESUMES.aget(payload.candidate)
+        resume_text = resume.value if resume is not None else ""
+        jd_text = job.description
 
-    # seed history with the AI's first question (so the chain "remembers")
-    add_pair_to_history(payload.candidate, user_text="", ai_text=first_q)
+        first_q = await abuild_first_question(
+            role=payload.role,
+            seniority=payload.seniority,
+            tone=payload.tone,
+            resume_text=resume_text,
+            jd_text=jd_text,
+        )
 
-    return {"first_question": first_q}
+        # seed history with the AI's first question (so the chain "remembers")
+        await record_exchange(payload.candidate, answer="", followup=first_q)
+
+    return {"first_question": first_q, "interview_id": interview_id}
+
+def _turn_key(response: str, header_key: Optional[str], form_key: Optional[str]) -> str:
+    return TurnGuard.key_for(response, header_key or form_key)
 
 @app.post("/answer", response_model=AnswerResponse)
 @app.post("/answer/", response_model=AnswerResponse)
-async def answer(candidate: str = Form(...), response: str = Form(...)):
-    pack = JD_CACHE.get(candidate, default_role_pack())
-    role = pack["role"]; seniority = pack["seniority"]; tone = pack["tone"]
-
-    # add candidate reply to history
-    add_pair_to_history(candidate, user_text=response, ai_text=None)
-
-    out = build_followup_and_feedback(
-        candidate=candidate,
-        role=role,
-        seniority=seniority,
-        tone=tone,
-        candidate_response=response,
-    )
+async def answer(reply: Response, candidate: str = Form(...), response: str = Form(...),
+                 idempotency_key: Optional[str] = Form(None),
+                 idempotency_header: Optional[str] = Header(None, alias="Idempotency-Key")):
+    """
+    A retried or double-submitted answer (same Idempotency-Key, or the same text moments
+    later) shares the first request's result instead of running the turn again.
+    """
+    async def turn() -> Dict:
+        # A draft of this answer may already have produced the follow-up (see /answer/draft)
+        async with profile_turn("answer"):  # flamegraph of slow turns, if HIRESENSE_PROFILE_SLOW_MS is set
+            pre = await _take_draft(candidate, response)
+            if pre is None:
+                pre = await _followup_job(candidate, response)()
+        out = pre["out"]
 
-    # add AI follow-up to history
-    add_pair_to_history(candidate, user_text="", ai_text=out.get("followup", ""))
+        # record the exchange only now: the prompt already carries the latest answer,
+        # so adding it earlier would send it twice
+        await record_exchange(candidate, answer=response, followup=out.get("followup", ""),
+                              feedback=out.get("feedback", ""), feats=_features_if_same(pre, response))
+        return out
 
+    try:
+        out, outcome = await TURNS.run(candidate, _turn_key(response, idempotency_header, idempotency_key),
+                                       response, turn)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if outcome != "new":
+        reply.headers["Idempotent-Replayed"] = "true"
     return AnswerResponse(**out)
+
+@app.post("/answer/draft")
+async def answer_draft(candidate: str = Form(...), draft: str = Form(...)):
+    """
+    Debounced partial answer from the composer. Warms the follow-up in the background
+    (replacing a stale draft's work); /answer then reuses it if the final answer is this
+    draft or a short extension of it. Returns immediately.
+    """
+    return {"status": PREFETCH.submit(candidate, draft, _followup_job(candidate, draft, draft=True))}
+
+async def _stream_turn(candidate: str, response: str, emit: Callable[[str], None]) -> Dict:
+    """Runs one answer, passing follow-up text to `emit` as it is generated; records the exchange."""
+    pre = await _take_draft(candidate, response)
+    if pre is not None:  # warmed from a draft: nothing left to stream
+        out, feats = pre["out"], _features_if_same(pre, response)
+        emit(out.get("followup", ""))
+    else:
+        pack = await JD_CACHE.aget(candidate, default_role_pack())
+        out, feats = {}, None
+        async for kind, payload in astream_followup_and_feedback(
+            candidate=candidate,
+            role=pack.role,
+            seniority=pack.seniority,
+            tone=pack.tone,
+            candidate_response=response,
+        ):
+            if kind == "token":
+                emit(payload)
+            else:
+                out = payload
+    await record_exchange(candidate, answer=response, followup=out.get("followup", ""),
+                          feedback=out.get("feedback", ""), feats=feats)
+    return out
+
+@app.post("/answer/stream")
+async def answer_stream(candidate: str = Form(...), response: str = Form(...),
+                        idempotency_key: Optional[str] = Form(None),
+                        idempotency_header: Optional[str] = Header(None, alias="Idempotency-Key")):
+    """
+    Server-Sent Events variant of /answer:
+      event: token  data: {"text": "..."}   (followup text as it is generated)
+      event: done   data: {"followup": "...", "feedback": "..."}
+    The turn runs to completion even if the client drops, so a retry with the same key
+    is replayed (one token frame with the whole follow-up, then done).
+    """
+    key = _turn_key(response, idempotency_header, idempotency_key)
+    try:
+        outcome, value = TURNS.claim(candidate, key, response)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    tokens: asyncio.Queue = asyncio.Queue()
+    if outcome == "owner":
+        value = TURNS.start(candidate, key, lambda: _stream_turn(candidate, response, tokens.put_nowait))
+        value.add_done_callback(lambda _: tokens.put_nowait(None))
+
+    async def events():
+        if outcome == "owner":
+            while (text := await tokens.get()) is not None:
+                yield f"event: token\ndata: {json.dumps({'text': text})}\n\n"
+        out = value if outcome == "replayed" else await asyncio.shield(value)
+        if outcome != "owner":
+            yield f"event: token\ndata: {json.dumps({'text': out.get('followup', '')})}\n\n"
+        yield f"event: done\ndata: {json.dumps(out)}\n\n"
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if outcome != "owner":
+        headers["Idempotent-Replayed"] = "true"
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+async def _rubric_frame(candidate: str) -> Dict:
+    acc = await RUBRICS.aget(candidate)
+    return {**acc.dashboard(), "rubric": acc.scores()} if acc is not None else {}
+
+async def _ws_turn(candidate: str, response: str, emit) -> List[Dict]:
+    """One answer over the interview channel: token frames as generated, then followup + rubric."""
+    async with TURNS.lock(candidate), profile_turn("answer_ws"):
+        out = await _stream_turn(candidate, response, lambda text: emit({"type": "token", "text": text}))
+    return [{"type": "followup", "followup": out.get("followup", ""), "feedback": out.get("feedback", "")},
+            {"type": "rubric", **(await _rubric_frame(candidate))}]
+
+def _ws_draft(candidate: str, draft: str) -> None:
+    PREFETCH.submit(candidate, draft, _followup_job(candidate, draft, draft=True))
+
+async def _ws_resync(candidate: str) -> Dict:
+    history = await aget_history(candidate)
+    return {"question": history.last_ai_text(), **(await _rubric_frame(candidate))}
+
+@app.websocket("/ws/interview/{candidate}")
+async def interview_ws(websocket: WebSocket, candidate: str, last_seq: int = -1):
+    """
+    Persistent channel for a started interview: answers and drafts in, follow-ups, feedback
+    and live rubric out, as JSON frames (protocol in agents/ws_channel.py). Reconnect with
+    ?last_seq=<seq of the last frame seen> to get the frames missed in between.
+    """
+    await CHANNELS.serve(websocket, candidate, last_seq, turn=_ws_turn, draft=_ws_draft, resync=_ws_resync)
+
+@app.post("/rubric")
+@app.post("/rubric/")
+async def rubric(candidate: Optional[str] = Form(None), transcript: Optional[str] = Form(None)):
+    """
+    Live rubric for the recruiter dashboard. With `candidate` it is read from the
+    per-turn accumulator (O(1), safe to poll); a bare `transcript` is scored in one pass.
+    """
+    acc = await RUBRICS.aget(candidate) if candidate else None
+    if acc is None and transcript:
+        acc = RubricAccumulator.from_transcript(transcript)
+    if acc is None:
+        raise HTTPException(status_code=404, detail="No interview in progress for this candidate")
+    return {**acc.dashboard(), "rubric": acc.scores()}
+
+@app.get("/health")
+async def health():
+    """Liveness: no I/O, safe to poll."""
+    return {"ok": True}
+
+@app.get("/diag")
+async def diag():
+    """What this process runs with (StatusBadge.jsx): PDF parsing, LLM mode, whether a key is set."""
+    import importlib.util
+    return {
+        "ok": True,
+        "pypdf_available": importlib.util.find_spec("pypdf") is not None,
+        "openai_key_set": bool(os.getenv("OPENAI_API_KEY")),
+        "mock": MOCK_MODE,
+        "llm_enabled": LLM_ENABLED,
+        "search_enabled": SKILLS_INDEX is not None and SKILLS_INDEX.enabled,
+        "transcripts_enabled": TRANSCRIPTS is not None,
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text format: route/stage histograms, fallbacks, token estimates, store sizes."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/history/stats")
+async def get_history_stats():
+    """Per-session and total memory held by the chat-history store."""
+    return history_stats()
+
+@app.get("/llm_cache/stats")
+async def get_llm_cache_stats():
+    """Hit rate and size of the LLM response cache."""
+    return llm_cache_stats()
+
+@app.get("/llm_latency/stats")
+async def get_llm_latency_stats():
+    """Follow-up turns vs. the latency budget: fallback and hedge rates, p50/p99."""
+    return turn_latency_stats()
+
+@app.get("/candidates/search/stats")
+async def get_search_stats():
+    """Documents in the candidate search index and update/search counters."""
+    return SKILLS_INDEX.stats() if SKILLS_INDEX is not None else {"enabled": False}
+
+@app.get("/transcripts/stats")
+async def get_transcript_stats():
+    """Write-behind transcript queue: pending, written, batches, dropped/failed rows."""
+    return TRANSCRIPTS.stats() if TRANSCRIPTS is not None else {"enabled": False}
+
+@app.get("/prefetch/stats")
+async def get_prefetch_stats():
+    """Draft prefetch outcomes: hits (reused by /answer), stale/cancelled drafts."""
+    return PREFETCH.stats()
+
+@app.get("/ws/stats")
+async def get_ws_stats():
+    """Interview channels: connected clients, resumes/replays, dropped tokens, slow-consumer closes."""
+    return CHANNELS.stats()
+
+@app.get("/answer/stats")
+async def get_answer_stats():
+    """Answer requests run / coalesced onto a running turn / replayed; locks and results held."""
+    return TURNS.stats()
+
+@app.get("/sessions/stats")
+async def get_session_stats():
+    """Size, hit/miss and eviction counters for each session store, and the shared values."""
+    return {"stores": [RESUMES.stats(), JD_CACHE.stats(), RUBRICS.stats(), INTERVIEWS.stats(), history_store_stats()],
+            "shared": shared_stats()}
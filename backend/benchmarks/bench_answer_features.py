@@ -0,0 +1,118 @@
+"""
+Per-answer analysis cost: separate regex scans vs. one AnswerFeatures pass.
+
+The "scans" side reproduces what handle_answer used to do per answer (planner +
+coaching: ~15 searches). Before timing, random answers are checked for parity:
+every signal AnswerFeatures reports must match the individual regexes.
+
+    cd backend && python -m benchmarks.bench_answer_features --words 50 500 5000
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+
+from agents.answer_features import STAR_WORDS, AnswerFeatures
+from agents.interview_agent import (
+    FAILURE_REGEX,
+    has_metric,
+    has_star_piece,
+    mentions_tech,
+    shows_ownership,
+    star_coverage,
+)
+
+FILLER = (
+    "the we a team users service system pipeline because data then after which customers "
+    "platform rollout scope weekly dashboard review tradeoff approach api queue cache"
+).split()
+SIGNALS = (
+    "python Redis kafka I my led Designed outage bug built goal context result impact "
+    "40% 3x 200ms 1.5 million 12 rps $ why Why".split()
+)
+
+
+def random_answer(rng: random.Random, words: int, signal_rate: float) -> str:
+    out = []
+    for _ in range(words):
+        w = rng.choice(SIGNALS) if rng.random() < signal_rate else rng.choice(FILLER)
+        out.append(w + rng.choice(["", "", "", ",", ".", "\n", "-x", "_", "é"]))
+    return " ".join(out)
+
+
+def scans(text: str) -> tuple:
+    """The per-signal regex scans, as one tuple comparable with AnswerFeatures."""
+    return (
+        has_metric(text),
+        mentions_tech(text),
+        shows_ownership(text),
+        bool(FAILURE_REGEX.search(text)),
+        tuple(has_star_piece(text, p) for p in STAR_WORDS),
+        star_coverage(text),
+        text.lower().count("why"),
+    )
+
+
+def features(text: str) -> tuple:
+    f = AnswerFeatures.of(text)
+    return (
+        f.has_metric,
+        f.mentions_tech,
+        f.shows_ownership,
+        f.mentions_failure,
+        tuple(f.has_star_piece(p) for p in STAR_WORDS),
+        f.star_coverage,
+        f.why_count,
+    )
+
+
+def legacy_turn(text: str) -> None:
+    # planner (worst case: walks every rule) + coaching, as before the analyzer existed
+    has_metric(text)
+    for p in ("result", "action", "task", "situation"):
+        has_star_piece(text, p)
+    mentions_tech(text)
+    shows_ownership(text)
+    FAILURE_REGEX.search(text)
+    has_metric(text)
+    star_coverage(text)
+    mentions_tech(text)
+    shows_ownership(text)
+
+
+def _time(fn, corpus: list[str]) -> float:
+    t0 = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    return (time.perf_counter() - t0) / len(corpus)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--words", type=int, nargs="+", default=[50, 500, 5000])
+    ap.add_argument("--answers", type=int, default=200)
+    ap.add_argument("--fuzz", type=int, default=3000)
+    ap.add_argument("--seed", type=int, default=11)
+    args = ap.parse_args()
+    rng = random.Random(args.seed)
+
+    for _ in range(args.fuzz):
+        words = rng.randint(300, 1500) if rng.random() < 0.1 else rng.randint(0, 60)  # long ones cross chunk cuts
+        text = random_answer(rng, words, rng.choice([0.0, 0.002, 0.02, 0.2]))
+        if scans(text) != features(text):
+            raise SystemExit(f"parity mismatch on {text!r}: {scans(text)} != {features(text)}")
+    print(f"parity: {args.fuzz} random answers OK")
+
+    for words in args.words:
+        for rate in (0.0, 0.05):  # 0.0 = no signals: every regex scans the whole answer
+            corpus = [random_answer(rng, words, rate) for _ in range(args.answers)]
+            old = _time(legacy_turn, corpus)
+            new = _time(AnswerFeatures.of, corpus)
+            print(
+                f"words={words:<5} signal_rate={rate:<4} scans={old * 1e6:9.1f}us "
+                f"features={new * 1e6:9.1f}us speedup={old / new:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Offline re-scoring throughput (transcripts/sec): one interview at a time vs. batch.
+
+Fills a fresh database with --interviews interviews of --turns answered turns, then:
+
+- one-by-one: per candidate, SELECT its turns, InterviewAgent.rubric_scores over the
+  rendered transcript + _coaching per answer, and one INSERT transaction per interview
+- batch:      agents/batch_scoring.rescore with each --workers value (writes)
+- dry run:    rescore(dry_run=True) against the rows just written (diff, no writes)
+
+    cd backend && python -m benchmarks.bench_batch_scoring --interviews 20000 --turns 8 --workers 1 2 4
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+_DB = os.path.join(tempfile.mkdtemp(prefix="hiresense-bench-"), "scoring.db")
+os.environ.setdefault("HIRESENSE_DATABASE_URL", f"sqlite:///{_DB}")
+
+from benchmarks.pdfgen import WORDS  # noqa: E402
+
+PHRASES = ["because we needed", "I led", "we measured 35% lower latency", "using Kafka and Postgres",
+           "the incident taught us", "as a result", "my task was", "the situation was"]
+
+
+def populate(interviews: int, turns: int, seed: int = 5) -> int:
+    from sqlalchemy import insert
+    from db.database import engine, ensure_table
+    from db.models import InterviewTranscript
+    ensure_table(InterviewTranscript)
+    rng = random.Random(seed)
+    rows = []
+    for cid in range(1, interviews + 1):
+        for t in range(1, turns + 1):
+            answer = " ".join(rng.choices(WORDS, k=60) + rng.sample(PHRASES, rng.randint(0, 4)))
+            rows.append({"candidate_id": cid, "interview_id": f"bench-{cid:08d}", "turn": t, "question": " ".join(rng.choices(WORDS, k=18)) + "?",
+                         "answer": answer, "feedback": "", "created_at": time.time()})
+    with engine.begin() as conn:
+        for i in range(0, len(rows), 5000):
+            conn.execute(insert(InterviewTranscript.__table__), rows[i:i + 5000])
+    return len(rows)
+
+
+def one_by_one(interviews: int) -> float:
+    from sqlalchemy import delete, insert, select
+    from agents.interview_agent import InterviewAgent
+    from db.database import engine
+    from db.models import InterviewScore, InterviewTranscript as T
+    agent = InterviewAgent()
+    table = InterviewScore.__table__
+    t0 = time.perf_counter()
+    for cid in range(1, interviews + 1):
+        with engine.begin() as conn:
+            iid = f"bench-{cid:08d}"
+            turns = conn.execute(select(T.question, T.answer).where(T.interview_id == iid).order_by(T.turn)).all()
+            transcript = "\n".join(f"Agent: {q}\nCandidate: {a}" for q, a in turns)
+            rubric = agent.rubric_scores(transcript)
+            coaching = [agent._coaching(a) for _, a in turns]
+            conn.execute(delete(table).where(table.c.interview_id == iid))
+            conn.execute(insert(table), {"interview_id": iid, "candidate_id": cid, "turns": len(turns), "overall": rubric["overall"],
+                                         "rubric": json.dumps(rubric), "coaching": json.dumps(coaching),
+                                         "scored_at": time.time()})
+    return time.perf_counter() - t0
+
+
+def batch(dry_run: bool, workers: int) -> dict:
+    from agents.batch_scoring import rescore
+    for ev in rescore(dry_run=dry_run, workers=workers):
+        if ev["event"] == "done":
+            return ev
+    raise RuntimeError("rescore ended without a done event")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--interviews", type=int, default=20000)
+    ap.add_argument("--turns", type=int, default=8)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1])
+    ap.add_argument("--one-by-one", type=int, default=2000, help="interviews for the one-at-a-time baseline")
+    args = ap.parse_args()
+
+    from agents.batch_scoring import ensure_score_table
+    from db.database import engine
+    from db.models import InterviewScore
+
+    n = populate(args.interviews, args.turns)
+    print(f"{args.interviews} interviews, {n} transcripts, {os.cpu_count()} cores")
+    ensure_score_table()
+    k = min(args.one_by_one, args.interviews)
+    elapsed = one_by_one(k)
+    print(f"one-by-one   {k * args.turns / elapsed:10.0f} transcripts/s  ({k} interviews)")
+    for w in sorted(set(args.workers)):
+        with engine.begin() as conn:
+            InterviewScore.__table__.drop(conn, checkfirst=True)
+        ev = batch(False, w)
+        print(f"workers={w:<3}  {ev['transcripts_per_s']:10.0f} transcripts/s  written={ev['written']}")
+    ev = batch(True, max(args.workers))
+    print(f"dry run      {ev['transcripts_per_s']:10.0f} transcripts/s  new={ev['new']} changed={ev['changed']} "
+          f"unchanged={ev['unchanged']} written={ev['written']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Bulk resume ingestion throughput (docs/sec) by worker count, and the cost of a re-run.
+
+Builds a zip of --docs generated resumes (--pdf-share PDFs, the rest plain text), then
+ingests it into a fresh database with each --workers value, and finally re-runs the
+import against the populated database (every document skipped by content hash).
+
+    cd backend && python -m benchmarks.bench_bulk_ingest --docs 2000 --workers 1 2 4 8
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import tempfile
+import zipfile
+
+_TMP = tempfile.mkdtemp(prefix="hiresense-bench-")
+os.environ.setdefault("HIRESENSE_DATABASE_URL", f"sqlite:///{os.path.join(_TMP, 'ingest.db')}")
+
+from benchmarks.pdfgen import WORDS, random_resume_pdf  # noqa: E402
+
+
+def build_zip(path: str, docs: int, pdf_share: float, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(docs):
+            if rng.random() < pdf_share:
+                zf.writestr(f"campus/cand_{i:05d}.pdf", random_resume_pdf(rng, max_pages=2))
+            else:
+                body = f"Skills: {', '.join(rng.sample(WORDS, 8))}\n" + "\n".join(
+                    "- " + " ".join(rng.choices(WORDS, k=10)) for _ in range(30))
+                zf.writestr(f"campus/cand_{i:05d}.txt", body)
+
+
+def run(path: str, workers: int) -> dict:
+    from agents.bulk_ingest import ingest
+    for ev in ingest(path, workers=workers):
+        if ev["event"] == "done":
+            return ev
+    raise RuntimeError("ingest ended without a done event")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--docs", type=int, default=2000)
+    ap.add_argument("--pdf-share", type=float, default=0.5)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = ap.parse_args()
+
+    from db.database import engine
+    from db.models import Candidate
+
+    archive = os.path.join(_TMP, "resumes.zip")
+    build_zip(archive, args.docs, args.pdf_share)
+    print(f"{args.docs} docs, {os.path.getsize(archive) / 1e6:.1f} MB zip, {os.cpu_count()} cores")
+    for w in sorted(set(args.workers)):
+        with engine.begin() as conn:
+            Candidate.__table__.drop(conn, checkfirst=True)
+        ev = run(archive, w)
+        print(f"workers={w:<3} {ev['docs_per_s']:8.1f} docs/s  parsed={ev['parsed']} failed={ev['failed']} "
+              f"written={ev['written']} in {ev['elapsed_s']}s")
+    ev = run(archive, max(args.workers))
+    print(f"re-run       {ev['docs_per_s']:8.1f} docs/s  skipped={ev['skipped']} written={ev['written']} in {ev['elapsed_s']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Per-request framework overhead of the follow-up chain with the LLM stubbed out.
+
+Compares the old per-call composition (prompt | llm + a fresh
+RunnableWithMessageHistory each answer) against the shared FOLLOWUP_CHAIN.
+
+    cd backend && python -m benchmarks.bench_chain_overhead -n 2000
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+
+from langchain_core.runnables.history import RunnableWithMessageHistory
+
+from agents import langchain_chain as lc
+from agents.llm_chains import FOLLOWUP_JSON_PROMPT
+from benchmarks.fake_llm import FakeChatModel
+
+INPUTS = {
+    "role": "Software Engineer",
+    "seniority": "Mid",
+    "tone": "Professional",
+    "candidate_response": "I led the migration to Kafka and cut p99 latency by 40%.",
+}
+
+
+def _rebuilt_per_call(candidate: str):
+    runnable = FOLLOWUP_JSON_PROMPT | lc.llm_json
+    return RunnableWithMessageHistory(
+        runnable=runnable,
+        get_session_history=lambda session_id: lc.get_history(session_id),
+        input_messages_key="candidate_response",
+        history_messages_key="history",
+    )
+
+
+async def _bench(label: str, n: int, call) -> None:
+    for _ in range(min(50, n)):  # warm-up
+        await call()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        await call()
+    us = (time.perf_counter() - t0) / n * 1e6
+    print(f"{label:<28} {us:>10.1f} us/request")
+
+
+async def main_async(n: int) -> None:
+    lc.configure_llms(FakeChatModel(latency_s=0.0), FakeChatModel(latency_s=0.0))
+    cand = "bench"
+    cfg = {"configurable": {"session_id": cand}}
+
+    def seed():
+        lc.reset_history(cand)
+        lc.add_pair_to_history(cand, "", "Walk me through a recent project.")
+
+    seed()
+
+    async def old():
+        # the wrapper writes to history; reset so both variants see the same transcript
+        await _rebuilt_per_call(cand).ainvoke(INPUTS, config=cfg)
+        seed()
+
+    async def new():
+        await lc.FOLLOWUP_CHAIN.ainvoke(INPUTS, config=cfg)
+
+    await _bench("rebuilt per request", n, old)
+    await _bench("shared FOLLOWUP_CHAIN", n, new)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("-n", type=int, default=2000)
+    args = ap.parse_args()
+    asyncio.run(main_async(args.n))
+
+
+if __name__ == "__main__":
+    main()
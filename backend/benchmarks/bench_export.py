@@ -0,0 +1,92 @@
+"""
+Server-side report export: throughput and parent-process memory vs. batch size.
+
+Grows one fresh database through each --interviews size (--turns answered turns each,
+scored once with agents/batch_scoring) and, at every size, streams:
+
+- CSV and NDJSON (agents/report_export.export_csv / export_ndjson)
+- the PDF zip bundle with each --workers value
+
+reporting rows (or PDFs) per second and the peak Python heap of the exporting process
+(tracemalloc). Peaks that stay flat as the size grows mean memory is bounded by the
+chunk size, not the batch (a zip still keeps its central directory, ~0.5 KB per PDF).
+
+    cd backend && python -m benchmarks.bench_export --interviews 1000 5000 --turns 8 --workers 1 4
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+_DB = os.path.join(tempfile.mkdtemp(prefix="hiresense-bench-"), "export.db")
+os.environ.setdefault("HIRESENSE_DATABASE_URL", f"sqlite:///{_DB}")
+
+from benchmarks.bench_batch_scoring import PHRASES  # noqa: E402
+from benchmarks.pdfgen import WORDS  # noqa: E402
+
+
+def grow(start: int, stop: int, turns: int, seed: int = 11) -> None:
+    """Adds candidates start+1..stop with their transcripts."""
+    from sqlalchemy import insert
+    from db.database import engine, ensure_table
+    from db.models import Candidate, InterviewTranscript
+    ensure_table(Candidate)
+    ensure_table(InterviewTranscript)
+    rng = random.Random(seed + start)
+    people, rows = [], []
+    for cid in range(start + 1, stop + 1):
+        people.append({"id": cid, "name": f"Candidate {cid}"})
+        for t in range(1, turns + 1):
+            rows.append({"candidate_id": cid, "interview_id": f"bench-{cid:08d}", "turn": t, "question": " ".join(rng.choices(WORDS, k=18)) + "?",
+                         "answer": " ".join(rng.choices(WORDS, k=60) + rng.sample(PHRASES, rng.randint(0, 4))),
+                         "feedback": "Use STAR and include a concrete metric.", "created_at": time.time()})
+    with engine.begin() as conn:
+        conn.execute(insert(Candidate.__table__), people)
+        for i in range(0, len(rows), 5000):
+            conn.execute(insert(InterviewTranscript.__table__), rows[i:i + 5000])
+
+
+def measure(make) -> tuple:
+    """(seconds, bytes, peak heap MB) for consuming an export generator; traced in a second pass."""
+    t0 = time.perf_counter()
+    size = sum(len(p) for p in make())
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    for _ in make():
+        pass
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--interviews", type=int, nargs="+", default=[1000, 5000])
+    ap.add_argument("--turns", type=int, default=8)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = ap.parse_args()
+
+    from agents.batch_scoring import rescore
+    from agents.report_export import export_bundle, export_csv, export_ndjson
+
+    have = 0
+    print(f"{os.cpu_count()} cores, {args.turns} turns per interview")
+    for n in sorted(set(args.interviews)):
+        grow(have, n, args.turns)
+        have = n
+        for _ in rescore(workers=1):
+            pass
+        rows = n * args.turns
+        for name, gen in (("csv", export_csv), ("ndjson", export_ndjson)):
+            elapsed, size, peak = measure(gen)
+            print(f"n={n:<7} {name:<10} {rows / elapsed:10.0f} rows/s  {size / 1e6:8.1f} MB  peak heap {peak:6.1f} MB")
+        for w in sorted(set(args.workers)):
+            elapsed, size, peak = measure(lambda: export_bundle(workers=w))
+            print(f"n={n:<7} pdf w={w:<4} {n / elapsed:10.0f} PDFs/s  {size / 1e6:8.1f} MB  peak heap {peak:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
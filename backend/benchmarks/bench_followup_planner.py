@@ -0,0 +1,119 @@
+"""
+Rule-based follow-up planning throughput across many concurrent sessions.
+
+--sessions interviews are interleaved turn by turn (as a busy server sees them), each
+answering --turns times with a random mix of signals. Three ways to plan a turn:
+
+- legacy:   the old if-chain over a list of asked topics (reproduced below)
+- compiled: the role pack's flags-indexed rule table over topic bitflags
+- agent:    InterviewAgent.plan_followup end to end (in-memory session store, coaching)
+
+Before timing, the software_engineer pack is checked turn by turn against the legacy
+chain: same questions in the same order.
+
+    cd backend && python -m benchmarks.bench_followup_planner --sessions 10000 --turns 12
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from typing import List
+
+from agents.answer_features import ALL, AnswerFeatures
+
+
+class LegacyState:
+    def __init__(self):
+        self.asked_topics: List[str] = []
+
+    def mark(self, topic: str):
+        if topic not in self.asked_topics:
+            self.asked_topics.append(topic)
+
+
+def legacy_followup(st: LegacyState, f: AnswerFeatures) -> str:
+    asked = set(st.asked_topics)
+    chain = [
+        ("metrics", not f.has_metric), ("star-result", not f.has_star_piece("result")),
+        ("star-action", not f.has_star_piece("action")), ("star-task", not f.has_star_piece("task")),
+        ("star-situation", not f.has_star_piece("situation")), ("tech", not f.mentions_tech),
+        ("ownership", not f.shows_ownership), ("tradeoffs", True), ("failure", not f.mentions_failure),
+        ("quality", True), ("scale", True), ("security", True), ("collab", True),
+    ]
+    for topic, missing in chain:
+        if topic not in asked and missing:
+            st.mark(topic)
+            return topic
+    st.mark("wrap")
+    return "wrap"
+
+
+def workload(sessions: int, turns: int, seed: int = 3) -> List[AnswerFeatures]:
+    rng = random.Random(seed)
+    # each answer shows each signal with probability 1/2
+    return [AnswerFeatures(rng.randint(0, ALL)) for _ in range(sessions * turns)]
+
+
+def check_parity(feats: List[AnswerFeatures], turns: int) -> None:
+    from agents.followup_rules import pack_for_role
+    from agents.interview_agent import SessionState
+    pack = pack_for_role("Software Engineer")
+    for s in range(0, len(feats), turns):
+        old, new = LegacyState(), SessionState()
+        for f in feats[s:s + turns]:
+            rule = pack.pick(f.flags, new.asked)
+            new.mark(rule.topic, rule.bit)
+            assert legacy_followup(old, f) == rule.topic, (old.asked_topics, new.asked_topics)
+
+
+def run_legacy(feats: List[AnswerFeatures], sessions: int) -> float:
+    states = [LegacyState() for _ in range(sessions)]
+    t0 = time.perf_counter()
+    for i, f in enumerate(feats):
+        legacy_followup(states[i % sessions], f)
+    return time.perf_counter() - t0
+
+
+def run_compiled(feats: List[AnswerFeatures], sessions: int) -> float:
+    from agents.followup_rules import pack_for_role
+    from agents.interview_agent import SessionState
+    states = [SessionState() for _ in range(sessions)]
+    t0 = time.perf_counter()
+    for i, f in enumerate(feats):
+        st = states[i % sessions]
+        rule = pack_for_role("Software Engineer").pick(f.flags, st.asked)
+        st.mark(rule.topic, rule.bit)
+    return time.perf_counter() - t0
+
+
+def run_agent(feats: List[AnswerFeatures], sessions: int, role: str) -> float:
+    from agents.interview_agent import InterviewAgent, SessionState
+    from db.session_store import SessionStore
+    agent = InterviewAgent(state=SessionStore("bench_plan", max_items=sessions, factory=SessionState))
+    names = [f"cand-{i}" for i in range(sessions)]
+    t0 = time.perf_counter()
+    for i, f in enumerate(feats):
+        agent.plan_followup(names[i % sessions], "", f, role=role)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sessions", type=int, default=10000)
+    ap.add_argument("--turns", type=int, default=12)
+    args = ap.parse_args()
+
+    feats = workload(args.sessions, args.turns)
+    check_parity(feats, args.turns)
+    n = len(feats)
+    print(f"{args.sessions} sessions x {args.turns} turns = {n} plans (software_engineer pack matches legacy)")
+    for label, fn in [("legacy", lambda: run_legacy(feats, args.sessions)),
+                      ("compiled", lambda: run_compiled(feats, args.sessions)),
+                      ("agent SE", lambda: run_agent(feats, args.sessions, "Software Engineer")),
+                      ("agent DS", lambda: run_agent(feats, args.sessions, "Data Scientist"))]:
+        elapsed = fn()
+        print(f"{label:<10} {n / elapsed:12,.0f} plans/s  {elapsed / n * 1e6:6.2f} us/plan")
+
+
+if __name__ == "__main__":
+    main()
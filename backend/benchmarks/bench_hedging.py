@@ -0,0 +1,73 @@
+"""
+Follow-up latency against a slow-tailed model: no budget vs. budget vs. budget + hedging.
+
+Starts benchmarks/fake_openai_server in a subprocess (real openai client + ChatOpenAI on
+top) and runs --turns follow-up turns, --concurrency at a time. Each mode reports
+p50/p99 turn latency and how many turns fell back to the rule-based planner.
+
+    cd backend && python -m benchmarks.bench_hedging --latency bimodal:0.4,3,0.1 --turns 200
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import tempfile
+
+_DB = os.path.join(tempfile.mkdtemp(prefix="hiresense-bench-"), "hedging.db")
+os.environ.setdefault("HIRESENSE_DATABASE_URL", f"sqlite:///{_DB}")
+os.environ["HIRESENSE_LLM_CACHE"] = "off"  # every turn must reach the model
+
+from benchmarks import fake_openai_server  # noqa: E402
+
+
+async def turns(n: int, concurrency: int, tag: str) -> None:
+    from agents import langchain_chain as lc
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with sem:
+            await lc.abuild_followup_and_feedback(
+                candidate=f"{tag}-{i}", role="Backend Engineer", seniority="Senior", tone="Professional",
+                candidate_response=f"I led the Kafka migration ({i}); p99 dropped by 40%.",
+            )
+
+    await asyncio.gather(*[one(i) for i in range(n)])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--latency", default="bimodal:0.4,3,0.1", help="fake server latency spec")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--turns", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--budget", type=float, default=1.5)
+    args = ap.parse_args()
+
+    base_url, proc = fake_openai_server.spawn(args.latency, args.error_rate)
+    try:
+        os.environ["OPENAI_API_KEY"] = "sk-fake"
+        os.environ["OPENAI_BASE_URL"] = base_url
+        from agents import hedging
+        from agents import langchain_chain as lc
+
+        modes = [
+            ("no budget", lc.LLM_TIMEOUT_S, 0.0),
+            (f"budget {args.budget}s", args.budget, 0.0),
+            (f"budget {args.budget}s + hedge", args.budget, None),  # adaptive hedge delay
+        ]
+        print(f"latency={args.latency} turns={args.turns} concurrency={args.concurrency}")
+        for label, budget, hedge_after in modes:
+            lc.TURN_BUDGET_S, hedging.HEDGE_AFTER_S = budget, hedge_after
+            lc.TURN_STATS = hedging.TurnStats()
+            asyncio.run(turns(args.turns, args.concurrency, label))
+            s = lc.TURN_STATS.stats()
+            print(f"{label:<24} p50={s['p50_ms']:7.1f}ms p99={s['p99_ms']:7.1f}ms "
+                  f"fallback_rate={s['fallback_rate']:.3f} hedged={s['hedged']} hedge_won={s['hedge_won']}")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Opening-question latency on a bulk screening day, with and without the LLM cache.
+
+Simulates --reqs requisitions x --candidates candidates (each with its own resume)
+calling abuild_first_question against a fake model of --latency seconds, in three
+modes: no cache, cache (resume-specific prompts), cache + HIRESENSE_SHARED_OPENERS.
+A second pass ("restart") drops the memory tier to show the SQLite tier.
+
+    cd backend && python -m benchmarks.bench_llm_cache --reqs 5 --candidates 40 --latency 0.3
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_DB = os.path.join(tempfile.mkdtemp(prefix="hiresense-bench-"), "cache.db")
+os.environ.setdefault("HIRESENSE_DATABASE_URL", f"sqlite:///{_DB}")
+
+from benchmarks import fake_llm  # noqa: E402
+
+
+async def screening_day(reqs: int, candidates: int, concurrency: int) -> list[float]:
+    from agents import langchain_chain as lc
+
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def opener(r: int, c: int):
+        async with sem:
+            t0 = time.perf_counter()
+            await lc.abuild_first_question(
+                role=f"Backend Engineer #{r}", seniority="Senior", tone="Professional",
+                resume_text=f"Candidate {r}-{c}\nSkills: python, kafka, postgres\n- Built service {c}",
+                jd_text=f"Requisition {r}: own our event pipeline; Python, Kafka, Postgres.",
+            )
+            latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*[opener(r, c) for r in range(reqs) for c in range(candidates)])
+    return latencies
+
+
+def _report(label: str, lat: list[float], cache) -> None:
+    lat = sorted(lat)
+    stats = cache.stats() if cache is not None else {}
+    print(
+        f"{label:<28} p50={statistics.median(lat) * 1000:7.1f}ms p99={lat[int(0.99 * (len(lat) - 1))] * 1000:7.1f}ms "
+        f"hit_rate={stats.get('hit_rate', 0.0):.2f} (mem={stats.get('memory_hits', 0)} disk={stats.get('disk_hits', 0)} "
+        f"coalesced={stats.get('coalesced', 0)})"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--reqs", type=int, default=5)
+    ap.add_argument("--candidates", type=int, default=40)
+    ap.add_argument("--latency", type=float, default=0.3)
+    ap.add_argument("--concurrency", type=int, default=16)
+    args = ap.parse_args()
+
+    from agents import langchain_chain as lc
+    from agents.llm_cache import LLMResponseCache
+
+    fake_llm.install(latency_s=args.latency)
+
+    def run(label: str, cache) -> None:
+        lc.LLM_CACHE = cache
+        _report(label, asyncio.run(screening_day(args.reqs, args.candidates, args.concurrency)), cache)
+
+    run("no cache", None)
+    run("cache, per-resume prompts", LLMResponseCache())
+    lc.SHARED_OPENERS = True
+    run("cache, shared openers", LLMResponseCache())
+    run("shared openers, restart", LLMResponseCache())  # new process: cold memory tier, warm SQLite tier
+
+
+if __name__ == "__main__":
+    main()
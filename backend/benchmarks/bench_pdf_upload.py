@@ -0,0 +1,79 @@
+"""
+Upload latency under concurrent PDF uploads.
+
+Generates a corpus of 1-10 page PDFs (a share of them re-uploaded, to exercise
+the content-hash cache) and posts them to /upload_resume concurrently,
+reporting p50/p99 latency, uploads/sec and the server process's peak RSS.
+
+    cd backend && python -m benchmarks.bench_pdf_upload --docs 200 --concurrency 16
+    HIRESENSE_PDF_WORKERS=0 python -m benchmarks.bench_pdf_upload   # in-process baseline
+    HIRESENSE_UPLOAD_SPOOL_BYTES=0 python -m benchmarks.bench_pdf_upload   # every upload via a temp file
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import random
+import resource
+import statistics
+import time
+
+import httpx
+
+from benchmarks.pdfgen import random_resume_pdf
+
+
+def _pct(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def run(docs: list[bytes], concurrency: int) -> list[float]:
+    from app import app
+    from agents.pdf_extract import shutdown
+
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def upload(i: int, data: bytes):
+            async with sem:
+                t0 = time.perf_counter()
+                r = await client.post(
+                    "/upload_resume",
+                    data={"candidate": f"cand-{i}"},
+                    files={"file": (f"resume-{i}.pdf", data, "application/pdf")},
+                )
+                r.raise_for_status()
+                latencies.append(time.perf_counter() - t0)
+
+        await asyncio.gather(*[upload(i, d) for i, d in enumerate(docs)])
+    shutdown()
+    return latencies
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--docs", type=int, default=200)
+    ap.add_argument("--dup-frac", type=float, default=0.3, help="share of uploads that repeat an earlier file")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    unique = [random_resume_pdf(rng) for _ in range(int(args.docs * (1 - args.dup_frac)) or 1)]
+    docs = unique + [rng.choice(unique) for _ in range(args.docs - len(unique))]
+    rng.shuffle(docs)
+
+    t0 = time.perf_counter()
+    lat = asyncio.run(run(docs, args.concurrency))
+    wall = time.perf_counter() - t0
+
+    from agents.pdf_extract import STATS
+    print(f"uploads={len(lat)} concurrency={args.concurrency} wall={wall:.2f}s ({len(lat) / wall:.1f}/s)")
+    print(f"p50={_pct(lat, 50) * 1000:.1f}ms p99={_pct(lat, 99) * 1000:.1f}ms mean={statistics.mean(lat) * 1000:.1f}ms")
+    print(f"cache: {STATS}")
+    print(f"peak_rss={resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
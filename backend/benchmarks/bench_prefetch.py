@@ -0,0 +1,74 @@
+"""
+Perceived /answer latency with and without draft prefetch.
+
+Each simulated candidate pauses mid-answer (the composer posts /answer/draft), keeps
+typing for --typing seconds, then sends the final answer (the draft plus a short tail).
+A third pass rewrites the answer after the draft, so the prefetch is stale and dropped.
+
+    cd backend && python -m benchmarks.bench_prefetch --candidates 50 --latency 0.8 --typing 0.5
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+_DB = os.path.join(tempfile.mkdtemp(prefix="hiresense-bench-"), "prefetch.db")
+os.environ.setdefault("HIRESENSE_DATABASE_URL", f"sqlite:///{_DB}")
+os.environ.setdefault("HIRESENSE_LLM_CACHE", "off")  # measure the prefetch, not the response cache
+
+from benchmarks import fake_llm  # noqa: E402
+
+DRAFT = ("I led the migration of our billing service to Kafka; I owned the rollout plan "
+         "and we cut p99 latency by 40%")
+
+
+async def run(mode: str, candidates: int, typing_s: float) -> list[float]:
+    import httpx
+    import app as server
+    from agents.prefetch import Prefetcher
+
+    server.PREFETCH = Prefetcher()  # fresh counters per pass
+    app = server.app
+
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one(i: int):
+            cand = f"{mode}-{i}"
+            final = DRAFT + " across 3 regions."
+            if mode != "none":
+                await client.post("/answer/draft", data={"candidate": cand, "draft": DRAFT})
+            if mode == "stale":
+                final = "Actually, let me talk about a different project: our search relevance rewrite."
+            await asyncio.sleep(typing_s)
+            t0 = time.perf_counter()
+            r = await client.post("/answer", data={"candidate": cand, "response": final})
+            r.raise_for_status()
+            latencies.append(time.perf_counter() - t0)
+
+        await asyncio.gather(*[one(i) for i in range(candidates)])
+        stats = (await client.get("/prefetch/stats")).json()
+    print(f"{mode:<8} p50={statistics.median(latencies) * 1000:7.1f}ms "
+          f"max={max(latencies) * 1000:7.1f}ms hits={stats['hits']} stale={stats['stale']} "
+          f"misses={stats['misses']} cancelled={stats['cancelled']}")
+    return latencies
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--candidates", type=int, default=50)
+    ap.add_argument("--latency", type=float, default=0.8)
+    ap.add_argument("--typing", type=float, default=0.5, help="seconds between the draft and the final answer")
+    args = ap.parse_args()
+
+    fake_llm.install(latency_s=args.latency)
+    for mode in ("none", "draft", "stale"):
+        asyncio.run(run(mode, args.candidates, args.typing))
+
+
+if __name__ == "__main__":
+    main()
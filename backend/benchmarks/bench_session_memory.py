@@ -0,0 +1,141 @@
+"""
+Bytes per active interview session, old layout vs. compact layout.
+
+One session = what the API keeps for a live interview: the uploaded resume text, the
+JD config, the planner state (parsed resume, JD, asked topics) and a chat history after
+--turns exchanges. Candidates upload one of --resume-pool distinct resumes (people
+interviewing for several roles, re-uploads) and apply to one of --requisitions JDs.
+Every session gets freshly built strings and dicts, as a real upload/parse would.
+
+- legacy:  per-session dicts and strings, message objects in a list, topic names in a list
+- compact: agents/session_layout.py (shared-by-hash resume/JD, interned labels,
+           JobConfig) + SessionState slots/bitflags + BoundedChatHistory's TextLog
+
+Each (layout, sessions) point runs in a fresh process and reports traced Python heap.
+
+    cd backend && python -m benchmarks.bench_session_memory --sessions 10000 50000
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks.pdfgen import WORDS
+
+ROLES = ["Software Engineer", "Data Scientist", "Product Manager", "Product Designer"]
+
+
+def make_text(rng: random.Random, kb: float, header: str = "") -> str:
+    lines = [header] if header else []
+    while sum(len(x) + 1 for x in lines) < kb * 1024:
+        lines.append("- " + " ".join(rng.choices(WORDS, k=rng.randint(8, 16))))
+    return "\n".join(lines)
+
+
+def fresh(s: str) -> str:
+    return s.encode().decode()  # a new object with the same content, like a new upload
+
+
+class LegacyPlannerState:
+    def __init__(self):
+        self.turn = 0
+        self.asked_topics = []
+        self.resume = {}
+        self.jd = {}
+
+
+class LegacyHistory:
+    def __init__(self):
+        self.recent = []
+        self.summary_lines = []
+
+
+def build(layout: str, sessions: int, turns: int, resume_pool: int, requisitions: int, resume_kb: float) -> list:
+    from langchain_core.messages import AIMessage, HumanMessage
+    from agents.history import BoundedChatHistory, _COMPACTOR, _summary_line
+    from agents.interview_agent import SessionState
+    from agents.resume_parser import parse_resume
+    from agents.session_layout import JobConfig, share
+
+    rng = random.Random(1)
+    resumes = [make_text(rng, resume_kb, f"Skills: {', '.join(rng.sample(WORDS, 8))}") for _ in range(resume_pool)]
+    jds = [(ROLES[i % len(ROLES)], make_text(rng, 3)) for i in range(requisitions)]
+    answers = [" ".join(rng.choices(WORDS, k=80)) for _ in range(50)]
+    questions = [" ".join(rng.choices(WORDS, k=25)) + "?" for _ in range(50)]
+    topics = ["opener", "metrics", "star-result", "tech", "ownership", "tradeoffs", "failure", "quality", "scale"]
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    out = []
+    for i in range(sessions):
+        resume_text = fresh(resumes[i % resume_pool])
+        role, jd_text = jds[i % requisitions]
+        parsed = parse_resume(resume_text)
+        jd = {"role": fresh(role), "seniority": fresh("Mid"), "tone": fresh("Professional"),
+              "focus": [], "description": fresh(jd_text)}
+        if layout == "legacy":
+            st = LegacyPlannerState()
+            st.resume, st.jd = parsed, jd
+            hist = LegacyHistory()
+            for t in range(turns):
+                for msg in (AIMessage(content=fresh(questions[(i + t) % 50])), HumanMessage(content=fresh(answers[(i + t) % 50]))):
+                    hist.recent.append(msg)
+                    if len(hist.recent) > 8:
+                        hist.summary_lines.append(_summary_line(1 if msg.type == "ai" else 0, hist.recent.pop(0).content))
+                st.asked_topics.append(topics[t % len(topics)])
+            out.append((resume_text, jd, st, hist))
+        else:
+            st = SessionState()
+            st.resume, st.jd = parsed, jd
+            hist = BoundedChatHistory()
+            for t in range(turns):
+                hist.add_ai_message(fresh(questions[(i + t) % 50]))
+                hist.add_user_message(fresh(answers[(i + t) % 50]))
+                st.mark(topics[t % len(topics)])
+            out.append((share(resume_text), JobConfig(**jd), st, hist))
+    _COMPACTOR.submit(lambda: None).result()  # background folds done
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return [used, out]
+
+
+def child(args) -> None:
+    t0 = time.perf_counter()
+    used, _ = build(args.layout, args.n, args.turns, args.resume_pool, args.requisitions, args.resume_kb)
+    print(json.dumps({"bytes": used, "elapsed_s": time.perf_counter() - t0}))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sessions", type=int, nargs="+", default=[10000, 50000])
+    ap.add_argument("--turns", type=int, default=8)
+    ap.add_argument("--resume-pool", type=int, default=2000)
+    ap.add_argument("--requisitions", type=int, default=40)
+    ap.add_argument("--resume-kb", type=float, default=6.0)
+    ap.add_argument("--layout", choices=["legacy", "compact"], help=argparse.SUPPRESS)
+    ap.add_argument("--n", type=int, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.layout:
+        return child(args)
+
+    print(f"{args.turns} turns/session, {args.resume_pool} distinct resumes of {args.resume_kb:g} KB, "
+          f"{args.requisitions} requisitions")
+    for n in args.sessions:
+        row = {}
+        for layout in ("legacy", "compact"):
+            res = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_session_memory", "--layout", layout, "--n", str(n),
+                 "--turns", str(args.turns), "--resume-pool", str(args.resume_pool),
+                 "--requisitions", str(args.requisitions), "--resume-kb", str(args.resume_kb)],
+                check=True, capture_output=True, text=True)
+            row[layout] = json.loads(res.stdout.strip().splitlines()[-1])["bytes"] / n
+        print(f"{n:>7} sessions  legacy {row['legacy']:9,.0f} B/session  compact {row['compact']:9,.0f} B/session  "
+              f"({row['legacy'] / row['compact']:.1f}x smaller, {n * row['compact'] / 1e6:.0f} MB total)")
+
+
+if __name__ == "__main__":
+    main()
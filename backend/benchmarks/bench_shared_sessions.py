@@ -0,0 +1,92 @@
+"""
+Throughput of the shared session backend from 1 to N worker processes.
+
+Each worker owns its own candidates and runs interview-like cycles against a
+shared SessionStore: 3 reads (version-validated) + 1 optimistic read-modify-write.
+A fraction of the candidates can be shared between workers to exercise conflicts.
+
+    cd backend && python -m benchmarks.bench_shared_sessions --backend sqlite --workers 1 2 4 8
+"""
+from __future__ import annotations
+import argparse
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+
+def _worker(worker_id: int, backend: str, ops: int, candidates: int, shared_frac: float, db_url: str, q) -> None:
+    try:
+        _run_worker(worker_id, backend, ops, candidates, shared_frac, db_url, q)
+    except BaseException as e:
+        q.put(e)
+        raise
+
+
+def _run_worker(worker_id: int, backend: str, ops: int, candidates: int, shared_frac: float, db_url: str, q) -> None:
+    os.environ["HIRESENSE_DATABASE_URL"] = db_url
+    from db.session_store import SessionStore, make_backend
+
+    store = SessionStore("bench", backend=make_backend(backend), shared=True, factory=dict)
+    n_shared = int(candidates * shared_frac)
+    names = [f"w{worker_id}-c{i}" for i in range(candidates - n_shared)] + [f"shared-c{i}" for i in range(n_shared)]
+
+    def bump(d):
+        d["turn"] = d.get("turn", 0) + 1
+        d.setdefault("answers", []).append("I reduced p99 latency by 35% by moving to Kafka.")
+        del d["answers"][:-8]
+
+    t0 = time.perf_counter()
+    for i in range(ops):
+        key = names[i % len(names)]
+        for _ in range(3):
+            store.get(key)
+        store.update(key, bump, retries=50)
+    q.put((time.perf_counter() - t0, ops, store.counters["conflicts"]))
+
+
+def run(workers: int, backend: str, ops: int, candidates: int, shared_frac: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{tmp}/bench.db"
+        ctx = mp.get_context("spawn")
+        q = ctx.Queue()
+        procs = [ctx.Process(target=_worker, args=(w, backend, ops, candidates, shared_frac, db_url, q))
+                 for w in range(workers)]
+        t0 = time.perf_counter()
+        for p in procs:
+            p.start()
+        results = [q.get() for _ in procs]
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise RuntimeError(f"{len(errors)} worker(s) failed") from errors[0]
+        for p in procs:
+            p.join()
+        wall = time.perf_counter() - t0
+    total_ops = sum(r[1] for r in results)
+    return {
+        "workers": workers,
+        "turns_per_s": total_ops / max(r[0] for r in results),
+        "wall_s": wall,
+        "conflicts": sum(r[2] for r in results),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--backend", choices=["sqlite", "redis"], default="sqlite")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--ops", type=int, default=2000, help="turns per worker")
+    ap.add_argument("--candidates", type=int, default=50, help="candidates per worker")
+    ap.add_argument("--shared-frac", type=float, default=0.0, help="fraction of candidates shared by all workers")
+    args = ap.parse_args()
+
+    base = None
+    print(f"{'workers':>7} {'turns/s':>10} {'scaling':>8} {'conflicts':>9}")
+    for w in args.workers:
+        r = run(w, args.backend, args.ops, args.candidates, args.shared_frac)
+        base = base or r["turns_per_s"]
+        print(f"{w:>7} {r['turns_per_s']:>10.0f} {r['turns_per_s'] / base:>7.2f}x {r['conflicts']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Candidate search latency over a large resume corpus.
+
+Fills a fresh database with --resumes synthetic resumes (a skills line drawn with a skewed
+distribution, so "python" is common and "sagemaker" rare, plus experience bullets that
+mention the candidate's own skills a varying number of times), then runs --queries
+searches per query shape and reports p50/p99. Skill-only queries take the impact-ordered
+postings path; the prefix and free-text shapes take the FTS5 bm25() path.
+
+    cd backend && python -m benchmarks.bench_skills_search --resumes 100000
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+_DB = os.path.join(tempfile.mkdtemp(prefix="hiresense-bench-"), "search.db")
+os.environ.setdefault("HIRESENSE_DATABASE_URL", f"sqlite:///{_DB}")
+
+from benchmarks.pdfgen import WORDS  # noqa: E402
+
+
+def populate(n: int, batch: int = 5000, seed: int = 11) -> float:
+    from sqlalchemy import insert, select
+    from agents.answer_features import TECH_WORDS
+    from agents.skills_index import get_skills_index
+    from db.database import engine
+    from db.models import Candidate
+
+    rng = random.Random(seed)
+    tech = list(TECH_WORDS)
+    filler = [w for w in WORDS if w not in TECH_WORDS]  # technologies only where a skill is mentioned
+    weights = [1.0 / (i + 1) for i in range(len(tech))]  # "python" common, "sagemaker" rare
+    index = get_skills_index()
+    t0 = time.perf_counter()
+    for start in range(0, n, batch):
+        rows = []
+        for i in range(start, min(n, start + batch)):
+            skills = sorted(set(rng.choices(tech, weights, k=6)))
+            body = f"Skills: {', '.join(skills)}\n" + "\n".join(
+                "- " + " ".join(rng.choices(filler, k=10) + rng.sample(skills, min(len(skills), rng.randint(0, 2))))
+                for _ in range(rng.randint(6, 20)))
+            rows.append({"name": f"Candidate {i:06d}", "resume_text": body, "skills": json.dumps(skills),
+                         "source": "bench", "content_hash": f"bench-{i}"})
+        with engine.begin() as conn:
+            conn.execute(insert(Candidate.__table__), rows)
+            ids = dict(conn.execute(select(Candidate.content_hash, Candidate.id)
+                                    .where(Candidate.content_hash.in_([r["content_hash"] for r in rows]))).all())
+            index.index_rows(conn, [(ids[r["content_hash"]], json.loads(r["skills"]), r["resume_text"])
+                                    for r in rows])
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--resumes", type=int, default=100000)
+    ap.add_argument("--queries", type=int, default=300)
+    args = ap.parse_args()
+
+    from agents.answer_features import TECH_WORDS
+    from agents.skills_index import get_skills_index
+
+    elapsed = populate(args.resumes)
+    index = get_skills_index()
+    print(index.stats())
+    print(f"indexed {args.resumes} resumes in {elapsed:.1f}s ({args.resumes / elapsed:.0f}/s), "
+          f"db {os.path.getsize(_DB) / 1e6:.0f} MB")
+    rng = random.Random(5)
+    tech = list(TECH_WORDS)
+    shapes = {
+        "1 common term": lambda: tech[0],
+        "1 rare term": lambda: rng.choice(tech[-10:]),
+        "2 terms AND": lambda: " ".join(rng.sample(tech[:12], 2)),
+        "3 terms AND": lambda: " ".join(rng.sample(tech[:12], 3)),
+        "3 terms ANY": lambda: " ".join(rng.sample(tech, 3)),
+        "prefix kube*": lambda: "kube*",
+        "free-text word": lambda: rng.choice(["migrated", "stakeholders", "incident", "revenue"]),
+    }
+    for label, make in shapes.items():
+        lat, hits = [], 0
+        for _ in range(args.queries // len(shapes)):
+            t0 = time.perf_counter()
+            res = index.search(make(), limit=20, match_all="ANY" not in label)
+            lat.append(time.perf_counter() - t0)
+            hits += len(res["results"])
+        lat.sort()
+        print(f"{label:<16} path={res['path']:<8} p50={statistics.median(lat) * 1000:7.2f}ms p99={lat[int(0.99 * (len(lat) - 1))] * 1000:7.2f}ms "
+              f"avg_hits={hits / len(lat):.1f}")
+
+
+if __name__ == "__main__":
+    main()
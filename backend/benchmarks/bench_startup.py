@@ -0,0 +1,92 @@
+"""
+API cold-start cost: `import app` under `python -X importtime`, in fresh processes.
+
+Two configurations:
+- mock: HIRESENSE_MOCK=1 — must not import the LLM stack at all
+- key:  a (fake) OPENAI_API_KEY — the LLM stack still loads only on the first call
+
+Reports the median cumulative import time of `app` over --runs, and the slowest
+top-level packages of the median run. Exits non-zero if a heavy module shows up in mock
+mode or if the mock-mode median exceeds --max-ms (a regression gate for CI).
+
+    cd backend && python -m benchmarks.bench_startup --runs 7 --max-ms 1500
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Loaded on the first LLM call only (agents/llm_chains.py, agents/openai_clients.py)
+HEAVY = ["openai", "langchain", "langchain_openai", "langchain_core", "langchain_community", "tiktoken"]
+
+CONFIGS = {
+    "mock": {"HIRESENSE_MOCK": "1"},
+    "key": {"HIRESENSE_MOCK": "0", "OPENAI_API_KEY": "sk-startup-bench"},
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) per line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cum_us)))
+    return rows
+
+
+def run_once(env_overrides: Dict[str, str]) -> List[Tuple[str, int, int]]:
+    env = {**os.environ, **env_overrides}
+    if env_overrides.get("HIRESENSE_MOCK") == "1":
+        env.pop("OPENAI_API_KEY", None)
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                         env=env, capture_output=True, text=True, check=True)
+    return parse_importtime(res.stderr)
+
+
+def app_ms(rows: List[Tuple[str, int, int]]) -> float:
+    return next(cum for name, _, cum in rows if name == "app") / 1000
+
+
+def top_packages(rows: List[Tuple[str, int, int]], n: int) -> List[Tuple[str, float]]:
+    by_pkg: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_pkg[name.split(".")[0]] += self_us
+    return sorted(((pkg, us / 1000) for pkg, us in by_pkg.items()), key=lambda x: -x[1])[:n]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--runs", type=int, default=7)
+    ap.add_argument("--top", type=int, default=8)
+    ap.add_argument("--max-ms", type=float, default=None, help="fail if the mock-mode median is slower")
+    args = ap.parse_args()
+
+    failed = False
+    for config, overrides in CONFIGS.items():
+        runs = [run_once(overrides) for _ in range(args.runs)]
+        times = [app_ms(r) for r in runs]
+        median = statistics.median(times)
+        rows = runs[times.index(sorted(times)[len(times) // 2])]
+        loaded = {name.split(".")[0] for name, _, _ in rows} | {name for name, _, _ in rows}
+        heavy = [m for m in HEAVY if m in loaded]
+        print(f"{config:<5} import app  median {median:7.1f} ms  min {min(times):7.1f} ms  "
+              f"max {max(times):7.1f} ms  ({args.runs} runs)")
+        print("      heavy modules: " + (", ".join(heavy) or "none"))
+        print("      top packages (self ms): " + ", ".join(f"{p} {ms:.0f}" for p, ms in top_packages(rows, args.top)))
+        if heavy:
+            print(f"FAIL: {config} mode imported {', '.join(heavy)}")
+            failed = True
+        if config == "mock" and args.max_ms is not None and median > args.max_ms:
+            print(f"FAIL: mock-mode startup {median:.1f} ms > --max-ms {args.max_ms:g}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Sustained transcript persistence: write-behind batches vs. a commit per turn.
+
+Feeds --turns turns from --candidates interviews into (a) one ORM add+commit per turn,
+the obvious synchronous approach, and (b) TranscriptWriter (queue → executemany batches).
+Reports turns/sec to durable storage and the cost the request path pays per turn.
+
+    cd backend && python -m benchmarks.bench_transcripts --turns 20000 --candidates 200
+"""
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import time
+
+_DB = os.path.join(tempfile.mkdtemp(prefix="hiresense-bench-"), "transcripts.db")
+os.environ.setdefault("HIRESENSE_DATABASE_URL", f"sqlite:///{_DB}")
+
+ANSWER = "I led the migration of our billing service to Kafka and cut p99 latency by 40% across 3 regions. " * 3
+QUESTION = "What trade-offs did you weigh, and how did you measure the impact?"
+FEEDBACK = "Quantify the result and name the alternatives you rejected."
+
+
+def per_turn_commit(turns: int, candidates: int) -> tuple[float, float]:
+    from db.database import SessionLocal, ensure_table
+    from db.models import Candidate, InterviewTranscript
+    ensure_table(Candidate)
+    ensure_table(InterviewTranscript)
+    with SessionLocal() as db:
+        ids = []
+        for c in range(candidates):
+            row = Candidate(name=f"sync-{c}")
+            db.add(row)
+            db.flush()
+            ids.append(row.id)
+        db.commit()
+    t0 = time.perf_counter()
+    for i in range(turns):
+        with SessionLocal() as db:
+            db.add(InterviewTranscript(candidate_id=ids[i % candidates], turn=i // candidates + 1,
+                                       question=QUESTION, answer=ANSWER, feedback=FEEDBACK, created_at=time.time()))
+            db.commit()
+    elapsed = time.perf_counter() - t0
+    return turns / elapsed, elapsed / turns
+
+
+def write_behind(turns: int, candidates: int) -> tuple[float, float, dict]:
+    from db.transcripts import TranscriptWriter
+    w = TranscriptWriter()
+    t0 = time.perf_counter()
+    for i in range(turns):
+        w.record(f"wb-{i % candidates}", i // candidates + 1, QUESTION, ANSWER, FEEDBACK,
+                 interview_id=f"wb-{i % candidates}")
+    enqueue = (time.perf_counter() - t0) / turns
+    w.flush()
+    elapsed = time.perf_counter() - t0
+    w.close()
+    return turns / elapsed, enqueue, w.stats()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--turns", type=int, default=20000)
+    ap.add_argument("--candidates", type=int, default=200)
+    ap.add_argument("--sync-turns", type=int, default=2000, help="turns for the (slow) per-turn commit baseline")
+    args = ap.parse_args()
+
+    tps, per = per_turn_commit(args.sync_turns, args.candidates)
+    print(f"{'commit per turn':<16} {tps:9.0f} turns/s   request path pays {per * 1e6:8.1f}us/turn")
+    tps, per, stats = write_behind(args.turns, args.candidates)
+    print(f"{'write-behind':<16} {tps:9.0f} turns/s   request path pays {per * 1e6:8.1f}us/turn "
+          f"({stats['batches']} batches, {stats['written']} written, {stats['dropped']} dropped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+In-process fake chat model for benchmarks: no network, configurable latency.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import random
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+FOLLOWUP_JSON = json.dumps({
+    "followup": "What trade-offs did you weigh, and how did you measure the impact?",
+    "feedback": "Quantify the result and name the alternatives you rejected.",
+})
+
+
+class FakeChatModel(BaseChatModel):
+    """Returns a canned reply after `latency_s` (± `jitter_s`)."""
+    latency_s: float = 0.5
+    jitter_s: float = 0.0
+    reply: str = FOLLOWUP_JSON
+
+    @property
+    def _llm_type(self) -> str:
+        return "hiresense-fake"
+
+    def _delay(self) -> float:
+        return max(0.0, self.latency_s + random.uniform(-self.jitter_s, self.jitter_s))
+
+    def _result(self) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self._delay())
+        return self._result()
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self._delay())
+        return self._result()
+
+
+def install(latency_s: float = 0.5, jitter_s: float = 0.0) -> None:
+    """Swap the module-level LLMs in agents.langchain_chain for fakes."""
+    from agents import langchain_chain as lc
+    lc.configure_llms(
+        FakeChatModel(latency_s=latency_s, jitter_s=jitter_s),
+        FakeChatModel(latency_s=latency_s, jitter_s=jitter_s,
+                      reply="Walk me through the hardest scaling problem you solved."),
+    )
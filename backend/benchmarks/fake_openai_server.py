@@ -0,0 +1,139 @@
+"""
+Local OpenAI-compatible server for latency experiments: POST /v1/chat/completions
+(plain and stream=true) with replies drawn from a configurable latency distribution
+and, optionally, a generation speed (--tokens-per-s, ~4 characters per token).
+Unlike fake_llm (an in-process model), this exercises the real client stack: the
+openai SDK, the pooled httpx client, ChatOpenAI and the budget/hedging layer.
+
+    cd backend && python -m benchmarks.fake_openai_server --port 8765 --latency bimodal:0.4,3,0.1 --tokens-per-s 60
+    OPENAI_API_KEY=sk-fake OPENAI_BASE_URL=http://127.0.0.1:8765/v1 uvicorn app:app
+
+Latency specs (seconds; for streams this is the time to first token):
+    fixed:S | uniform:A,B | lognormal:MEDIAN,SIGMA | bimodal:FAST,SLOW,P_SLOW
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from typing import Callable
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from benchmarks.fake_llm import FOLLOWUP_JSON
+
+OPENER = "Walk me through the hardest scaling problem you solved."
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    kind, _, args = spec.partition(":")
+    a = [float(x) for x in args.split(",") if x]
+    if kind == "fixed":
+        return lambda: a[0]
+    if kind == "uniform":
+        return lambda: random.uniform(a[0], a[1])
+    if kind == "lognormal":
+        return lambda: random.lognormvariate(math.log(a[0]), a[1])
+    if kind == "bimodal":
+        return lambda: a[1] if random.random() < a[2] else a[0]
+    raise ValueError(f"unknown latency spec: {spec}")
+
+
+def make_app(latency: str, error_rate: float = 0.0, tokens_per_s: float = 0.0) -> FastAPI:
+    sample = parse_latency(latency)
+    chunk_s = (8 / 4) / tokens_per_s if tokens_per_s > 0 else 0.002  # 8-character chunks
+    app = FastAPI(title="fake-openai")
+    app.state.requests = 0
+
+    def reply_for(messages: list) -> str:
+        system = " ".join(m.get("content") or "" for m in messages if m.get("role") == "system")
+        return FOLLOWUP_JSON if "JSON" in system else OPENER
+
+    @app.post("/v1/chat/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        await asyncio.sleep(max(0.0, sample()))
+        if random.random() < error_rate:
+            return JSONResponse({"error": {"message": "injected failure", "type": "server_error"}}, status_code=500)
+        content = reply_for(body.get("messages") or [])
+        cid, created, model = f"chatcmpl-{uuid.uuid4().hex[:12]}", int(time.time()), body.get("model", "fake")
+        if not body.get("stream"):
+            if tokens_per_s > 0:
+                await asyncio.sleep(len(content) / 4 / tokens_per_s)
+            return {
+                "id": cid, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }
+
+        async def events():
+            for i in range(0, len(content), 8):
+                chunk = {"id": cid, "object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [{"index": 0, "delta": {"content": content[i:i + 8]}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(chunk_s)
+            last = {"id": cid, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            yield f"data: {json.dumps(last)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": app.state.requests}
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn(latency: str, error_rate: float = 0.0, port: int = 0,
+          tokens_per_s: float = 0.0) -> tuple[str, subprocess.Popen]:
+    """Start the server in a subprocess; returns (base_url for OPENAI_BASE_URL, process)."""
+    port = port or _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_openai_server", "--port", str(port),
+         "--latency", latency, "--error-rate", str(error_rate), "--tokens-per-s", str(tokens_per_s)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return f"http://127.0.0.1:{port}/v1", proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("fake OpenAI server did not start")
+
+
+def main():
+    import uvicorn
+
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", default="fixed:0.5")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--tokens-per-s", type=float, default=0.0, help="generation speed; 0 = instant")
+    args = ap.parse_args()
+    uvicorn.run(make_app(args.latency, args.error_rate, args.tokens_per_s), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Load test for the async LLM path with a local fake model.
+
+Runs N concurrent interviews (start_interview + K answers each) against the
+FastAPI app in-process and reports turns/sec. With a non-blocking LLM path,
+throughput should grow roughly linearly with N until the concurrency limit.
+
+    cd backend && python -m benchmarks.load_async_llm --latency 0.5 --turns 3
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks import fake_llm
+
+
+async def _interview(client: httpx.AsyncClient, name: str, turns: int) -> int:
+    r = await client.post("/start_interview", json={"candidate": name})
+    r.raise_for_status()
+    for i in range(turns):
+        r = await client.post("/answer", data={"candidate": name, "response": f"I led the migration, turn {i}."})
+        r.raise_for_status()
+    return turns + 1
+
+
+async def run(concurrency: int, turns: int) -> float:
+    from app import app
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        t0 = time.perf_counter()
+        done = await asyncio.gather(*[_interview(client, f"cand-{concurrency}-{i}", turns) for i in range(concurrency)])
+        elapsed = time.perf_counter() - t0
+    return sum(done) / elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--latency", type=float, default=0.5, help="fake LLM latency (s)")
+    ap.add_argument("--jitter", type=float, default=0.1)
+    ap.add_argument("--turns", type=int, default=3, help="answers per interview")
+    ap.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = ap.parse_args()
+
+    fake_llm.install(latency_s=args.latency, jitter_s=args.jitter)
+    base = None
+    print(f"{'sessions':>8} {'turns/s':>10} {'speedup':>8}")
+    for n in args.sessions:
+        tput = asyncio.run(run(n, args.turns))
+        base = base or tput
+        print(f"{n:>8} {tput:>10.2f} {tput / base:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+End-to-end load test: the real API in a uvicorn subprocess, the LLM behind a local
+OpenAI-compatible stub (benchmarks/fake_openai_server.py), scripted interviews over HTTP.
+
+Each interview is upload_resume → start_interview → --turns × answer. --interviews of
+them run at each --concurrency level against:
+
+- backend: app:app         (LangChain API, async LLM path)
+- agents:  agents.app:app  (the older single-agent API)
+
+Reported per level: interviews/s and requests/s, p50/p95/p99 per endpoint, errors, the
+server's RSS growth over the level and its event-loop lag (sampled inside the server
+every 10 ms: how late a 10 ms sleep wakes up).
+
+    cd backend && python -m benchmarks.load_e2e --concurrency 1 8 32 --latency lognormal:0.4,0.5 --save e2e.json
+    cd backend && python -m benchmarks.load_e2e --compare e2e.json   # exit 1 on a regression
+
+--llm mock runs with HIRESENSE_MOCK=1 and no stub (framework + rule-based planner only).
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+from typing import Dict, List
+
+TARGETS = {"backend": "app:app", "agents": "agents.app:app"}
+ANSWERS = [
+    "I led the migration of our billing service to Kafka; p99 latency dropped 40% and we cut costs by $20k a month.",
+    "The situation was a flaky deploy pipeline. My task was to fix it, so I added canaries and the failure rate fell to 1%.",
+    "We chose Postgres over DynamoDB because of the reporting queries; the trade-off was more ops work for us.",
+    "Honestly the first rollout failed: we missed a cache invalidation bug. I owned the postmortem and the fix.",
+    "I designed the API with FastAPI and Redis, load tested it to 5k requests per second before launch.",
+]
+JD = "Senior backend engineer: Python, FastAPI, Postgres, Kafka. Own services end to end; system design focus."
+
+
+def _pct(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))] if values else 0.0
+
+# ----------------------------
+# Server side (--serve): the target app plus a stats route for the load generator
+# ----------------------------
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, where /proc is missing
+
+
+def serve(target: str, port: int) -> None:
+    import importlib
+    import uvicorn
+
+    module, _, attr = target.partition(":")
+    app = getattr(importlib.import_module(module), attr)
+    lags: deque = deque(maxlen=200_000)
+
+    async def monitor():
+        while True:
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - t0 - 0.01)
+
+    @app.on_event("startup")
+    async def _start_monitor():
+        app.state.bench_monitor = asyncio.create_task(monitor())
+
+    async def bench_stats(reset: bool = False):
+        sample = list(lags)
+        if reset:
+            lags.clear()
+        return {"rss_bytes": _rss_bytes(),
+                "loop_lag_ms": {"p50": _pct(sample, 50) * 1e3, "p99": _pct(sample, 99) * 1e3,
+                                "max": max(sample, default=0.0) * 1e3, "samples": len(sample)}}
+
+    app.add_api_route("/_bench/stats", bench_stats, methods=["GET"])
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def spawn_server(target: str, env: Dict[str, str]) -> tuple:
+    import socket
+    from benchmarks.fake_openai_server import _free_port
+    port = _free_port()
+    proc = subprocess.Popen([sys.executable, "-m", "benchmarks.load_e2e", "--serve", target, "--port", str(port)],
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{target} exited: {proc.stderr.read().decode()[-2000:]}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return f"http://127.0.0.1:{port}", proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f"{target} did not start")
+
+# ----------------------------
+# Client side: scripted interviews
+# ----------------------------
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client, endpoint: str, path: str, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            r = await client.post(path, **kwargs)
+            ok = r.status_code < 400
+        except Exception:
+            r, ok = None, False
+        self.latencies[endpoint].append(time.perf_counter() - t0)
+        if not ok:
+            self.errors[endpoint] += 1
+        return r
+
+
+async def interview(target: str, client, rec: Recorder, name: str, resume: bytes, turns: int, rng: random.Random):
+    # unique per candidate and turn, so the LLM response cache doesn't turn the run into cache hits
+    answers = [f"{rng.choice(ANSWERS)} ({name}, turn {t + 1})" for t in range(turns)]
+    files = {"file": (f"{name}.pdf", resume, "application/pdf")}
+    if target == "backend":
+        await rec.call(client, "upload_resume", "/upload_resume", data={"candidate": name}, files=files)
+        await rec.call(client, "start_interview", "/start_interview",
+                       json={"candidate": name, "role": "Software Engineer", "seniority": "Senior",
+                             "description": JD})
+        for text in answers:
+            await rec.call(client, "answer", "/answer", data={"candidate": name, "response": text})
+    else:
+        await rec.call(client, "upload_resume", "/upload_resume/", files=files)
+        await rec.call(client, "start_interview", "/start_interview/", data={"candidate": name, "jd": JD})
+        for text in answers:
+            await rec.call(client, "answer", "/answer/", data={"candidate": name, "response": text})
+
+
+async def run_level(target: str, base_url: str, resumes: List[bytes], concurrency: int,
+                    interviews: int, turns: int, tag: str) -> Dict:
+    import httpx
+    rec = Recorder()
+    rng = random.Random(concurrency)
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        before = (await client.get("/_bench/stats", params={"reset": True})).json()
+
+        async def one(i: int):
+            async with sem:
+                await interview(target, client, rec, f"{tag}-c{concurrency}-{i}", resumes[i % len(resumes)], turns, rng)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*[one(i) for i in range(interviews)])
+        elapsed = time.perf_counter() - t0
+        after = (await client.get("/_bench/stats", params={"reset": True})).json()
+    requests = sum(len(v) for v in rec.latencies.values())
+    return {
+        "interviews_per_s": round(interviews / elapsed, 2),
+        "requests_per_s": round(requests / elapsed, 1),
+        "elapsed_s": round(elapsed, 2),
+        "endpoints": {ep: {"n": len(v), "errors": rec.errors[ep], "p50_ms": round(_pct(v, 50) * 1e3, 1),
+                           "p95_ms": round(_pct(v, 95) * 1e3, 1), "p99_ms": round(_pct(v, 99) * 1e3, 1)}
+                      for ep, v in rec.latencies.items()},
+        "rss_start_mb": round(before["rss_bytes"] / 2**20, 1),
+        "rss_end_mb": round(after["rss_bytes"] / 2**20, 1),
+        "rss_growth_mb": round((after["rss_bytes"] - before["rss_bytes"]) / 2**20, 1),
+        "loop_lag_ms": {k: round(v, 2) for k, v in after["loop_lag_ms"].items() if k != "samples"},
+    }
+
+
+def run_target(target: str, args, resumes: List[bytes]) -> Dict[str, Dict]:
+    from benchmarks.fake_openai_server import spawn
+    tmp = tempfile.mkdtemp(prefix="hiresense-e2e-")
+    env = {"HIRESENSE_DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'e2e.db')}"}
+    stub = None
+    if args.llm == "fake":
+        base, stub = spawn(args.latency, args.error_rate, tokens_per_s=args.tokens_per_s)
+        env.update({"OPENAI_API_KEY": "sk-fake", "OPENAI_BASE_URL": base, "HIRESENSE_MOCK": "0"})
+    else:
+        env.update({"HIRESENSE_MOCK": "1", "OPENAI_API_KEY": ""})
+    url, server = spawn_server(TARGETS[target], env)
+    try:
+        asyncio.run(run_level(target, url, resumes, 1, 2, 1, "warmup"))  # lazy imports, pools, caches
+        out = {}
+        for c in args.concurrency:
+            res = out[str(c)] = asyncio.run(run_level(target, url, resumes, c, max(args.interviews, c), args.turns, "run"))
+            eps = "  ".join(f"{ep} p50/p95/p99 {e['p50_ms']:.0f}/{e['p95_ms']:.0f}/{e['p99_ms']:.0f} ms"
+                            + (f" ({e['errors']} err)" if e["errors"] else "") for ep, e in res["endpoints"].items())
+            print(f"{target:<8} c={c:<4} {res['interviews_per_s']:7.2f} interviews/s {res['requests_per_s']:7.1f} req/s  "
+                  f"rss +{res['rss_growth_mb']:.1f} MB ({res['rss_end_mb']:.0f} MB)  "
+                  f"loop lag p99 {res['loop_lag_ms']['p99']:.1f} / max {res['loop_lag_ms']['max']:.1f} ms\n    {eps}")
+        return out
+    finally:
+        server.terminate()
+        server.wait(10)
+        if stub is not None:
+            stub.terminate()
+            stub.wait(10)
+
+# ----------------------------
+# Baselines
+# ----------------------------
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return ""
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Regressions vs. `baseline`: throughput below (1 - tol)x, or a p95 above (1 + tol)x + 5 ms."""
+    problems = []
+    for target, levels in results.items():
+        for c, res in levels.items():
+            old = baseline.get("results", {}).get(target, {}).get(c)
+            if old is None:
+                continue
+            if res["interviews_per_s"] < old["interviews_per_s"] * (1 - tolerance):
+                problems.append(f"{target} c={c}: {res['interviews_per_s']} interviews/s, was {old['interviews_per_s']}")
+            for ep, e in res["endpoints"].items():
+                prev = old["endpoints"].get(ep)
+                if prev and e["p95_ms"] > prev["p95_ms"] * (1 + tolerance) + 5:
+                    problems.append(f"{target} c={c} {ep}: p95 {e['p95_ms']} ms, was {prev['p95_ms']} ms")
+    return problems
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    ap.add_argument("--interviews", type=int, default=64, help="interviews per concurrency level")
+    ap.add_argument("--turns", type=int, default=4, help="answers per interview")
+    ap.add_argument("--llm", choices=["fake", "mock"], default="fake")
+    ap.add_argument("--latency", default="lognormal:0.4,0.5", help="stub latency spec (see fake_openai_server)")
+    ap.add_argument("--tokens-per-s", type=float, default=80.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--resumes", type=int, default=16, help="distinct generated resume PDFs")
+    ap.add_argument("--save", help="write results + run metadata to this JSON file")
+    ap.add_argument("--compare", help="baseline JSON to compare against; exit 1 on a regression")
+    ap.add_argument("--tolerance", type=float, default=0.2)
+    ap.add_argument("--serve", help=argparse.SUPPRESS)
+    ap.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.serve:
+        return serve(args.serve, args.port)
+
+    from benchmarks.pdfgen import random_resume_pdf
+    rng = random.Random(11)
+    resumes = [random_resume_pdf(rng, max_pages=2) for _ in range(args.resumes)]
+    print(f"llm={args.llm} latency={args.latency} tokens/s={args.tokens_per_s:g}  "
+          f"{args.interviews} interviews x {args.turns} answers per level, {os.cpu_count()} cores")
+    results = {t: run_target(t, args, resumes) for t in args.targets}
+
+    if args.save:
+        meta = {"commit": _commit(), "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                "cpus": os.cpu_count(), "args": {k: v for k, v in vars(args).items()
+                                                 if k not in ("save", "compare", "serve", "port")}}
+        with open(args.save, "w") as fh:
+            json.dump({"meta": meta, "results": results}, fh, indent=2)
+        print(f"saved {args.save}")
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        problems = compare(results, baseline, args.tolerance)
+        print(f"vs {args.compare} (commit {baseline['meta'].get('commit') or '?'}): "
+              + ("no regressions" if not problems else f"{len(problems)} regression(s)"))
+        for p in problems:
+            print("  " + p)
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Dependency-free generator of small text PDFs for benchmarks.
+"""
+from __future__ import annotations
+import random
+
+WORDS = (
+    "python kafka react fastapi postgres latency throughput migrated designed led reduced "
+    "improved customers pipeline service cluster budget incident rollout experiment metric "
+    "owned architecture kubernetes terraform airflow dashboard revenue team stakeholders"
+).split()
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: list[list[str]]) -> bytes:
+    """One PDF page per list of text lines (Helvetica 10pt)."""
+    objs: list[bytes] = []
+    n_pages = len(pages)
+    font_id = 3 + 2 * n_pages
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(n_pages))
+    objs.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objs.append(f"<< /Type /Pages /Kids [{kids}] /Count {n_pages} >>".encode())
+    for i, lines in enumerate(pages):
+        content_id = 4 + 2 * i
+        objs.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        body = "BT /F1 10 Tf 12 TL 50 750 Td " + " ".join(f"({_escape(ln)}) '" for ln in lines) + " ET"
+        stream = body.encode("latin-1", errors="replace")
+        objs.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{off:010d} 00000 n \n".encode() for off in offsets)
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def random_resume_pdf(rng: random.Random, max_pages: int = 10, lines_per_page: int = 55) -> bytes:
+    pages = []
+    for p in range(rng.randint(1, max_pages)):
+        lines = [f"Skills: {', '.join(rng.sample(WORDS, 8))}"] if p == 0 else []
+        lines += ["- " + " ".join(rng.choices(WORDS, k=rng.randint(6, 14))) for _ in range(lines_per_page)]
+        pages.append(lines)
+    return make_pdf(pages)
@@ -1,7 +1,49 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-DATABASE_URL = "sqlite:///./interview_agent.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+DATABASE_URL = os.getenv("HIRESENSE_DATABASE_URL", "sqlite:///./interview_agent.db")
+_IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if _IS_SQLITE else {})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+if _IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        # WAL lets several worker processes read while one writes; busy_timeout
+        # makes concurrent writers wait for the lock instead of failing at once.
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA busy_timeout=5000")
+        cur.close()
+
+
+def ensure_table(model) -> None:
+    """
+    CREATE TABLE for `model` if missing; on an existing table, add any columns and indexes
+    the model has gained since (the repo has no migration tool). Nullable columns only.
+    """
+    from sqlalchemy import inspect, text
+    from sqlalchemy.exc import OperationalError
+    table = model.__table__
+    try:
+        Base.metadata.create_all(bind=engine, tables=[table])
+    except OperationalError as e:
+        if "already exists" not in str(e):  # workers booting at once race on CREATE TABLE
+            raise
+    have = {c["name"] for c in inspect(engine).get_columns(table.name)}
+    with engine.begin() as conn:
+        for col in table.columns:
+            if col.name not in have:
+                ddl = col.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {col.name} {ddl}"))
+    for index in table.indexes:
+        try:
+            index.create(bind=engine, checkfirst=True)
+        except OperationalError as e:
+            if "already exists" not in str(e):
+                raise
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Float, Index, Integer, String, Text
 from .database import Base
 
 class Candidate(Base):
@@ -6,11 +6,53 @@ class Candidate(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     resume_text = Column(Text)
+    # bulk ingestion (agents/bulk_ingest.py): sha256 of the source document, so re-runs skip it
+    content_hash = Column(String)
+    source = Column(String)         # file name / zip member it came from
+    skills = Column(Text)           # JSON list from the resume parser
+    __table_args__ = (Index("ix_candidates_content_hash", "content_hash", unique=True),)
 
 class InterviewTranscript(Base):
+    """One answered turn, written behind the request (see db/transcripts.py)."""
     __tablename__ = "transcripts"
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer)
+    interview_id = Column(String)   # set by /start_interview; a restarted interview gets a new one
+    turn = Column(Integer)          # 1-based answer number within the interview
     question = Column(Text)
     answer = Column(Text)
     feedback = Column(Text)
+    created_at = Column(Float)
+    # a candidate's / an interview's transcript in order; also serve lookups by either id alone
+    __table_args__ = (Index("ix_transcripts_candidate_turn", "candidate_id", "turn"),
+                      Index("ix_transcripts_interview_turn", "interview_id", "turn"))
+
+class InterviewScore(Base):
+    """Latest offline score of one interview (see agents/batch_scoring.py)."""
+    __tablename__ = "interview_scores"
+    interview_id = Column(String, primary_key=True)  # db/transcripts.interview_key of its transcript rows
+    candidate_id = Column(Integer, index=True)
+    rubric_version = Column(String)  # hash of the scoring code that produced the row
+    turns = Column(Integer)
+    overall = Column(Integer, index=True)
+    rubric = Column(Text)           # JSON: InterviewAgent.rubric_scores shape
+    dashboard = Column(Text)        # JSON: RubricAccumulator.dashboard()["scores"]
+    coaching = Column(Text)         # JSON list: coaching tip per answered turn
+    scored_at = Column(Float)
+
+class SessionRecord(Base):
+    """Write-through copy of in-memory session state (see db/session_store.py)."""
+    __tablename__ = "session_records"
+    namespace = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    value = Column(Text)
+    expires_at = Column(Float, index=True)
+    version = Column(Integer, nullable=False, default=0)  # optimistic locking across workers
+
+class LLMCacheEntry(Base):
+    """Disk tier of the LLM response cache (see agents/llm_cache.py)."""
+    __tablename__ = "llm_cache"
+    key = Column(String, primary_key=True)  # sha256 of normalized prompt + model config
+    value = Column(Text)                    # final opener text, or the follow-up JSON
+    created_at = Column(Float, index=True)
+    expires_at = Column(Float, index=True)
@@ -0,0 +1,409 @@
+from __future__ import annotations
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# ----------------------------
+# Config
+# ----------------------------
+SESSION_BACKEND = os.getenv("HIRESENSE_SESSION_BACKEND", "memory")     # memory | sqlite | redis
+SESSION_MAX_ITEMS = int(os.getenv("HIRESENSE_SESSION_MAX", "10000"))   # per store, in memory
+SESSION_TTL_S = float(os.getenv("HIRESENSE_SESSION_TTL", str(6 * 3600)))  # idle TTL
+# Shared mode: several worker processes use the same backend, so cached reads are
+# validated against the backend version and writes are compare-and-set.
+SESSION_SHARED = os.getenv("HIRESENSE_SESSION_SHARED", "0") in ("1", "true", "True")
+# How stale a shared-mode read may be: a cached entry checked this recently skips the
+# version round trip. update() is compare-and-set regardless, so writes never lose data.
+SESSION_REVALIDATE_S = float(os.getenv("HIRESENSE_SESSION_REVALIDATE_S", "1.0"))
+REDIS_URL = os.getenv("HIRESENSE_REDIS_URL", "redis://localhost:6379/0")
+
+_SWEEP_EVERY = 256       # writes between expired-entry sweeps
+_UPDATE_RETRIES = 5
+_KEY_LOCKS = 64          # stripes serializing read-modify-write per key
+
+
+class StaleSessionError(Exception):
+    """Optimistic-lock conflict: another worker wrote this session first."""
+
+
+class SQLiteBackend:
+    """Durable tier on the app's SQLAlchemy engine: write-through, read on cache miss."""
+    def __init__(self):
+        # imported here so memory-only deployments don't need SQLAlchemy loaded
+        from .database import Base, SessionLocal, engine
+        from .models import SessionRecord
+        from sqlalchemy.exc import OperationalError
+        try:
+            Base.metadata.create_all(bind=engine, tables=[SessionRecord.__table__])
+        except OperationalError as e:
+            # several workers booting at once race on CREATE TABLE; losing is fine
+            if "already exists" not in str(e):
+                raise
+        self._session, self._model = SessionLocal, SessionRecord
+
+    def load(self, namespace: str, key: str) -> Optional[Tuple[str, int]]:
+        with self._session() as db:
+            row = db.get(self._model, (namespace, key))
+            if row is None:
+                return None
+            if row.expires_at is not None and row.expires_at < time.time():
+                db.delete(row)
+                db.commit()
+                return None
+            return row.value, row.version
+
+    def version(self, namespace: str, key: str) -> Optional[int]:
+        with self._session() as db:
+            row = (
+                db.query(self._model.version, self._model.expires_at)
+                .filter_by(namespace=namespace, key=key)
+                .first()
+            )
+            if row is None or (row.expires_at is not None and row.expires_at < time.time()):
+                return None
+            return row.version
+
+    def save(self, namespace: str, key: str, value: str, expires_at: float,
+             expected_version: Optional[int] = None) -> int:
+        """Write and return the new version. With `expected_version`, only if unchanged since read."""
+        from sqlalchemy.exc import IntegrityError
+        M = self._model
+        with self._session() as db:
+            if expected_version is None:
+                row = db.get(M, (namespace, key))
+                if row is None:
+                    row = M(namespace=namespace, key=key, version=0)
+                    db.add(row)
+                row.value, row.expires_at, row.version = value, expires_at, row.version + 1
+                new_version = row.version
+            elif expected_version == 0:
+                db.add(M(namespace=namespace, key=key, value=value, expires_at=expires_at, version=1))
+                new_version = 1
+            else:
+                n = (
+                    db.query(M)
+                    .filter_by(namespace=namespace, key=key, version=expected_version)
+                    .update({"value": value, "expires_at": expires_at, "version": expected_version + 1},
+                            synchronize_session=False)
+                )
+                if n == 0:
+                    raise StaleSessionError(f"{namespace}/{key}")
+                new_version = expected_version + 1
+            try:
+                db.commit()
+            except IntegrityError:
+                raise StaleSessionError(f"{namespace}/{key}")
+            return new_version
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._session() as db:
+            db.query(self._model).filter_by(namespace=namespace, key=key).delete()
+            db.commit()
+
+    def purge_expired(self, namespace: str) -> int:
+        with self._session() as db:
+            n = (
+                db.query(self._model)
+                .filter(self._model.namespace == namespace, self._model.expires_at < time.time())
+                .delete()
+            )
+            db.commit()
+            return n
+
+
+class RedisBackend:
+    """
+    Redis-protocol tier. Each session is a hash {v: value, ver: n}; CAS uses WATCH/MULTI.
+    Pass any redis-py compatible client (e.g. fakeredis.FakeRedis() in tests).
+    """
+    def __init__(self, client=None, prefix: str = "hiresense"):
+        if client is None:
+            import redis  # optional dependency
+            client = redis.Redis.from_url(REDIS_URL)
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def load(self, namespace: str, key: str) -> Optional[Tuple[str, int]]:
+        value, ver = self.client.hmget(self._key(namespace, key), "v", "ver")
+        if value is None:
+            return None
+        return (value.decode() if isinstance(value, bytes) else value), int(ver or 0)
+
+    def version(self, namespace: str, key: str) -> Optional[int]:
+        ver = self.client.hget(self._key(namespace, key), "ver")
+        return None if ver is None else int(ver)
+
+    def save(self, namespace: str, key: str, value: str, expires_at: float,
+             expected_version: Optional[int] = None) -> int:
+        from redis.exceptions import WatchError
+        rkey = self._key(namespace, key)
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(rkey)
+                current = pipe.hget(rkey, "ver")
+                current = 0 if current is None else int(current)
+                if expected_version is not None and current != expected_version:
+                    raise StaleSessionError(f"{namespace}/{key}")
+                pipe.multi()
+                pipe.hset(rkey, mapping={"v": value, "ver": current + 1})
+                pipe.pexpireat(rkey, int(expires_at * 1000))
+                pipe.execute()
+                return current + 1
+            except WatchError:
+                raise StaleSessionError(f"{namespace}/{key}")
+
+    def delete(self, namespace: str, key: str) -> None:
+        self.client.delete(self._key(namespace, key))
+
+    def purge_expired(self, namespace: str) -> int:
+        return 0  # Redis expires keys itself
+
+
+@lru_cache(maxsize=None)
+def make_backend(name: str = SESSION_BACKEND):
+    """
+    'memory' → no durable tier; 'sqlite' → write-through to db/database.py's engine;
+    'redis' → HIRESENSE_REDIS_URL. One shared instance per name.
+    """
+    if name == "sqlite":
+        return SQLiteBackend()
+    if name == "redis":
+        return RedisBackend()
+    if name == "memory":
+        return None
+    raise ValueError(f"Unknown session backend: {name!r}")
+
+
+class SessionStore(MutableMapping):
+    """
+    Per-candidate state with bounded memory:
+    - LRU by size (`max_items`) and idle TTL (`ttl_s`, refreshed on access)
+    - optional durable backend: writes go through, misses reload lazily,
+      size-evicted entries stay recoverable; TTL-expired ones are deleted
+    - `shared=True` (several workers, one backend): cached values are revalidated
+      by version once they are older than `revalidate_s`, and `update()` is an
+      optimistic read-modify-write
+    - `factory` gives defaultdict-like get_or_create()
+    - aget/aset/aget_or_create/aupdate/apop: the same from async code; with a backend
+      they run on a worker thread so disk/network I/O never blocks the event loop
+      (memory-only stores run inline). Async handlers load what a turn needs this
+      way first; later sync reads are then memory hits.
+    Values must be written back (`store[key] = value` or `update()`) after
+    in-place mutation to reach the backend.
+
+    `_lock` only guards the in-memory map and is never held across backend I/O;
+    read-modify-write of one key is serialized by a per-key lock stripe instead.
+    """
+    def __init__(self, namespace: str, max_items: int = SESSION_MAX_ITEMS, ttl_s: float = SESSION_TTL_S,
+                 backend=None,
+                 dumps: Callable[[Any], str] = json.dumps, loads: Callable[[str], Any] = json.loads,
+                 factory: Optional[Callable[[], Any]] = None, shared: bool = SESSION_SHARED,
+                 revalidate_s: float = SESSION_REVALIDATE_S):
+        self.namespace = namespace
+        self.max_items = max_items
+        self.ttl_s = ttl_s
+        self.backend = backend
+        self.shared = shared and backend is not None
+        self.revalidate_s = revalidate_s
+        self._dumps, self._loads, self._factory = dumps, loads, factory
+        self._data: "OrderedDict[str, list]" = OrderedDict()  # key -> [value, expires_at, version, checked_at]
+        self._lock = threading.RLock()
+        self._key_locks = [threading.RLock() for _ in range(_KEY_LOCKS)]
+        self._writes = 0
+        self.counters: Dict[str, int] = {
+            "hits": 0, "misses": 0, "backend_loads": 0, "writes": 0,
+            "evictions_size": 0, "evictions_ttl": 0, "conflicts": 0, "revalidations": 0,
+        }
+
+    def _key_lock(self, key: str) -> threading.RLock:
+        return self._key_locks[hash(key) % _KEY_LOCKS]
+
+    # ---------- Mapping protocol ----------
+    def __getitem__(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            expired = entry is not None and entry[1] < now
+            if expired:
+                self._forget(key)
+                entry = None
+        if expired and self.backend is not None:
+            self.backend.delete(self.namespace, key)
+        if entry is not None and (not self.shared or now - entry[3] < self.revalidate_s
+                                  or self._still_current(key, entry, now)):
+            with self._lock:
+                entry[1] = now + self.ttl_s
+                if key in self._data:
+                    self._data.move_to_end(key)
+                self.counters["hits"] += 1
+            return entry[0]
+        with self._lock:
+            if entry is not None and self._data.get(key) is entry:
+                self._data.pop(key)  # another worker wrote a newer version
+            self.counters["misses"] += 1
+        if self.backend is not None:
+            found = self.backend.load(self.namespace, key)
+            if found is not None:
+                raw, version = found
+                value = self._loads(raw)
+                with self._lock:
+                    self.counters["backend_loads"] += 1
+                    self._insert(key, value, now, version)
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Unconditional write (last writer wins). Use update() for read-modify-write."""
+        self._write(key, value, expected_version=None)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            found = self._data.pop(key, None) is not None
+        if self.backend is not None:
+            self.backend.delete(self.namespace, key)
+        elif not found:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._data.keys()))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore[index]
+            return True
+        except KeyError:
+            return False
+
+    # ---------- Extras ----------
+    def get_or_create(self, key: str) -> Any:
+        with self._key_lock(key):
+            try:
+                return self[key]
+            except KeyError:
+                value = self._factory()
+                self[key] = value
+                return value
+
+    def update(self, key: str, fn: Callable[[Any], Any], retries: int = _UPDATE_RETRIES) -> Any:
+        """
+        Per-candidate optimistic locking: load (or create), apply `fn(value)` in place,
+        then compare-and-set. On conflict the fresh value is reloaded and `fn` re-run,
+        so `fn` must be safe to retry. Returns fn's result.
+        """
+        for _ in range(retries):
+            with self._key_lock(key):
+                try:
+                    value = self[key]
+                    with self._lock:
+                        version = self._data[key][2] if key in self._data else 0
+                except KeyError:
+                    value, version = self._factory(), 0
+                result = fn(value)
+                try:
+                    self._write(key, value, expected_version=version if self.shared else None)
+                    return result
+                except StaleSessionError:
+                    with self._lock:
+                        self.counters["conflicts"] += 1
+                        self._data.pop(key, None)
+        raise StaleSessionError(f"{self.namespace}/{key}: gave up after {retries} conflicts")
+
+    # ---------- Async (event-loop) API ----------
+    async def offload(self, fn: Callable, *args) -> Any:
+        """fn(*args) on a worker thread if this store has a backend, else inline."""
+        if self.backend is None:
+            return fn(*args)  # pure memory: nothing to wait for
+        return await asyncio.to_thread(fn, *args)
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        return await self.offload(self.get, key, default)
+
+    async def aset(self, key: str, value: Any) -> None:
+        await self.offload(self.__setitem__, key, value)
+
+    async def aget_or_create(self, key: str) -> Any:
+        return await self.offload(self.get_or_create, key)
+
+    async def aupdate(self, key: str, fn: Callable[[Any], Any]) -> Any:
+        return await self.offload(self.update, key, fn)
+
+    async def apop(self, key: str, default: Any = None) -> Any:
+        return await self.offload(self.pop, key, default)
+
+    def sweep(self) -> int:
+        """Drop expired entries. LRU order == expiry order (idle TTL), so stop at the first live one."""
+        expired = []
+        with self._lock:
+            now = time.time()
+            while self._data:
+                key, entry = next(iter(self._data.items()))
+                if entry[1] >= now:
+                    break
+                self._forget(key)
+                expired.append(key)
+        if self.backend is not None:
+            for key in expired:
+                self.backend.delete(self.namespace, key)
+            self.backend.purge_expired(self.namespace)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.counters["hits"] + self.counters["misses"]
+            return {
+                "namespace": self.namespace,
+                "size": len(self._data),
+                "max_items": self.max_items,
+                "ttl_s": self.ttl_s,
+                "backend": type(self.backend).__name__ if self.backend else "memory",
+                "shared": self.shared,
+                **self.counters,
+                "hit_rate": round(self.counters["hits"] / total, 4) if total else 0.0,
+            }
+
+    # ---------- Internals ----------
+    def _write(self, key: str, value: Any, expected_version: Optional[int]) -> None:
+        now = time.time()
+        version = 0
+        if self.backend is not None:
+            version = self.backend.save(self.namespace, key, self._dumps(value), now + self.ttl_s,
+                                        expected_version=expected_version)
+        with self._lock:
+            self._insert(key, value, now, version)
+            self.counters["writes"] += 1
+            self._writes += 1
+            sweep = self._writes % _SWEEP_EVERY == 0
+        if sweep:
+            self.sweep()
+
+    def _still_current(self, key: str, entry: list, now: float) -> bool:
+        self.counters["revalidations"] += 1
+        if self.backend.version(self.namespace, key) != entry[2]:
+            return False
+        entry[3] = now
+        return True
+
+    def _insert(self, key: str, value: Any, now: float, version: int) -> None:
+        self._data[key] = [value, now + self.ttl_s, version, now]
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_items:
+            self._data.popitem(last=False)
+            self.counters["evictions_size"] += 1
+
+    def _forget(self, key: str) -> None:
+        """TTL expiry in memory (caller holds _lock); the backend copy is deleted by the caller."""
+        self._data.pop(key, None)
+        self.counters["evictions_ttl"] += 1
@@ -0,0 +1,176 @@
+from __future__ import annotations
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------
+# Config
+# ----------------------------
+TRANSCRIPTS_ENABLED = os.getenv("HIRESENSE_TRANSCRIPTS", "1") in ("1", "true", "True")
+TRANSCRIPT_BATCH = int(os.getenv("HIRESENSE_TRANSCRIPT_BATCH", "500"))             # rows per transaction
+TRANSCRIPT_FLUSH_S = float(os.getenv("HIRESENSE_TRANSCRIPT_FLUSH_MS", "50")) / 1000  # max wait to fill a batch
+TRANSCRIPT_QUEUE_MAX = int(os.getenv("HIRESENSE_TRANSCRIPT_QUEUE", "100000"))
+
+_RETRIES = 3
+_STOP = object()
+
+# (candidate name, turn, question, answer, feedback, created_at, interview id)
+Turn = Tuple[str, int, str, str, str, float, Optional[str]]
+
+
+def new_interview_id() -> str:
+    """Starts with the time in ms (fixed-width hex), so interview ids sort oldest first."""
+    return f"{time.time_ns() // 1_000_000:012x}-{uuid.uuid4().hex[:12]}"
+
+
+def interview_key(T):
+    """
+    SQL for the interview a transcript row (model T) belongs to: its interview_id, or for
+    rows written before interviews had ids, one interview per candidate ("candidate:<id>").
+    Read rows ordered by (interview_id, candidate_id, turn) to get each interview together.
+    """
+    from sqlalchemy import String, cast, func, literal
+    return func.coalesce(T.interview_id, literal("candidate:") + cast(T.candidate_id, String))
+
+
+class TranscriptWriter:
+    """
+    Write-behind persistence of interview turns.
+
+    `record()` only enqueues (no I/O on the request path). A daemon thread drains the queue
+    into batches of up to `batch` rows, waiting at most `flush_s` to fill one, and writes
+    each batch in a single transaction (one executemany INSERT). `close()` flushes what is
+    queued; the app calls it on shutdown.
+    """
+    def __init__(self, batch: int = TRANSCRIPT_BATCH, flush_s: float = TRANSCRIPT_FLUSH_S,
+                 max_queued: int = TRANSCRIPT_QUEUE_MAX):
+        from .database import engine, ensure_table
+        from .models import Candidate, InterviewTranscript
+        ensure_table(Candidate)
+        ensure_table(InterviewTranscript)
+        self.engine = engine
+        self.batch = batch
+        self.flush_s = flush_s
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queued)
+        self._ids: Dict[str, int] = {}  # candidate name -> candidates.id (writer thread only)
+        self._lock = threading.Lock()
+        self.counters = {"queued": 0, "written": 0, "batches": 0, "dropped": 0, "failed": 0}
+        self._thread = threading.Thread(target=self._run, name="hiresense-transcripts", daemon=True)
+        self._thread.start()
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    # ---------- Request path ----------
+    def record(self, candidate: str, turn: int, question: str, answer: str, feedback: str,
+               interview_id: Optional[str] = None) -> None:
+        try:
+            self._queue.put_nowait((candidate, turn, question or "", answer or "", feedback or "", time.time(),
+                                    interview_id or None))
+            self._count("queued")
+        except queue.Full:
+            # the database has fallen far behind; shed rather than stall the interview
+            self._count("dropped")
+
+    # ---------- Writer thread ----------
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            rows: List[Turn] = [item]
+            deadline = time.monotonic() + self.flush_s
+            while len(rows) < self.batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                rows.append(item)
+            self._write_with_retry(rows)
+        # close(): write whatever is still queued
+        rest = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                rest.append(item)
+        for i in range(0, len(rest), self.batch):
+            self._write_with_retry(rest[i:i + self.batch])
+
+    def _write_with_retry(self, rows: List[Turn]) -> None:
+        for attempt in range(_RETRIES):
+            try:
+                self._write(rows)
+                self._count("written", len(rows))
+                self._count("batches")
+                return
+            except Exception as e:
+                logger.warning("Transcript write failed (attempt %d/%d): %s", attempt + 1, _RETRIES, e)
+                self._ids.clear()  # the transaction rolled back; ids created in it are gone
+                time.sleep(0.1 * 2 ** attempt)
+        self._count("failed", len(rows))
+
+    def _candidate_ids(self, conn, names: set) -> Dict[str, int]:
+        from sqlalchemy import func, insert, select
+        from .models import Candidate
+        missing = [n for n in names if n not in self._ids]
+        if missing:
+            q = select(Candidate.name, func.min(Candidate.id)).where(Candidate.name.in_(missing)).group_by(Candidate.name)
+            self._ids.update(dict(conn.execute(q).all()))
+            new = [n for n in missing if n not in self._ids]
+            if new:
+                conn.execute(insert(Candidate.__table__), [{"name": n} for n in new])
+                q = select(Candidate.name, func.min(Candidate.id)).where(Candidate.name.in_(new)).group_by(Candidate.name)
+                self._ids.update(dict(conn.execute(q).all()))
+        return self._ids
+
+    def _write(self, rows: List[Turn]) -> None:
+        from sqlalchemy import insert
+        from .models import InterviewTranscript
+        with self.engine.begin() as conn:
+            ids = self._candidate_ids(conn, {r[0] for r in rows})
+            conn.execute(insert(InterviewTranscript.__table__), [
+                {"candidate_id": ids[c], "interview_id": iid, "turn": t, "question": q, "answer": a,
+                 "feedback": f, "created_at": ts}
+                for c, t, q, a, f, ts, iid in rows
+            ])
+
+    # ---------- Lifecycle / introspection ----------
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is written (or failed). False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                c = self.counters
+                if c["written"] + c["failed"] >= c["queued"]:
+                    return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.005)
+
+    def close(self, timeout: float = 10.0) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            c = dict(self.counters)
+        return {"pending": self._queue.qsize(), **c}
+
+
+def make_transcript_writer() -> Optional[TranscriptWriter]:
+    return TranscriptWriter() if TRANSCRIPTS_ENABLED else None
@@ -0,0 +1,13 @@
+"""
+Tests run from backend/ (`python -m pytest -q`), in mock mode against a throwaway database.
+"""
+import os
+import sys
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="hiresense-tests-")
+os.environ["HIRESENSE_MOCK"] = "1"
+os.environ["HIRESENSE_DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'test.db')}"
+os.environ.setdefault("HIRESENSE_PDF_WORKERS", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
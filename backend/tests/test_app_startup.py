@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_has_no_side_effects(tmp_path):
+    env = {k: v for k, v in os.environ.items() if k != "HIRESENSE_DATABASE_URL"}  # default ./interview_agent.db
+    env["PYTHONPATH"] = BACKEND
+    code = "import threading, app; print(sorted(t.name for t in threading.enumerate()))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip().splitlines()[-1] == "['MainThread']"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_startup_opens_the_writer_and_search_index():
+    import app as api
+    with TestClient(api.app) as client:
+        assert api.TRANSCRIPTS is not None and api.SKILLS_INDEX is not None
+        diag = client.get("/diag").json()
+        assert diag["transcripts_enabled"] and "search_enabled" in diag
+        assert isinstance(diag["openai_key_set"], bool) and "openai_key_prefix" not in diag
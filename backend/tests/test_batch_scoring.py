@@ -0,0 +1,47 @@
+from sqlalchemy import insert, inspect, select, text
+
+from agents import batch_scoring
+from db.database import engine, ensure_table
+from db.models import InterviewScore as S, InterviewTranscript as T
+
+RESTARTED, LEGACY = 900001, 900002
+
+
+def _seed():
+    ensure_table(T)
+    rows = []
+    for iid, n in (("000000000001-first", 2), ("000000000002-second", 1)):
+        for turn in range(1, n + 1):
+            rows.append({"candidate_id": RESTARTED, "interview_id": iid, "turn": turn,
+                         "question": "Tell me about a project?", "answer": f"I led a Kafka migration {turn}"})
+    rows.append({"candidate_id": LEGACY, "interview_id": None, "turn": 1,
+                 "question": "Q?", "answer": "We cut latency by 40% using Redis"})
+    with engine.begin() as conn:
+        conn.execute(insert(T.__table__), rows)
+
+
+def test_old_candidate_keyed_table_is_rebuilt():
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS interview_scores"))
+        conn.execute(text("CREATE TABLE interview_scores (candidate_id INTEGER PRIMARY KEY, overall INTEGER)"))
+    batch_scoring.ensure_score_table()
+    assert inspect(engine).get_pk_constraint("interview_scores")["constrained_columns"] == ["interview_id"]
+
+
+def test_restarted_interviews_are_scored_separately_in_process(monkeypatch):
+    _seed()
+
+    def no_pool(*a, **k):
+        raise AssertionError("a handful of interviews should not start a process pool")
+
+    monkeypatch.setattr(batch_scoring, "ProcessPoolExecutor", no_pool)
+    done = list(batch_scoring.rescore(workers=4))[-1]
+    assert done["event"] == "done" and done["written"] >= 3
+    with engine.connect() as conn:
+        rows = conn.execute(select(S.interview_id, S.candidate_id, S.turns)
+                            .where(S.candidate_id.in_([RESTARTED, LEGACY])).order_by(S.interview_id)).all()
+    assert [tuple(r) for r in rows] == [
+        ("000000000001-first", RESTARTED, 2),
+        ("000000000002-second", RESTARTED, 1),
+        (f"candidate:{LEGACY}", LEGACY, 1),
+    ]
@@ -0,0 +1,66 @@
+import io
+import struct
+import threading
+import zipfile
+
+import pytest
+
+from agents import bulk_ingest
+
+
+def _zip(path, name, data):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(name, data)
+    return str(path)
+
+
+def _lie_about_size(path, size):
+    """Rewrite the member's uncompressed size in both the local and central headers."""
+    raw = bytearray(open(path, "rb").read())
+    local = raw.find(b"PK\x03\x04")
+    struct.pack_into("<I", raw, local + 22, size)
+    central = raw.find(b"PK\x01\x02")
+    struct.pack_into("<I", raw, central + 24, size)
+    open(path, "wb").write(bytes(raw))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_zips():
+    bulk_ingest._ZIPS.clear()
+    yield
+    bulk_ingest._ZIPS.clear()
+
+
+def test_read_caps_the_bytes_actually_inflated(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_ingest, "PDF_MAX_BYTES", 1000)
+    path = _zip(tmp_path / "big.zip", "big.txt", b"a" * 50_000)
+    with pytest.raises(ValueError):
+        bulk_ingest._read(("zip", path, "big.txt"))
+    small = _zip(tmp_path / "small.zip", "ok.txt", b"b" * 1000)
+    assert bulk_ingest._read(("zip", small, "ok.txt")) == b"b" * 1000
+
+
+def test_understated_zip_size_is_not_trusted(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_ingest, "PDF_MAX_BYTES", 1000)
+    path = _zip(tmp_path / "bomb.zip", "resume.txt", b"x" * 200_000)
+    _lie_about_size(path, 10)
+    sources, ignored = bulk_ingest.iter_sources(path)
+    assert sources and not ignored  # the header passes the listing check...
+    with pytest.raises(zipfile.BadZipFile):  # ...but inflating stops at the stated size, failing the CRC
+        bulk_ingest._read(sources[0])
+
+
+def test_concurrent_imports_queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_ingest, "_RUNS", threading.BoundedSemaphore(1))
+    empty = tmp_path / "resumes"
+    empty.mkdir()
+    bulk_ingest._RUNS.acquire()  # another import is running
+    events = []
+    t = threading.Thread(target=lambda: events.extend(ev["event"] for ev in bulk_ingest.ingest(str(empty))))
+    t.start()
+    t.join(0.5)
+    assert events == ["queued"] and t.is_alive()
+    bulk_ingest._RUNS.release()
+    t.join(10)
+    assert events == ["queued", "start", "done"]
+    assert bulk_ingest._RUNS.acquire(blocking=False)  # released again when done
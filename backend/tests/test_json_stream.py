@@ -0,0 +1,42 @@
+import json
+import random
+import time
+
+from agents.json_stream import JsonFieldStream
+
+DOC = {"feedback": "ok", "followup": 'Say "why" \\ then: café \U0001F680\nnext\ttab / end', "x": 1}
+
+
+def _chunks(text, rng):
+    i = 0
+    while i < len(text):
+        n = rng.randint(1, 7)
+        yield text[i:i + n]
+        i += n
+
+
+def test_split_anywhere_matches_json_loads():
+    raw = json.dumps(DOC)  # ascii escapes, incl. a surrogate pair
+    for seed in range(50):
+        s = JsonFieldStream("followup")
+        deltas = [s.feed(c) for c in _chunks(raw, random.Random(seed))]
+        assert "".join(deltas) == s.value == DOC["followup"]
+        assert s.done and s.raw == raw
+
+
+def test_one_char_at_a_time_and_late_key():
+    raw = " " * 500 + json.dumps({"followup": "hi there"}, ensure_ascii=False)
+    s = JsonFieldStream("followup")
+    assert "".join(s.feed(c) for c in raw) == "hi there"
+    assert s.feed("trailing") == "" and s.raw.endswith("trailing")
+
+
+def test_long_stream_is_linear():
+    body = "word " * 40000
+    raw = json.dumps({"followup": body})
+    t0 = time.perf_counter()
+    s = JsonFieldStream("followup")
+    for i in range(0, len(raw), 3):
+        s.feed(raw[i:i + 3])
+    assert s.value == body
+    assert time.perf_counter() - t0 < 2.0
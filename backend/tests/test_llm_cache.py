@@ -0,0 +1,70 @@
+import asyncio
+
+from agents import langchain_chain as lc
+from agents.llm_cache import LLMResponseCache, prompt_key
+
+
+def test_memory_hit_then_disk_hit_after_eviction():
+    cache = LLMResponseCache(max_items=1, disk=True)
+    cache.clear()
+    a, b = prompt_key(["opener", "Backend  Engineer\n"]), prompt_key(["opener", "Data Engineer"])
+    assert a == prompt_key(["opener", " Backend Engineer"])  # whitespace-normalized
+    cache.put(a, "Tell me about Kafka?")
+    assert cache.get(a) == "Tell me about Kafka?"
+    cache.put(b, "Tell me about Spark?")                      # evicts a from memory
+    assert cache.get(a) == "Tell me about Kafka?"              # from SQLite, back in memory
+    assert cache.get(a) == "Tell me about Kafka?"
+    s = cache.stats()
+    assert (s["memory_hits"], s["disk_hits"], s["evictions"]) == (2, 1, 2)
+
+
+def test_expired_entries_miss_in_both_tiers():
+    cache = LLMResponseCache(ttl_s=-1, disk=True)
+    key = prompt_key(["followup", "expired"])
+    cache.put(key, '{"followup": "Why?"}')
+    assert cache.get(key) is None
+    assert asyncio.run(cache.aget(key)) is None
+    s = cache.stats()
+    assert s["expired"] == 1 and s["misses"] == 2 and s["disk_hits"] == 0
+
+
+def test_concurrent_misses_share_one_call(monkeypatch):
+    cache = LLMResponseCache(disk=False)
+    monkeypatch.setattr(lc, "LLM_CACHE", cache)
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "Tell me about Kafka?"
+
+    async def main():
+        key = prompt_key(["opener", "single-flight"])
+        first = await asyncio.gather(*(lc._acached(key, produce) for _ in range(5)))
+        return first, await lc._acached(key, produce)
+
+    first, again = asyncio.run(main())
+    assert first == ["Tell me about Kafka?"] * 5 and again == "Tell me about Kafka?"
+    assert calls == [1]
+    s = cache.stats()
+    assert s["coalesced"] == 4 and s["memory_hits"] == 1 and s["writes"] == 1
+
+
+def test_failed_leader_lets_waiters_try_on_their_own(monkeypatch):
+    monkeypatch.setattr(lc, "LLM_CACHE", LLMResponseCache(disk=False))
+    attempts = []
+
+    async def produce():
+        attempts.append(1)
+        await asyncio.sleep(0.02)
+        if len(attempts) == 1:
+            raise RuntimeError("llm down")
+        return "ok"
+
+    async def main():
+        key = prompt_key(["opener", "leader-fails"])
+        return await asyncio.gather(lc._acached(key, produce), lc._acached(key, produce),
+                                    return_exceptions=True)
+
+    leader, waiter = asyncio.run(main())
+    assert isinstance(leader, RuntimeError) and waiter == "ok" and len(attempts) == 2
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents import pdf_extract
+from agents.pdf_extract import PdfExtractError, _WorkerPool, _extract_worker
+from benchmarks.pdfgen import make_pdf
+
+PDF = make_pdf([["Senior backend engineer", "Cut p99 latency by 40% with Redis"]])
+
+
+def test_timeout_kills_only_the_stuck_worker():
+    pool = _WorkerPool(2)
+    results = {}
+
+    def stuck():
+        try:
+            pool.call(time.sleep, 60, timeout=1.5)
+        except TimeoutError as e:
+            results["stuck"] = e
+
+    def innocent():
+        results["text"] = pool.call(_extract_worker, PDF, 10, timeout=60)
+
+    try:
+        threads = [threading.Thread(target=stuck), threading.Thread(target=innocent)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert isinstance(results["stuck"], TimeoutError)
+        assert "Redis" in results["text"]
+        assert pool.counters == {"started": 2, "killed": 1}
+        # the surviving worker is reused
+        assert "Redis" in pool.call(_extract_worker, PDF, 10, timeout=60)
+        assert pool.counters["started"] == 2
+    finally:
+        pool.close()
+
+
+def test_extraction_failure_is_raised_and_not_cached(monkeypatch):
+    pdf_extract.shutdown()
+    monkeypatch.setattr(pdf_extract, "PDF_WORKERS", 1)
+    monkeypatch.setattr(pdf_extract, "PDF_TIMEOUT_S", 1e-3)  # less than a worker takes to boot
+    try:
+        with pytest.raises(PdfExtractError):
+            asyncio.run(pdf_extract.aextract_pdf_text(PDF + b"%timeout"))
+        monkeypatch.setattr(pdf_extract, "PDF_TIMEOUT_S", 60)
+        assert "Redis" in asyncio.run(pdf_extract.aextract_pdf_text(PDF + b"%timeout"))
+    finally:
+        pdf_extract.shutdown()
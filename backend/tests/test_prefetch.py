@@ -0,0 +1,64 @@
+import asyncio
+
+from agents import langchain_chain as lc
+from agents.prefetch import Prefetcher
+
+DRAFT = "I led the migration of our billing service to Postgres and cut p99 latency"
+ARGS = dict(role="Backend Engineer", seniority="mid", tone="neutral")
+
+
+def _planner_turn(candidate):
+    st = lc._RULE_PLANNER.state.get(candidate)
+    return st.turn if st is not None else 0
+
+
+def test_submit_take_keep_and_stale():
+    async def main():
+        p = Prefetcher()
+        calls = []
+
+        def compute(text):
+            async def run():
+                calls.append(text)
+                return text.upper()
+            return run
+
+        assert p.submit("c", "too short", compute("x")) == "ignored"
+        assert p.submit("c", DRAFT, compute(DRAFT)) == "started"
+        assert p.submit("c", DRAFT + " by", compute(DRAFT + " by")) == "kept"
+        assert await p.take("c", DRAFT + " by 40%.") == DRAFT.upper()
+        assert await p.take("c", DRAFT) is None  # taken once
+        p.submit("c", DRAFT, compute(DRAFT))
+        assert await p.take("c", "Something else entirely") is None
+        return p.counters, calls
+
+    counters, calls = asyncio.run(main())
+    assert calls == [DRAFT]  # the stale draft was cancelled before it ran
+    assert counters["hits"] == 1 and counters["stale"] == 1 and counters["misses"] == 1
+    assert counters["cancelled"] == 1
+
+
+def test_unused_draft_leaves_the_rule_planner_alone():
+    async def main():
+        # mock mode: the rule planner answers the draft
+        out, plan = await lc.adraft_followup_and_feedback("p1", candidate_response=DRAFT, **ARGS)
+        assert out["followup"] and plan is not None and plan.turn == 1
+        assert _planner_turn("p1") == 0          # nothing saved for a draft
+        # the final answer differs: the draft is dropped and the turn planned normally, once
+        await lc.abuild_followup_and_feedback("p1", candidate_response="A different answer entirely", **ARGS)
+        assert _planner_turn("p1") == 1
+        # the stale draft can no longer be adopted
+        assert await lc.aadopt_draft_plan("p1", plan) is False
+        assert _planner_turn("p1") == 1
+
+    asyncio.run(main())
+
+
+def test_used_draft_saves_its_plan():
+    async def main():
+        out, plan = await lc.adraft_followup_and_feedback("p2", candidate_response=DRAFT, **ARGS)
+        assert await lc.aadopt_draft_plan("p2", plan) is True
+        st = lc._RULE_PLANNER.state.get("p2")
+        assert st.turn == 1 and st.asked == plan.asked and st.asked
+
+    asyncio.run(main())
@@ -0,0 +1,18 @@
+import json
+
+from agents.llm_chains import FIRST_Q_TEMPLATE, FOLLOWUP_JSON_PROMPT
+
+STYLE = {"role": "Backend Engineer", "seniority": "Senior", "tone": "friendly"}
+
+
+def test_followup_prompt_formats_and_keeps_the_json_example():
+    msgs = FOLLOWUP_JSON_PROMPT.format_messages(**STYLE, history=[], candidate_response="I led a migration.")
+    text = "\n".join(m.content for m in msgs)
+    assert "I led a migration." in text
+    example = text[text.index('{"followup"'):]
+    assert json.loads(example[:example.index("}") + 1]) == {"followup": "...", "feedback": "..."}
+
+
+def test_first_question_prompt_formats():
+    msgs = FIRST_Q_TEMPLATE.format_messages(**STYLE, resume_text="Python, Kafka", jd_text="")
+    assert "Python, Kafka" in "\n".join(m.content for m in msgs)
@@ -0,0 +1,40 @@
+import csv
+import io
+import json
+import zipfile
+
+from fastapi.testclient import TestClient
+
+import app as api
+from agents.batch_scoring import rescore
+from agents.report_export import export_bundle, export_csv, export_ndjson
+
+NAME = "Restart Export"
+
+
+def _two_interviews():
+    with TestClient(api.app) as client:
+        ids = []
+        for answers in (["I built a queue in Go", "We measured p99 latency"], ["I led a Postgres migration"]):
+            ids.append(client.post("/start_interview", json={"candidate": NAME, "role": "Backend Engineer"})
+                       .json()["interview_id"])
+            for text in answers:
+                client.post("/answer", data={"candidate": NAME, "response": text})
+        assert api.TRANSCRIPTS.flush(5.0)
+    return ids
+
+
+def test_restarted_interview_exports_as_two_reports():
+    first, second = _two_interviews()
+    list(rescore(workers=1))
+
+    rows = list(csv.DictReader(io.StringIO("".join(export_csv([NAME])))))
+    assert [(r["interview_id"], r["turn"]) for r in rows] == [(first, "1"), (first, "2"), (second, "1")]
+    assert all(r["overall"] for r in rows)
+
+    interviews = [json.loads(line) for line in "".join(export_ndjson([NAME])).splitlines()]
+    assert [(iv["interview_id"], len(iv["turns"])) for iv in interviews] == [(first, 2), (second, 1)]
+    assert all(iv["score"] for iv in interviews)
+
+    names = zipfile.ZipFile(io.BytesIO(b"".join(export_bundle([NAME], workers=1)))).namelist()
+    assert names == [f"{first}_Restart_Export.pdf", f"{second}_Restart_Export.pdf"]
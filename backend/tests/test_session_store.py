@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+from db.session_store import SessionStore
+
+
+class RecordingBackend:
+    """In-memory backend that notes which thread each call ran on."""
+    def __init__(self):
+        self.rows, self.threads = {}, []
+
+    def _seen(self):
+        self.threads.append(threading.get_ident())
+
+    def load(self, namespace, key):
+        self._seen()
+        return self.rows.get((namespace, key))
+
+    def version(self, namespace, key):
+        self._seen()
+        row = self.rows.get((namespace, key))
+        return row[1] if row else None
+
+    def save(self, namespace, key, value, expires_at, expected_version=None):
+        self._seen()
+        version = self.rows.get((namespace, key), (None, 0))[1] + 1
+        self.rows[(namespace, key)] = (value, version)
+        return version
+
+    def delete(self, namespace, key):
+        self._seen()
+        self.rows.pop((namespace, key), None)
+
+    def purge_expired(self, namespace):
+        return 0
+
+
+def test_async_api_runs_backend_io_off_the_event_loop():
+    backend = RecordingBackend()
+    store = SessionStore("t", backend=backend, factory=list)
+
+    async def main():
+        loop_thread = threading.get_ident()
+        await store.aset("a", [1])
+        assert await store.aupdate("a", lambda v: v.append(2) or len(v)) == 2
+        store._data.clear()  # force a reload from the backend
+        assert await store.aget("a") == [1, 2]
+        assert await store.aget_or_create("b") == []
+        await store.apop("b")
+        return loop_thread
+
+    loop_thread = asyncio.run(main())
+    assert backend.threads and loop_thread not in backend.threads
+
+
+def test_async_api_is_inline_without_a_backend():
+    store = SessionStore("t", factory=dict)
+
+    async def main():
+        await store.aset("a", {"x": 1})
+        assert await store.aget("a") == {"x": 1}
+        assert await store.aget("missing", "d") == "d"
+
+    asyncio.run(main())
+
+
+def _shared_pair(namespace, revalidate_s):
+    """Two stores on one SQLite backend: two workers sharing sessions."""
+    from db.session_store import SQLiteBackend
+    backend = SQLiteBackend()
+    return [SessionStore(namespace, backend=backend, factory=dict, shared=True, revalidate_s=revalidate_s)
+            for _ in range(2)]
+
+
+def _bump(d):
+    d["n"] = d.get("n", 0) + 1
+    return d["n"]
+
+
+def test_shared_reads_see_other_workers_writes_after_revalidation():
+    a, b = _shared_pair("cas-read", revalidate_s=0)
+    a["k"] = {"n": 1}
+    assert b["k"] == {"n": 1}
+    b.update("k", _bump)
+    assert a["k"] == {"n": 2}
+    assert a.stats()["revalidations"] >= 1
+
+
+def test_update_is_compare_and_set_across_workers():
+    a, b = _shared_pair("cas-update", revalidate_s=60)  # cached reads stay stale for the whole test
+    a["k"] = {"n": 0}
+    assert b["k"] == {"n": 0}
+    a.update("k", _bump)
+    assert b["k"] == {"n": 0}            # within the staleness window
+    assert b.update("k", _bump) == 2     # ...but the write conflicts, reloads and re-applies
+    assert b.counters["conflicts"] == 1
+
+
+def test_concurrent_updates_from_two_workers_lose_nothing():
+    a, b = _shared_pair("cas-threads", revalidate_s=1.0)
+    a["k"] = {"n": 0}
+
+    def worker(store):
+        for _ in range(40):
+            store.update("k", _bump, retries=100)
+
+    threads = [threading.Thread(target=worker, args=(s,)) for s in (a, b)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    a._data.clear()
+    assert a["k"] == {"n": 80}
@@ -0,0 +1,52 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app as api
+from agents.skills_index import get_skills_index
+
+
+@pytest.fixture(scope="module")
+def index():
+    idx = get_skills_index()
+    if not idx.enabled:
+        pytest.skip("sqlite built without FTS5")
+    return idx
+
+
+def _ids(out):
+    return [r["candidate_id"] for r in out["results"]]
+
+
+def test_reupload_replaces_the_old_tokens(index):
+    cid = index.upsert_candidate("Search Reupload", "Wrote Quuxlang services for five years", ["Quuxlang"])
+    assert index.upsert_candidate("Search Reupload", "Now writing Frobscript tooling", ["Frobscript"]) == cid
+    assert cid not in _ids(index.search("quuxlang"))
+    assert cid not in _ids(index.search("quuxlang*"))
+    out = index.search("frobscript")
+    assert out["path"] == "skills" and _ids(out) == [cid]
+
+
+def test_skills_and_fulltext_paths_and_match_mode(index):
+    both = index.upsert_candidate("Search Both", "Blorpdb and Snarkml in production; zebrafishology hobby",
+                                  ["Blorpdb", "Snarkml"])
+    one = index.upsert_candidate("Search One", "Blorpdb administration", ["Blorpdb"])
+
+    out = index.search("blorpdb snarkml", match_all=True)
+    assert out["path"] == "skills" and _ids(out) == [both]
+    out = index.search("blorpdb snarkml", match_all=False)
+    assert out["match"] == "any" and _ids(out) == [both, one]  # both skills outrank one
+
+    out = index.search("zebrafishology")  # a word no resume lists as a skill
+    assert out["path"] == "fulltext" and _ids(out) == [both]
+    assert "[zebrafishology" in out["results"][0]["snippet"]
+    out = index.search("snark*")          # prefix queries always go to FTS5
+    assert out["path"] == "fulltext" and _ids(out) == [both]
+
+
+def test_empty_query_and_endpoint(index):
+    assert index.search("")["path"] == "none"
+    assert index.search("  ***  ")["results"] == []
+    cid = index.upsert_candidate("Search Endpoint", "Glimmerjs dashboards", ["Glimmerjs"])
+    with TestClient(api.app) as client:
+        out = client.get("/candidates/search", params={"q": "glimmerjs", "match": "any"}).json()
+    assert out["match"] == "any" and _ids(out) == [cid]
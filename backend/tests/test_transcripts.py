@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+import app as api
+from db.database import engine
+from db.models import InterviewTranscript as T
+
+
+def _interview(client, candidate, answers):
+    started = client.post("/start_interview", json={"candidate": candidate, "role": "Backend Engineer"}).json()
+    for text in answers:
+        assert client.post("/answer", data={"candidate": candidate, "response": text}).status_code == 200
+    return started["interview_id"]
+
+
+def test_restarted_interview_gets_its_own_id():
+    with TestClient(api.app) as client:
+        first = _interview(client, "restart-1", ["I built a queue in Go", "We measured p99 latency"])
+        second = _interview(client, "restart-1", ["I led a Postgres migration"])
+        assert api.TRANSCRIPTS.flush(5.0)
+    assert first and second and first != second
+    with engine.connect() as conn:
+        rows = conn.execute(select(T.interview_id, T.turn).where(T.interview_id.in_([first, second]))
+                            .order_by(T.id)).all()
+    assert [tuple(r) for r in rows] == [(first, 1), (first, 2), (second, 1)]
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from agents.turn_guard import IdempotencyConflict, TurnGuard
+
+ANSWER = "I led the billing migration to Postgres"
+
+
+def _slow(calls, result, delay=0.05):
+    async def fn():
+        calls.append(result)
+        await asyncio.sleep(delay)
+        return result
+    return fn
+
+
+def test_concurrent_duplicates_coalesce_then_replay():
+    async def main():
+        g, calls = TurnGuard(), []
+        key = g.key_for(ANSWER, "a-1")
+        first, second = await asyncio.gather(g.run("c", key, ANSWER, _slow(calls, "next?")),
+                                             g.run("c", key, ANSWER, _slow(calls, "again?")))
+        third = await g.run("c", key, ANSWER, _slow(calls, "again?"))
+        return g, calls, (first, second, third)
+
+    g, calls, results = asyncio.run(main())
+    assert calls == ["next?"]
+    assert results == (("next?", "new"), ("next?", "coalesced"), ("next?", "replayed"))
+    assert g.stats()["locked"] == 0 and g.stats()["inflight"] == 0
+
+
+def test_reused_key_with_another_answer_is_a_conflict():
+    async def main():
+        g = TurnGuard()
+        await g.run("c", g.key_for(ANSWER, "a-1"), ANSWER, _slow([], "next?"))
+        with pytest.raises(IdempotencyConflict):
+            await g.run("c", g.key_for("Something else", "a-1"), "Something else", _slow([], "x"))
+        return g.counters
+
+    assert asyncio.run(main())["conflicts"] == 1
+
+
+def test_turns_of_one_candidate_never_overlap():
+    async def main():
+        g, active, peak = TurnGuard(), [0], [0]
+
+        def turn(i):
+            async def fn():
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.01)
+                active[0] -= 1
+                return i
+            return fn
+
+        texts = [f"answer number {i}" for i in range(5)]
+        out = await asyncio.gather(*(g.run("c", g.key_for(t), t, turn(i)) for i, t in enumerate(texts)))
+        return peak[0], [r for r, _ in out]
+
+    peak, results = asyncio.run(main())
+    assert peak == 1 and results == list(range(5))
+
+
+def test_failure_is_not_stored_and_forget_drops_replays():
+    async def main():
+        g, calls = TurnGuard(), []
+        key = g.key_for(ANSWER)
+
+        async def boom():
+            raise RuntimeError("llm down")
+
+        with pytest.raises(RuntimeError):
+            await g.run("c", key, ANSWER, boom)
+        assert (await g.run("c", key, ANSWER, _slow(calls, "next?")))[1] == "new"
+        assert (await g.run("c", key, ANSWER, _slow(calls, "next?")))[1] == "replayed"
+        g.forget("c")  # restarted interview: the same answer is a new turn
+        assert (await g.run("c", key, ANSWER, _slow(calls, "next?")))[1] == "new"
+        return calls
+
+    assert asyncio.run(main()) == ["next?", "next?"]
@@ -0,0 +1,43 @@
+import asyncio
+import io
+import os
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from agents.uploads import UploadRejected, sniff, spool_upload
+
+
+@pytest.mark.parametrize("head, filename, kind", [
+    (b"%PDF-1.7\n", "resume.pdf", "pdf"),
+    (b"%PDF-1.4\n", "", "pdf"),
+    (b"PK\x03\x04\x14\x00", "batch.zip", "zip"),
+    (b"PK\x05\x06" + b"\x00" * 18, "empty.zip", "zip"),
+    (b"Jane Doe\nSenior engineer", "resume.txt", "text"),
+    (b"Jane Doe\nSenior engineer", "resume.PDF", None),   # claims to be a PDF
+    (b"\x89PNG\r\n\x1a\n\x00\x00", "photo.png", None),     # other binary
+])
+def test_sniff(head, filename, kind):
+    assert sniff(head, filename) == kind
+
+
+def _spool(data, filename="resume.txt", **kw):
+    return asyncio.run(spool_upload(UploadFile(io.BytesIO(data), filename=filename), **kw))
+
+
+def test_spool_rejects_wrong_type_and_oversize():
+    with pytest.raises(UploadRejected) as e:
+        _spool(b"\x00\x01binary", "x.bin")
+    assert e.value.status_code == 415
+    with pytest.raises(UploadRejected) as e:
+        _spool(b"x" * 2048, max_bytes=1024)
+    assert e.value.status_code == 413
+
+
+def test_large_upload_spools_to_a_temp_file_removed_on_close():
+    data = b"Kafka and Postgres\n" * 1000
+    with _spool(data, spool_bytes=1024) as up:
+        path = up.path
+        assert up.kind == "text" and up.size == len(data) and os.path.exists(path)
+        assert up.read_bytes() == data
+    assert not os.path.exists(path)
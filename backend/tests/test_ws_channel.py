@@ -0,0 +1,88 @@
+import asyncio
+
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from agents import ws_channel
+from agents.ws_channel import ChannelHub, _Channel, _Connection
+
+
+def _app(hub):
+    app = FastAPI()
+
+    async def turn(candidate, text, emit):
+        emit({"type": "token", "text": "Next"})
+        return [{"type": "followup", "followup": f"About '{text}'?", "feedback": ""}]
+
+    async def resync(candidate):
+        return {"question": "current question"}
+
+    @app.websocket("/ws/{candidate}")
+    async def ws(websocket: WebSocket, candidate: str, last_seq: int = -1):
+        await hub.serve(websocket, candidate, last_seq, turn=turn, resync=resync)
+
+    return app
+
+
+def _until(ws, kind):
+    while True:
+        frame = ws.receive_json()
+        if frame["type"] == kind:
+            return frame
+
+
+def test_reconnect_replays_missed_frames_and_resyncs():
+    hub = ChannelHub()
+    with TestClient(_app(hub)) as client:
+        with client.websocket_connect("/ws/c") as ws:
+            assert ws.receive_json() == {"type": "ready", "seq": 0, "resumed": False}
+            ws.send_json({"type": "answer", "text": "one", "id": "a-1"})
+            assert _until(ws, "followup")["seq"] == 1
+            ws.send_json({"type": "answer", "text": "two", "id": "a-2"})
+            assert _until(ws, "followup")["seq"] == 2
+
+        with client.websocket_connect("/ws/c?last_seq=1") as ws:
+            assert ws.receive_json() == {"type": "ready", "seq": 2, "resumed": True}
+            missed = ws.receive_json()
+            assert (missed["seq"], missed["id"], missed["followup"]) == (2, "a-2", "About 'two'?")
+            ws.send_json({"type": "answer", "text": "two", "id": "a-2"})  # re-send after reconnect
+            ws.send_json({"type": "ping"})
+            assert ws.receive_json() == {"type": "pong"}
+
+        # numbered by a previous process: the client gets the current state instead
+        with client.websocket_connect("/ws/c?last_seq=99") as ws:
+            ws.receive_json()
+            assert ws.receive_json() == {"type": "resync", "question": "current question", "seq": 3}
+
+    assert hub.counters["replayed"] == 1 and hub.counters["duplicates"] == 1 and hub.counters["resyncs"] == 1
+
+
+class _StuckSocket:
+    def __init__(self):
+        self.closed_with = None
+
+    async def send_text(self, text):
+        await asyncio.sleep(3600)
+
+    async def close(self, code):
+        self.closed_with = code
+
+
+def test_slow_consumer_drops_tokens_then_is_closed(monkeypatch):
+    monkeypatch.setattr(ws_channel, "WS_OUTBOX", 2)
+
+    async def main():
+        hub, ch, ws = ChannelHub(), _Channel(), _StuckSocket()
+        ch.conn = conn = _Connection(ws)
+        hub._emit(ch, {"type": "followup"})
+        hub._emit(ch, {"type": "rubric"})
+        hub._offer(ch, '{"type":"token"}', droppable=True)   # full: dropped
+        assert ch.conn is conn and hub.counters["tokens_dropped"] == 1
+        hub._emit(ch, {"type": "followup"})                  # full: the connection goes
+        await asyncio.sleep(0)
+        return hub, ch, ws
+
+    hub, ch, ws = asyncio.run(main())
+    assert ch.conn is None and ws.closed_with == ws_channel._SLOW_CONSUMER
+    assert hub.counters["slow_closes"] == 1
+    assert [seq for seq, _ in ch.ring] == [1, 2, 3]  # kept for the resume
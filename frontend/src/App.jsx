@@ -1,4 +1,4 @@
-import React, { useMemo, useState } from "react";
+import React, { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import TopNav from "./components/TopNav.jsx";
 import ChatWindow from "./components/ChatWindow.jsx";
 import FeedbackPanel from "./components/FeedbackPanel.jsx";
@@ -8,6 +8,7 @@ import RecruiterDashboard from "./components/RecruiterDashboard.jsx";
 import UnifiedProfile from "./components/UnifiedProfile.jsx";
 import JobConfig from "./components/JobConfig.jsx";
 import EndInterviewModal from "./components/EndInterviewModal.jsx";
+import { openInterviewSocket } from "./utils/interviewSocket.js";
 import "./styles/theme.css";
 
 const API = import.meta.env.VITE_API_URL || "http://localhost:8000";
@@ -47,6 +48,7 @@ export default function App() {
   const [messages, setMessages] = useState([]);
   const [feedback, setFeedback] = useState("");
   const [pending, setPending] = useState(false);
+  const [liveRubric, setLiveRubric] = useState(null);
 
   // Scoring
   const [scoreData, setScoreData] = useState({
@@ -72,8 +74,9 @@ export default function App() {
   );
 
   const startInterview = async () => {
-    setStatus("In progress");
+    setStatus("Not started"); // closes the previous interview's channel
     setMessages([]);
+    setLiveRubric(null);
     try {
       const res = await fetch(`${API}/start_interview`, {
         method: "POST",
@@ -93,36 +96,69 @@ export default function App() {
         json.first_question ||
         "Could you walk me through a project you’re proud of and your specific impact?";
       setMessages([{ role: "Agent", text: q }]);
+      setStatus("In progress");
     } catch (e) {
       setMessages([{ role: "Agent", text: `Error starting interview: ${e?.message || "Failed to fetch"}` }]);
     }
   };
 
-  const sendMessage = async (msg) => {
+  // Replace (or append) the in-flight agent bubble while tokens stream in
+  const setAgentDraft = (text, streaming) =>
+    setMessages((m) => {
+      const last = m[m.length - 1];
+      const bubble = { role: "Agent", text, streaming };
+      return last?.streaming ? [...m.slice(0, -1), bubble] : [...m, bubble];
+    });
+
+  // One persistent channel per interview: answers and drafts go up, follow-ups,
+  // coaching and the live rubric come down (reconnects and resumes on its own)
+  const socketRef = useRef(null);
+  const streamedRef = useRef("");
+  useEffect(() => {
+    if (status !== "In progress") return undefined;
+    const socket = openInterviewSocket(API, candidateName, (frame) => {
+      if (frame.type === "token") {
+        streamedRef.current += frame.text || "";
+        setAgentDraft(streamedRef.current, true);
+      } else if (frame.type === "followup") {
+        setAgentDraft(
+          frame.followup ||
+            streamedRef.current ||
+            "Thanks — can you share the measurable result (e.g., % improvement, time saved, scale handled)?",
+          false
+        );
+        streamedRef.current = "";
+        setFeedback(frame.feedback || "Try STAR and include a concrete metric.");
+        setPending(false);
+      } else if (frame.type === "rubric" || frame.type === "resync") {
+        if (frame.scores) setLiveRubric({ scores: frame.scores, rationale: frame.rationale, overallSummary: frame.overallSummary });
+      } else if (frame.type === "error") {
+        streamedRef.current = "";
+        setAgentDraft(`Agent error: ${frame.message || frame.code}`, false);
+        setPending(false);
+      }
+    });
+    socketRef.current = socket;
+    return () => {
+      socket.close();
+      socketRef.current = null;
+    };
+  }, [status, candidateName]);
+
+  const sendMessage = (msg) => {
     setMessages((m) => [...m, { role: "Candidate", text: msg }]);
     setScoreData(scoreAnswer(msg));
-    setPending(true);
-    try {
-      const res = await fetch(`${API}/answer`, {
-        method: "POST",
-        headers: { "Content-Type": "application/x-www-form-urlencoded" },
-        body: new URLSearchParams({ candidate: candidateName, response: msg }),
-      });
-      if (!res.ok) throw new Error(`HTTP ${res.status}`);
-      const data = await res.json();
-      const followup =
-        data?.followup ||
-        "Thanks — can you share the measurable result (e.g., % improvement, time saved, scale handled)?";
-      const coaching = data?.feedback || "Try STAR and include a concrete metric.";
-      setMessages((m) => [...m, { role: "Agent", text: followup }]);
-      setFeedback(coaching);
-    } catch (e) {
-      setMessages((m) => [...m, { role: "Agent", text: `Agent error: ${e?.message || "network"}` }]);
-    } finally {
-      setPending(false);
+    if (!socketRef.current) {
+      setAgentDraft("Agent error: start the interview first", false);
+      return;
     }
+    setPending(true);
+    socketRef.current.sendAnswer(msg);
   };
 
+  // Fire-and-forget: a lost draft only means the answer computes the follow-up itself
+  const sendDraft = useCallback((draft) => socketRef.current?.sendDraft(draft), []);
+
   const openEnd = () => setModalOpen(true);
   const markEnded = () => {
     setStatus("Ended");
@@ -183,6 +219,7 @@ export default function App() {
             subtitle="Answer by typing or speaking — the agent adapts."
             messages={messages}
             onSend={sendMessage}
+            onDraft={sendDraft}
             pending={pending}
           />
 
@@ -195,7 +232,12 @@ export default function App() {
               strengths={scoreData.strengths}
               improvements={scoreData.improvements}
             />
-            <RecruiterDashboard transcript={messages.length ? transcript : ""} />
+            <RecruiterDashboard
+              transcript={messages.length ? transcript : ""}
+              candidate={candidateName}
+              live={liveRubric}
+              api={API}
+            />
           </div>
         </div>
       </div>
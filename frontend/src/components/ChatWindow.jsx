@@ -2,7 +2,7 @@ import React, { useEffect, useRef } from "react";
 import ComposerHelpers from "./ComposerHelpers.jsx";
 
 /** One chat bubble, aligned by role */
-const Bubble = ({ role, text }) => {
+const Bubble = ({ role, text, streaming }) => {
   const isAgent = role === "Agent";
   return (
     <div
@@ -61,6 +61,7 @@ const Bubble = ({ role, text }) => {
         </div>
         <div style={{ fontSize: 14, lineHeight: 1.5, color: "#0f172a" }}>
           {text}
+          {streaming && <span style={{ animation: "blink 1s infinite" }}>▍</span>}
         </div>
       </div>
     </div>
@@ -117,7 +118,11 @@ const Dot = ({ delay = "0ms" }) => (
   />
 );
 
-export default function ChatWindow({ title, subtitle, messages, onSend, pending }) {
+// Pause in typing before the partial answer is sent as a draft (lets the server warm the follow-up)
+const DRAFT_DEBOUNCE_MS = 800;
+const DRAFT_MIN_CHARS = 40;
+
+export default function ChatWindow({ title, subtitle, messages, onSend, onDraft, pending }) {
   const [input, setInput] = React.useState("");
   const [listening, setListening] = React.useState(false);
   const recognitionRef = React.useRef(null);
@@ -143,6 +148,14 @@ export default function ChatWindow({ title, subtitle, messages, onSend, pending
     recognitionRef.current = rec;
   }, []);
 
+  // Debounced draft: each keystroke resets the timer, so only pauses are sent
+  useEffect(() => {
+    const draft = input.trim();
+    if (!onDraft || pending || draft.length < DRAFT_MIN_CHARS) return;
+    const t = setTimeout(() => onDraft(draft), DRAFT_DEBOUNCE_MS);
+    return () => clearTimeout(t);
+  }, [input, pending, onDraft]);
+
   // Auto-scroll
   useEffect(() => {
     listRef.current?.scrollTo({ top: listRef.current.scrollHeight, behavior: "smooth" });
@@ -198,10 +211,11 @@ export default function ChatWindow({ title, subtitle, messages, onSend, pending
         )}
 
         {messages.map((m, i) => (
-          <Bubble key={i} role={m.role} text={m.text} />
+          <Bubble key={i} role={m.role} text={m.text} streaming={m.streaming} />
         ))}
 
-        {pending && <Typing />}
+        {/* Typing dots only until the first streamed token arrives */}
+        {pending && !messages[messages.length - 1]?.streaming && <Typing />}
       </div>
 
       <ComposerHelpers value={input} setValue={setInput} />
@@ -1,11 +1,22 @@
 
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
+import { downloadServerExport } from "../utils/exporters.js";
 
-export default function RecruiterDashboard({ transcript }) {
+const secondaryButton = {
+  background: "#fff", color: "#334155", border: "1px solid #e5e7eb",
+  borderRadius: 10, padding: "10px 12px", fontWeight: 800, cursor: "pointer"
+};
+
+export default function RecruiterDashboard({ transcript, candidate, live, api = "http://localhost:8000" }) {
   const [loading, setLoading] = useState(false);
   const [rubric, setRubric] = useState(null);
   const [error, setError] = useState("");
 
+  // rubric pushed over the interview channel after every answer
+  useEffect(() => {
+    if (live) setRubric(live);
+  }, [live]);
+
   const generateRubric = async () => {
     if (!transcript || !transcript.trim()) {
       setError("No transcript yet. Start the interview first.");
@@ -15,11 +26,15 @@ export default function RecruiterDashboard({ transcript }) {
     setLoading(true);
     setError("");
     try {
-      const res = await fetch("http://localhost:8000/rubric/", {
+      const post = (fields) => fetch("http://localhost:8000/rubric/", {
         method: "POST",
         headers: { "Content-Type": "application/x-www-form-urlencoded" },
-        body: new URLSearchParams({ transcript }),
+        body: new URLSearchParams(fields),
       });
+      // the server keeps a running rubric per candidate; only fall back to
+      // shipping the whole transcript when it has no session for them
+      let res = candidate ? await post({ candidate }) : null;
+      if (!res || res.status === 404) res = await post({ transcript });
       if (!res.ok) {
         const txt = await res.text();
         throw new Error(`HTTP ${res.status}: ${txt}`);
@@ -87,6 +102,15 @@ export default function RecruiterDashboard({ transcript }) {
           Export JSON
         </button>
       </div>
+      {/* every stored interview of the requisition, built and streamed by the server */}
+      <div style={{ display: "flex", gap: 8, marginBottom: 8 }}>
+        <button onClick={() => downloadServerExport(api, "csv")} style={secondaryButton}>
+          Requisition CSV
+        </button>
+        <button onClick={() => downloadServerExport(api, "bundle")} style={secondaryButton}>
+          Requisition reports (zip)
+        </button>
+      </div>
       {error && <div style={{ color: "#b91c1c", fontSize: 13, marginBottom: 6 }}>{error}</div>}
 
       {!rubric ? (
@@ -2,16 +2,16 @@
 import React, { useEffect, useState } from "react";
 
 export default function StatusBadge() {
-  const [state, setState] = useState({ ready: false, pdf: false, key: "" });
+  const [state, setState] = useState({ ready: false, pdf: false, key: false });
 
   useEffect(() => {
     (async () => {
       try {
         const h = await fetch("http://localhost:8000/health").then(r=>r.json());
         const d = await fetch("http://localhost:8000/diag").then(r=>r.json());
-        setState({ ready: !!h.ok, pdf: !!d.pypdf_available, key: d.openai_key_prefix || "" });
+        setState({ ready: !!h.ok, pdf: !!d.pypdf_available, key: !!d.openai_key_set });
       } catch {
-        setState({ ready: false, pdf: false, key: "" });
+        setState({ ready: false, pdf: false, key: false });
       }
     })();
   }, []);
@@ -27,7 +27,7 @@ export default function StatusBadge() {
         {ok ? "● API Ready" : "● API Down"}
       </span>
       <span style={{fontSize:13, color:"#64748b"}}>PDF: {state.pdf ? "on" : "text-only"}</span>
-      <span style={{fontSize:13, color:"#64748b"}}>Key: {state.key}</span>
+      <span style={{fontSize:13, color:"#64748b"}}>Key: {state.key ? "set" : "missing"}</span>
     </div>
   );
 }
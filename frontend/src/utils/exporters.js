@@ -95,3 +95,16 @@ export function exportPDF({ candidate, role="Software Engineer", level="Mid", ta
 
   doc.save(`HireSense_${candidate.replace(/\s+/g,'_')}.pdf`);
 }
+
+/**
+ * Server-side export of stored interviews (backend/agents/report_export.py), for batches
+ * too big to build in the tab: the browser streams the download straight to disk.
+ * format: "csv" | "ndjson" | "bundle" (zip of PDF reports); candidates: names, [] = all.
+ */
+export function downloadServerExport(apiBase, format, candidates = []) {
+  const path = format === "bundle" ? "/reports/bundle.zip" : `/reports/export.${format}`;
+  const qs = new URLSearchParams(candidates.map((c) => ["candidate", c])).toString();
+  const a = document.createElement("a");
+  a.href = `${apiBase}${path}${qs ? `?${qs}` : ""}`;
+  a.click();
+}
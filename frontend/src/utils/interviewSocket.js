@@ -0,0 +1,62 @@
+/**
+ * Client for /ws/interview/{candidate} (protocol: backend/agents/ws_channel.py).
+ *
+ * Reconnects with backoff and resumes from the last frame seen (?last_seq=), answers the
+ * server's heartbeat pings, and re-sends answers still waiting for their follow-up (each
+ * carries an id, so the server ignores ones it already has).
+ */
+export function openInterviewSocket(apiBase, candidate, onFrame) {
+  const base = apiBase.replace(/^http/, "ws") + `/ws/interview/${encodeURIComponent(candidate)}`;
+  const waiting = new Map(); // answer id -> text, until its followup (or error) arrives
+  let ws = null;
+  let lastSeq = -1;
+  let retry = 0;
+  let closed = false;
+  let nextId = 0;
+
+  const send = (frame) => {
+    if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify(frame));
+  };
+
+  const connect = () => {
+    ws = new WebSocket(`${base}?last_seq=${lastSeq}`);
+    ws.onmessage = (ev) => {
+      const frame = JSON.parse(ev.data);
+      if (frame.type === "ping") return send({ type: "pong" });
+      if (frame.type === "ready") {
+        retry = 0;
+        if (frame.seq < lastSeq) lastSeq = frame.seq; // server restarted: its numbering starts over
+        waiting.forEach((text, id) => send({ type: "answer", text, id }));
+        return;
+      }
+      if (frame.seq != null) {
+        if (frame.seq <= lastSeq) return; // already seen
+        lastSeq = frame.seq;
+      }
+      if ((frame.type === "followup" || frame.type === "error") && frame.id != null) waiting.delete(frame.id);
+      onFrame(frame);
+    };
+    ws.onclose = () => {
+      if (closed) return;
+      retry += 1;
+      setTimeout(connect, Math.min(10000, 250 * 2 ** retry));
+    };
+  };
+  connect();
+
+  return {
+    sendAnswer(text) {
+      const id = `${Date.now().toString(36)}-${nextId++}`;
+      waiting.set(id, text);
+      send({ type: "answer", text, id });
+    },
+    // Best effort, like the old /answer/draft POST: a lost draft only costs the prefetch
+    sendDraft(text) {
+      send({ type: "draft", text });
+    },
+    close() {
+      closed = true;
+      ws?.close();
+    },
+  };
+}